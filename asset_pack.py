@@ -0,0 +1,219 @@
+import io
+import json
+import mmap
+import struct
+import hashlib
+import argparse
+from pathlib import Path
+from PIL import Image
+
+from optimize_images import IMAGE_EXTENSIONS, MANIFEST_FILE, load_manifest
+from quiz_core import folder_order, category_name
+from quiz_log import logger
+
+PACK_FILE = 'assets.pack'
+SOURCE_FOLDER = 'legacy_images'
+
+# 파일 구조: [매직 8바이트][헤더 길이 uint32][헤더 JSON][이미지 데이터 ...]
+PACK_MAGIC = b'KHQPACK1'
+HEADER_LENGTH = struct.Struct('<I')
+
+# quiz_data의 'image' 값이 팩 안의 이미지를 가리킬 때 쓰는 접두사
+ASSET_PREFIX = 'asset:'
+
+
+def file_stamp(path):
+    """이미지 원본 파일 스탬프 [수정 시각, 크기] (아틀라스 변경 감지, 팩 헤더에도 기록)"""
+    stat = Path(path).stat()
+    return [stat.st_mtime, stat.st_size]
+
+
+def source_stamps(source_folder=SOURCE_FOLDER, manifest_file=MANIFEST_FILE):
+    """팩 원본 스탬프 [[이름, 수정 시각]] (이미지 폴더와 시대 폴더, 최적화 매니페스트).
+    이미지를 하나씩 stat하지 않도록 폴더 수정 시각만 봄 (추가/삭제/이름 변경 감지, 같은 이름으로 덮어쓴 경우는 제외)"""
+    source_path = Path(source_folder)
+    stamps = [['.', source_path.stat().st_mtime]]
+    stamps += [[folder.name, folder.stat().st_mtime]
+               for folder in sorted(source_path.iterdir()) if folder.is_dir()]
+    if Path(manifest_file).exists():
+        stamps.append([MANIFEST_FILE, Path(manifest_file).stat().st_mtime])
+    return stamps
+
+
+def folder_signature(source_folder=SOURCE_FOLDER, manifest_file=MANIFEST_FILE):
+    """팩이 원본보다 오래됐는지 확인용 서명"""
+    data = json.dumps(source_stamps(source_folder, manifest_file), ensure_ascii=False)
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+
+def build_pack(source_folder=SOURCE_FOLDER, pack_file=PACK_FILE, manifest_file=MANIFEST_FILE):
+    """이미지 트리를 하나의 팩 파일로 묶기 (빌드 시 실행)"""
+    source_path = Path(source_folder)
+    if not source_path.exists():
+        print(f"⚠ '{source_folder}' 폴더가 없습니다.")
+        return None
+
+    # 최적화된 이미지가 있으면 그쪽 바이트를 담음
+    manifest = load_manifest(manifest_file)
+
+    categories = []
+    images = []
+    blobs = []
+    offset = 0
+
+    for folder in sorted(source_path.iterdir(), key=folder_order):
+        if not folder.is_dir():
+            continue
+        categories.append({
+            'folder': folder.name,
+            'name': category_name(folder.name),
+        })
+
+        for img_file in sorted(folder.iterdir()):
+            if img_file.suffix.lower() not in IMAGE_EXTENSIONS:
+                continue
+
+            key = img_file.as_posix()
+            data_file = img_file
+            optimized = manifest.get(key)
+            if optimized and Path(optimized).exists():
+                data_file = Path(optimized)
+
+            data = data_file.read_bytes()
+            images.append({
+                'key': key,
+                'folder': folder.name,
+                'name': img_file.name,
+                'offset': offset,
+                'length': len(data),
+                # 담은 파일의 스탬프 (파일에서 만든 아틀라스와 같은 값이라 그대로 재사용됨)
+                'stamp': file_stamp(data_file),
+            })
+            blobs.append(data)
+            offset += len(data)
+
+    header = json.dumps({'categories': categories, 'images': images,
+                         'source_signature': folder_signature(source_folder, manifest_file)},
+                        ensure_ascii=False).encode('utf-8')
+
+    with open(pack_file, 'wb') as f:
+        f.write(PACK_MAGIC)
+        f.write(HEADER_LENGTH.pack(len(header)))
+        f.write(header)
+        for data in blobs:
+            f.write(data)
+
+    return {'categories': len(categories), 'images': len(images),
+            'bytes': Path(pack_file).stat().st_size}
+
+
+class AssetPack:
+    """mmap으로 연 팩 파일. 인덱스만 읽고 이미지는 필요할 때 슬라이스에서 디코딩"""
+
+    def __init__(self, pack_file=PACK_FILE):
+        self.pack_file = pack_file
+        self._file = open(pack_file, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+
+        if self._view[:len(PACK_MAGIC)] != PACK_MAGIC:
+            self.close()
+            raise ValueError(f"팩 파일 형식이 아닙니다: {pack_file}")
+
+        header_start = len(PACK_MAGIC) + HEADER_LENGTH.size
+        (header_length,) = HEADER_LENGTH.unpack_from(self._view, len(PACK_MAGIC))
+        header = json.loads(bytes(self._view[header_start:header_start + header_length]))
+        self._data_start = header_start + header_length
+
+        self.categories = header['categories']
+        self.images = header['images']
+        self.source_signature = header.get('source_signature')
+
+        # 통계 키는 플랫폼 경로 문자열(str(Path)) 기준
+        self._by_key = {}
+        self._by_folder = {}
+        for entry in self.images:
+            entry['stats_key'] = str(Path(entry['key']))
+            self._by_key[entry['stats_key']] = entry
+            self._by_folder.setdefault(entry['folder'], []).append(entry)
+
+    def images_in(self, folder):
+        """카테고리 폴더에 속한 이미지 항목 목록"""
+        return self._by_folder.get(folder, [])
+
+    def read(self, stats_key):
+        """이미지의 인코딩된 바이트 (복사본. memoryview 슬라이스가 남아 있으면 close()에서 mmap을 닫지 못함)"""
+        entry = self._by_key[stats_key]
+        start = self._data_start + entry['offset']
+        return bytes(self._view[start:start + entry['length']])
+
+    def stamp(self, stats_key):
+        """이미지 원본 스탬프 (스탬프가 없는 예전 팩은 팩 파일 수정 시각과 길이)"""
+        entry = self._by_key[stats_key]
+        if 'stamp' in entry:
+            return entry['stamp']
+        return [Path(self.pack_file).stat().st_mtime, entry['length']]
+
+    def open_image(self, stats_key):
+        """팩 안의 이미지를 PIL 이미지로 열기"""
+        return Image.open(io.BytesIO(self.read(stats_key)))
+
+    def close(self):
+        """mmap 및 파일 닫기"""
+        self._view.release()
+        self._mmap.close()
+        self._file.close()
+
+
+def is_stale(pack, source_folder=SOURCE_FOLDER, manifest_file=MANIFEST_FILE):
+    """원본 이미지 폴더/최적화 매니페스트가 팩을 만든 뒤 바뀌었는지 (폴더가 없으면 배포본이라 False)"""
+    if not Path(source_folder).is_dir():
+        return False
+    if pack.source_signature:
+        return pack.source_signature != folder_signature(source_folder, manifest_file)
+    # 서명이 없는 예전 팩은 수정 시각 비교
+    newest = max(mtime for _, mtime in source_stamps(source_folder, manifest_file))
+    return newest > Path(pack.pack_file).stat().st_mtime
+
+
+def open_pack(pack_file=PACK_FILE, source_folder=SOURCE_FOLDER, manifest_file=MANIFEST_FILE):
+    """팩 파일이 있으면 열기 (없거나 손상됐거나 원본 폴더보다 오래됐으면 None)"""
+    if not Path(pack_file).exists():
+        return None
+    try:
+        pack = AssetPack(pack_file)
+    except Exception as e:
+        logger.error("에셋 팩 로드 실패: %s", e)
+        return None
+    try:
+        stale = is_stale(pack, source_folder, manifest_file)
+    except OSError as e:
+        logger.warning("에셋 팩 최신 여부 확인 실패: %s", e)
+        stale = False
+    if stale:
+        logger.warning("%s 폴더 또는 %s가 %s 이후 바뀌어 팩을 사용하지 않습니다 "
+                       "(python asset_pack.py로 다시 생성)", source_folder, manifest_file, pack_file)
+        pack.close()
+        return None
+    return pack
+
+
+def main():
+    parser = argparse.ArgumentParser(description="legacy_images 에셋 팩 생성")
+    parser.add_argument('--source', default=SOURCE_FOLDER, help="원본 이미지 폴더")
+    parser.add_argument('--output', default=PACK_FILE, help="팩 파일 경로")
+    parser.add_argument('--manifest', default=MANIFEST_FILE, help="최적화 매니페스트 파일")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("📦 에셋 팩 생성")
+    print("=" * 60)
+
+    result = build_pack(args.source, args.output, args.manifest)
+    if result:
+        print(f"✓ {args.output}: 카테고리 {result['categories']}개, "
+              f"이미지 {result['images']}개 ({result['bytes']:,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
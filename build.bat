@@ -1,9 +1,24 @@
 @echo off
+echo 이미지 최적화 중...
+python optimize_images.py
+
+echo 에셋 팩 생성 중...
+python asset_pack.py
+
+echo 썸네일 아틀라스 생성 중...
+python sprite_atlas.py
+
 echo 빌드 중...
 pyinstaller quiz_app.spec
 
 echo output 폴더 복사 중...
 xcopy /E /I /Y output dist\한국사유물퀴즈\output
 
+echo 최적화 이미지 복사 중...
+xcopy /E /I /Y optimized_images dist\한국사유물퀴즈\optimized_images
+copy /Y image_manifest.json dist\한국사유물퀴즈\image_manifest.json
+copy /Y assets.pack dist\한국사유물퀴즈\assets.pack
+xcopy /E /I /Y atlases dist\한국사유물퀴즈\atlases
+
 echo 완료!
 pause
\ No newline at end of file
@@ -0,0 +1,487 @@
+import os
+import re
+import json
+import hashlib
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image
+
+from tile_cache import TiledImage
+from crop_manifest import CropManifest, MANIFEST_FILE, OUTPUT_FOLDER, open_source
+
+CAPTIONS_FILE = 'caption_proposals.json'
+CAPTIONS_VERSION = 1
+
+# Tesseract 언어 데이터 (kor.traineddata 필요, 네트워크 사용 없음)
+OCR_LANG = 'kor'
+# 6: 한 덩어리 텍스트 (캡션 띠 안에 한두 줄)
+OCR_PSM = 6
+
+# 캡션 탐색 띠: 크롭 높이 대비 비율 (최소/최대 px), 크롭 좌우로 넓히는 비율
+CAPTION_BAND = 0.35
+CAPTION_MIN = 40
+CAPTION_MAX = 160
+CAPTION_WIDEN = 0.25
+
+# Tesseract는 글자 높이 20~40px에서 잘 읽으므로 작은 띠는 확대
+OCR_MIN_HEIGHT = 80
+
+# 검토 화면에서 기본으로 선택할 신뢰도 (%)
+MIN_CONFIDENCE = 70
+
+HANGUL = re.compile(r'[가-힣]')
+INVALID_CHARS = re.compile(r'[\\/:*?"<>|\x00-\x1f]')
+# 캡션 앞의 번호/글머리표 ('1.', '(2)', '①', '•')
+LEADING_MARKER = re.compile(r'^(?:[(\[]?\d{1,2}[.)\]]|[①-⑳]|[-•·▶▷※*])\s*')
+
+
+def caption_regions(rect, others, size):
+    """크롭 주변의 캡션 후보 영역 [(방향, 사각형)] (아래, 위, 오른쪽 순).
+    같은 원본의 다른 크롭과 겹치는 부분은 잘라냄"""
+    x1, y1, x2, y2 = rect
+    width, height = size
+    band = int(min(CAPTION_MAX, max(CAPTION_MIN, (y2 - y1) * CAPTION_BAND)))
+    widen = int((x2 - x1) * CAPTION_WIDEN)
+    left, right = max(0, x1 - widen), min(width, x2 + widen)
+
+    def overlaps_x(other, a, b):
+        return other[0] < b and other[2] > a
+
+    def overlaps_y(other, a, b):
+        return other[1] < b and other[3] > a
+
+    # 아래: 바로 아래 크롭의 윗변까지
+    bottom = min([y2 + band, height] + [o[1] for o in others
+                                        if overlaps_x(o, left, right) and o[1] >= y2])
+    # 위: 바로 위 크롭의 아랫변까지
+    top = max([y1 - band, 0] + [o[3] for o in others if overlaps_x(o, left, right) and o[3] <= y1])
+    # 오른쪽: 크롭 높이 그대로, 오른쪽 크롭의 왼쪽 변까지
+    far = min([x2 + (x2 - x1), width] + [o[0] for o in others
+                                         if overlaps_y(o, y1, y2) and o[0] >= x2])
+
+    regions = [('below', (left, y2, right, bottom)),
+               ('above', (left, top, right, y1)),
+               ('right', (x2, y1, far, y2))]
+    return [(side, box) for side, box in regions if box[2] - box[0] >= 12 and box[3] - box[1] >= 12]
+
+
+def caption_fingerprint(source_sha1, regions, lang, psm):
+    """OCR 결과를 결정하는 값 (바뀌면 다시 인식)"""
+    data = json.dumps([CAPTIONS_VERSION, source_sha1, regions, lang, psm])
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+
+def source_region(image, box):
+    """원본(PIL 또는 TiledImage)의 사각형 영역 (PIL RGB)"""
+    if isinstance(image, TiledImage):
+        return Image.fromarray(image.region(*box)[:, :, ::-1])
+    return image.crop(box)
+
+
+def read_lines(pytesseract, img, lang, psm):
+    """영역 OCR → 줄 목록 [(텍스트, 평균 신뢰도)] (위에서 아래 순)"""
+    gray = img.convert('L')
+    if gray.height < OCR_MIN_HEIGHT:
+        scale = OCR_MIN_HEIGHT / gray.height
+        gray = gray.resize((max(1, round(gray.width * scale)), OCR_MIN_HEIGHT),
+                           Image.Resampling.LANCZOS)
+
+    data = pytesseract.image_to_data(gray, lang=lang, config=f'--psm {psm}',
+                                     output_type=pytesseract.Output.DICT)
+    lines = {}
+    for i, word in enumerate(data['text']):
+        conf = float(data['conf'][i])
+        if not word.strip() or conf < 0:
+            continue
+        line = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+        lines.setdefault(line, []).append((data['top'][i], word.strip(), conf))
+
+    result = []
+    for words in sorted(lines.values(), key=lambda words: min(w[0] for w in words)):
+        result.append((' '.join(w[1] for w in words), sum(w[2] for w in words) / len(words)))
+    return result
+
+
+def pick_caption(side, lines):
+    """영역의 줄 중 캡션 (한글이 있는 줄 중 크롭에 가장 가까운 줄). (텍스트, 신뢰도) 또는 None"""
+    candidates = [line for line in lines if HANGUL.search(line[0])]
+    if not candidates:
+        return None
+    # 위쪽 영역은 맨 아래 줄이 크롭에 가장 가까움
+    return candidates[-1] if side == 'above' else candidates[0]
+
+
+def ocr_source(task):
+    """원본 시트 한 장의 크롭 캡션 인식 (원본은 한 번만 열기, 프로세스 풀 워커).
+    [(크롭 ID, 결과 또는 None, 오류)] 반환"""
+    source, crops, lang, psm = task
+    try:
+        import pytesseract
+        image = open_source(source)
+    except Exception as e:
+        return [(crop_id, None, str(e)) for crop_id, _ in crops]
+
+    results = []
+    for crop_id, regions in crops:
+        try:
+            best = None
+            for side, box in regions:
+                caption = pick_caption(side, read_lines(pytesseract, source_region(image, box),
+                                                        lang, psm))
+                if caption is None:
+                    continue
+                if best is None or caption[1] > best['confidence']:
+                    best = {'text': caption[0], 'confidence': round(caption[1], 1),
+                            'side': side, 'region': list(box)}
+                # 가까운 쪽에서 충분히 확실하게 읽었으면 나머지 방향은 생략
+                if best['confidence'] >= MIN_CONFIDENCE:
+                    break
+            results.append((crop_id, best, None))
+        except Exception as e:
+            results.append((crop_id, None, str(e)))
+    return results
+
+
+def check_engine(lang=OCR_LANG):
+    """pytesseract/Tesseract/언어 데이터 확인. 문제가 있으면 안내 메시지, 없으면 None"""
+    try:
+        import pytesseract
+    except ImportError:
+        return "pytesseract가 없습니다. pip install pytesseract (Tesseract OCR도 설치 필요)"
+    try:
+        installed = set(pytesseract.get_languages(config=''))
+    except pytesseract.TesseractNotFoundError:
+        return "tesseract 실행 파일을 찾을 수 없습니다 (설치 후 PATH에 추가)"
+    missing = [part for part in lang.split('+') if part not in installed]
+    if missing:
+        return f"Tesseract 언어 데이터가 없습니다: {', '.join(missing)} (예: kor.traineddata)"
+    return None
+
+
+def propose_name(text):
+    """캡션 → 파일 이름 (번호/글머리표 제거, 파일명에 못 쓰는 문자는 공백으로). 쓸 수 없으면 None"""
+    name = LEADING_MARKER.sub('', text.strip())
+    # 지우면 단어가 붙으므로 ('주먹도끼/찍개') 공백으로 바꿈
+    name = INVALID_CHARS.sub(' ', name)
+    name = re.sub(r'\s+', ' ', name).strip(' .')
+    if len(name) < 2 or not HANGUL.search(name):
+        return None
+    return name[:60].rstrip(' .')
+
+
+def load_captions(path=CAPTIONS_FILE):
+    """캡션 인식 결과 캐시 {크롭 ID: {'fingerprint', 'text', 'confidence', 'side', 'region', 'name'}}"""
+    if not Path(path).exists():
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return data if data.pop('version', None) == CAPTIONS_VERSION else {}
+    except Exception as e:
+        print(f"캡션 캐시 로드 실패: {e}")
+        return {}
+
+
+def save_captions(captions, path=CAPTIONS_FILE):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'version': CAPTIONS_VERSION, **captions}, f, ensure_ascii=False, indent=1)
+
+
+def recognize_all(manifest, captions, lang=OCR_LANG, psm=OCR_PSM, workers=None, force=False):
+    """이름 없는 크롭의 캡션 인식 (원본/사각형/설정이 바뀐 크롭만, 원본 시트 단위로 병렬).
+    (인식, 유지, 오류) 개수 반환"""
+    by_source = {}
+    for crop_id, crop in manifest.crops.items():
+        by_source.setdefault(crop['source'], []).append(crop_id)
+
+    tasks = {}
+    fingerprints = {}
+    kept = 0
+    for source, crop_ids in by_source.items():
+        if not Path(source).exists():
+            print(f"⚠ 원본 없음: {source}")
+            continue
+        size = None
+        for crop_id in crop_ids:
+            crop = manifest.crops[crop_id]
+            if crop.get('name'):
+                continue
+            if size is None:
+                # 크기는 헤더만 읽어서 (디코딩은 워커에서 한 번)
+                with Image.open(source) as img:
+                    size = img.size
+            others = [manifest.crops[other]['rect'] for other in crop_ids if other != crop_id]
+            regions = caption_regions(crop['rect'], others, size)
+            fingerprints[crop_id] = caption_fingerprint(crop['source_sha1'], regions, lang, psm)
+            if not force and captions.get(crop_id, {}).get('fingerprint') == fingerprints[crop_id]:
+                kept += 1
+                continue
+            tasks.setdefault(source, []).append((crop_id, regions))
+
+    recognized, errors = 0, 0
+    if tasks:
+        jobs = [(source, crops, lang, psm) for source, crops in tasks.items()]
+        print(f"🔤 캡션 인식 중... (원본 {len(jobs)}장, 크롭 {sum(len(c) for c in tasks.values())}개)")
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+            for results in executor.map(ocr_source, jobs):
+                for crop_id, result, error in results:
+                    if error:
+                        print(f"❌ {crop_id}: {error}")
+                        errors += 1
+                        continue
+                    result = result or {'text': '', 'confidence': 0.0, 'side': None, 'region': None}
+                    result['fingerprint'] = fingerprints[crop_id]
+                    result['name'] = propose_name(result['text']) if result['text'] else None
+                    captions[crop_id] = result
+                    recognized += 1
+
+    # 매니페스트에서 지운 크롭의 결과 정리
+    for crop_id in [crop_id for crop_id in captions if crop_id not in manifest.crops]:
+        del captions[crop_id]
+    return recognized, kept, errors
+
+
+def pending_proposals(manifest, captions):
+    """아직 이름이 없고 제안 이름이 있는 크롭 [(크롭 ID, 결과)] (신뢰도 높은 순)"""
+    pending = [(crop_id, result) for crop_id, result in captions.items()
+               if result.get('name') and crop_id in manifest.crops
+               and not manifest.crops[crop_id].get('name')]
+    pending.sort(key=lambda item: -item[1]['confidence'])
+    return pending
+
+
+def apply_names(manifest, names, output_folder=OUTPUT_FOLDER):
+    """크롭 이름 일괄 지정 {크롭 ID: 이름} (같은 원본 안에서 겹치면 ' (2)' 등을 붙임).
+    {크롭 ID: 실제 이름} 반환"""
+    used = {}
+    for crop_id, crop in manifest.crops.items():
+        if crop.get('name') and crop_id not in names:
+            used.setdefault(crop_id.rsplit('/', 1)[0], set()).add(crop['name'])
+
+    applied = {}
+    for crop_id, name in names.items():
+        taken = used.setdefault(crop_id.rsplit('/', 1)[0], set())
+        unique, n = name, 2
+        while unique in taken:
+            unique = f"{name} ({n})"
+            n += 1
+        taken.add(unique)
+        manifest.set_name(crop_id, unique, output_folder)
+        applied[crop_id] = unique
+    manifest.save()
+    return applied
+
+
+class CaptionReview:
+    """제안 이름 검토 화면 (크롭, 캡션 영역, 고칠 수 있는 이름, 선택 체크박스). 선택 항목 일괄 적용"""
+
+    THUMB_SIZE = (96, 96)
+    CAPTION_SIZE = (260, 60)
+
+    def __init__(self, manifest, captions, output_folder=OUTPUT_FOLDER, min_confidence=MIN_CONFIDENCE):
+        import tkinter as tk
+        from PIL import ImageTk
+        self.tk = tk
+        self.ImageTk = ImageTk
+        self.manifest = manifest
+        self.captions = captions
+        self.output_folder = output_folder
+        self.min_confidence = min_confidence
+        self.rows = []      # (크롭 ID, 이름 변수, 선택 변수, 행 프레임)
+        self.photos = []    # PhotoImage 참조 유지
+
+        self.root = tk.Tk()
+        self.root.title("캡션 이름 검토")
+        self.root.geometry("760x900")
+
+        top = tk.Frame(self.root)
+        top.pack(fill='x', padx=10, pady=10)
+        self.summary = tk.Label(top, font=("맑은 고딕", 12))
+        self.summary.pack(side='left')
+
+        buttons = tk.Frame(self.root)
+        buttons.pack(fill='x', padx=10)
+        for text, command in ((f"신뢰도 {min_confidence}% 이상 선택", self.select_confident),
+                              ("모두 선택", lambda: self.select_all(True)),
+                              ("모두 해제", lambda: self.select_all(False))):
+            tk.Button(buttons, text=text, command=command,
+                      font=("맑은 고딕", 10)).pack(side='left', padx=3)
+        tk.Button(buttons, text="선택 항목 적용", command=self.apply,
+                  font=("맑은 고딕", 11, "bold"), bg="#4CAF50", fg="white",
+                  padx=15).pack(side='right', padx=3)
+
+        # 스크롤 목록
+        container = tk.Frame(self.root)
+        container.pack(fill='both', expand=True, padx=10, pady=10)
+        canvas = tk.Canvas(container, highlightthickness=0)
+        scrollbar = tk.Scrollbar(container, orient='vertical', command=canvas.yview)
+        self.list_frame = tk.Frame(canvas)
+        self.list_frame.bind('<Configure>',
+                             lambda e: canvas.configure(scrollregion=canvas.bbox('all')))
+        canvas.create_window((0, 0), window=self.list_frame, anchor='nw')
+        canvas.configure(yscrollcommand=scrollbar.set)
+        canvas.pack(side='left', fill='both', expand=True)
+        scrollbar.pack(side='right', fill='y')
+        canvas.bind_all('<MouseWheel>', lambda e: canvas.yview_scroll(-e.delta // 120, 'units'))
+
+        self.populate()
+
+    def previews(self, pending):
+        """크롭/캡션 영역 미리보기 {크롭 ID: (크롭, 캡션)} (원본 시트는 한 번씩만 열기)"""
+        by_source = {}
+        for crop_id, _ in pending:
+            by_source.setdefault(self.manifest.crops[crop_id]['source'], []).append(crop_id)
+
+        previews = {}
+        for source, crop_ids in by_source.items():
+            try:
+                image = open_source(source)
+            except Exception as e:
+                print(f"⚠ 원본 열기 실패 {source}: {e}")
+                continue
+            for crop_id in crop_ids:
+                crop = self.manifest.crops[crop_id]
+                thumb = source_region(image, tuple(crop['rect']))
+                thumb.thumbnail(self.THUMB_SIZE)
+                region = self.captions[crop_id].get('region')
+                caption = source_region(image, tuple(region)) if region else None
+                if caption is not None:
+                    caption.thumbnail(self.CAPTION_SIZE)
+                previews[crop_id] = (thumb, caption)
+        return previews
+
+    def populate(self):
+        tk = self.tk
+        pending = pending_proposals(self.manifest, self.captions)
+        previews = self.previews(pending)
+        for crop_id, result in pending:
+            row = tk.Frame(self.list_frame, bd=1, relief='groove')
+            row.pack(fill='x', pady=2)
+
+            thumb, caption = previews.get(crop_id, (None, None))
+            if thumb is not None:
+                photo = self.ImageTk.PhotoImage(thumb)
+                self.photos.append(photo)
+                tk.Label(row, image=photo, width=self.THUMB_SIZE[0]).pack(side='left', padx=5, pady=5)
+
+            middle = tk.Frame(row)
+            middle.pack(side='left', fill='x', expand=True, padx=5)
+            tk.Label(middle, text=f"{crop_id} · {result['confidence']:.0f}%",
+                     font=("맑은 고딕", 9), fg='gray').pack(anchor='w')
+            if caption is not None:
+                photo = self.ImageTk.PhotoImage(caption)
+                self.photos.append(photo)
+                tk.Label(middle, image=photo).pack(anchor='w')
+            name_var = tk.StringVar(value=result['name'])
+            tk.Entry(middle, textvariable=name_var, width=36,
+                     font=("맑은 고딕", 11)).pack(anchor='w', pady=3)
+
+            selected = tk.BooleanVar(value=result['confidence'] >= self.min_confidence)
+            tk.Checkbutton(row, variable=selected,
+                           command=self.update_summary).pack(side='right', padx=10)
+            self.rows.append((crop_id, name_var, selected, row))
+        self.update_summary()
+
+    def update_summary(self):
+        selected = sum(1 for _, _, var, _ in self.rows if var.get())
+        self.summary.config(text=f"제안 {len(self.rows)}개 (선택 {selected}개)")
+
+    def select_confident(self):
+        for crop_id, _, var, _ in self.rows:
+            var.set(self.captions[crop_id]['confidence'] >= self.min_confidence)
+        self.update_summary()
+
+    def select_all(self, value):
+        for _, _, var, _ in self.rows:
+            var.set(value)
+        self.update_summary()
+
+    def apply(self):
+        """선택한 항목 이름 적용 (고친 이름도 파일명 규칙으로 정리) 후 목록에서 제거"""
+        from tkinter import messagebox
+        names = {}
+        for crop_id, name_var, selected, _ in self.rows:
+            name = propose_name(name_var.get()) if selected.get() else None
+            if name:
+                names[crop_id] = name
+        if not names:
+            messagebox.showinfo("알림", "적용할 항목이 없습니다.")
+            return
+
+        applied = apply_names(self.manifest, names, self.output_folder)
+        remaining = []
+        for row in self.rows:
+            if row[0] in applied:
+                row[3].destroy()
+            else:
+                remaining.append(row)
+        self.rows = remaining
+        self.update_summary()
+        print(f"✓ 이름 적용 {len(applied)}개")
+
+    def run(self):
+        self.root.mainloop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="크롭 아래/옆 캡션을 OCR로 읽어 유물명 제안 (Tesseract)")
+    parser.add_argument('--manifest', default=MANIFEST_FILE, help="크롭 매니페스트 파일")
+    parser.add_argument('--output', default=OUTPUT_FOLDER, help="크롭 이미지 폴더")
+    parser.add_argument('--captions', default=CAPTIONS_FILE, help="인식 결과 캐시 파일")
+    parser.add_argument('--lang', default=OCR_LANG, help="Tesseract 언어 (예: kor, kor+eng)")
+    parser.add_argument('--psm', type=int, default=OCR_PSM, help="Tesseract 페이지 분할 모드")
+    parser.add_argument('--min-confidence', type=float, default=MIN_CONFIDENCE,
+                        help="기본 선택/일괄 적용 신뢰도 (%%)")
+    parser.add_argument('--accept', action='store_true',
+                        help="검토 화면 없이 신뢰도 이상인 제안을 모두 적용")
+    parser.add_argument('--no-review', action='store_true', help="인식만 하고 결과 출력")
+    parser.add_argument('--force', action='store_true', help="캐시 무시하고 모두 다시 인식")
+    parser.add_argument('--workers', type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🔤 캡션 OCR")
+    print("=" * 60)
+
+    manifest = CropManifest(args.manifest)
+    if not manifest.crops:
+        print(f"⚠ '{args.manifest}'에 크롭이 없습니다.")
+        return
+
+    captions = load_captions(args.captions)
+    problem = check_engine(args.lang)
+    if problem:
+        # 엔진이 없어도 지난 인식 결과로 검토/적용은 가능
+        print(f"⚠ {problem}")
+    else:
+        recognized, kept, errors = recognize_all(manifest, captions, args.lang, args.psm,
+                                                 args.workers, args.force)
+        save_captions(captions, args.captions)
+        print(f"✓ 인식 {recognized}개, 변경 없음 {kept}개" + (f", 오류 {errors}개" if errors else ""))
+
+    pending = pending_proposals(manifest, captions)
+    if not pending:
+        print("제안할 이름이 없습니다.")
+        return
+
+    if args.accept:
+        names = {crop_id: result['name'] for crop_id, result in pending
+                 if result['confidence'] >= args.min_confidence}
+        applied = apply_names(manifest, names, args.output)
+        for crop_id, name in applied.items():
+            print(f"  {crop_id} → {name}.png")
+        print(f"✓ 이름 적용 {len(applied)}개 (신뢰도 {args.min_confidence:.0f}% 미만 "
+              f"{len(pending) - len(applied)}개는 그대로)")
+        return
+
+    if args.no_review:
+        for crop_id, result in pending:
+            print(f"  {crop_id} → {result['name']} ({result['confidence']:.0f}%, {result['side']})")
+        return
+
+    CaptionReview(manifest, captions, args.output, args.min_confidence).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+import json
+import math
+import threading
+from pathlib import Path
+
+from sprite_atlas import REVERSE_PREFIX
+
+AGGREGATES_FILE = 'category_stats.json'
+AGGREGATES_VERSION = 1
+
+# 정답률 구간 수 (0~100, 구간 = ceil(정답률))
+BUCKETS = 101
+
+# 모드 → (문제 목록 종류, 통계 키 접두사). 유물찾기는 유물맞추기와 같은 이미지 목록
+GROUPS = {'artifact': ('era', ''), 'reverse': ('era', REVERSE_PREFIX), 'choice': ('choice', '')}
+
+
+def accuracy_bucket(stat):
+    """정답률 구간 ceil(정답률) (통계 없으면 100).
+    accuracy_of와 같은 계산이라 정수 기준 f에 대해 '정답률 <= f' ⇔ '구간 <= f'"""
+    if not stat or stat['total'] <= 0:
+        return 100
+    return min(100, math.ceil(stat['correct'] / stat['total'] * 100))
+
+
+def empty_sums(questions=0):
+    """카테고리 합계 (문제 수, 푼 문제 수, 답변/정답 수 합, 정답률 구간별 문제 수)"""
+    return {'questions': questions, 'answered': 0, 'total': 0, 'correct': 0,
+            'buckets': [0] * BUCKETS}
+
+
+def add_stat(sums, stat, count=1):
+    """키 하나의 통계를 합계에 더하기 (count가 음수면 빼기)"""
+    sums['buckets'][accuracy_bucket(stat)] += count
+    if stat and stat['total'] > 0:
+        sums['answered'] += count
+        sums['total'] += count * stat['total']
+        sums['correct'] += count * stat['correct']
+
+
+class CategoryAggregates:
+    """시대/주제별 통계 합계 캐시 (설정 화면 표시, 출제 문제 수 미리 계산용).
+    답변마다 통계 저장소 listener로 갱신하고, 시작할 때는 목록이 바뀐 카테고리만 다시 나열"""
+
+    def __init__(self):
+        self.banks = {'era': {}, 'choice': {}}       # 종류 → 카테고리 → {'signature', 'keys'}
+        self.sums = {group: {} for group in GROUPS}   # 모드 → 카테고리 → 합계
+        self.stats_signature = None                   # 합계를 계산한 통계 파일 [mtime, 크기]
+        self.dirty = False
+        self._owners = {}   # 통계 키 → [모드, 카테고리, 같은 키 문제 수]
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path=AGGREGATES_FILE):
+        """디스크 캐시에서 로드 (없거나 버전이 다르면 빈 캐시)"""
+        aggregates = cls()
+        if not Path(path).exists():
+            return aggregates
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != AGGREGATES_VERSION:
+                return aggregates
+            aggregates.banks.update(data['banks'])
+            for group, sums in data['sums'].items():
+                aggregates.sums[group].update(sums)
+            aggregates.stats_signature = data['stats_signature']
+        except Exception as e:
+            print(f"카테고리 합계 캐시 로드 실패: {e}")
+            return cls()
+
+        for bank, categories in aggregates.banks.items():
+            for category in categories:
+                aggregates._own(bank, category)
+        return aggregates
+
+    def save(self, path=AGGREGATES_FILE, stats_signature=None):
+        """디스크 캐시 저장 (stats_signature: 지금 합계와 같은 내용의 통계 파일)"""
+        with self._lock:
+            if stats_signature is not None:
+                self.stats_signature = stats_signature
+            data = {
+                'version': AGGREGATES_VERSION,
+                'stats_signature': self.stats_signature,
+                'banks': self.banks,
+                'sums': self.sums,
+            }
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+            self.dirty = False
+
+    def clear(self):
+        """캐시 비우기 (다음 sync에서 모든 카테고리를 다시 나열)"""
+        with self._lock:
+            self.banks = {'era': {}, 'choice': {}}
+            self.sums = {group: {} for group in GROUPS}
+            self.stats_signature = None
+            self._owners = {}
+            self.dirty = True
+
+    def _groups(self, bank):
+        return [(group, prefix) for group, (kind, prefix) in GROUPS.items() if kind == bank]
+
+    def _own(self, bank, category):
+        """카테고리 키의 소속 등록 (답변 반영용)"""
+        for group, prefix in self._groups(bank):
+            for key in self.banks[bank][category]['keys']:
+                owner = self._owners.get(prefix + key)
+                if owner is None:
+                    self._owners[prefix + key] = [group, category, 1]
+                else:
+                    owner[2] += 1
+
+    def _drop(self, bank, category):
+        """카테고리 제거 (키 소속, 합계)"""
+        entry = self.banks[bank].pop(category, None)
+        for group, prefix in self._groups(bank):
+            self.sums[group].pop(category, None)
+            for key in entry['keys'] if entry else ():
+                self._owners.pop(prefix + key, None)
+
+    def _recount(self, bank, category, stats):
+        """카테고리 합계 다시 계산 (키 목록은 그대로)"""
+        keys = self.banks[bank][category]['keys']
+        for group, prefix in self._groups(bank):
+            sums = empty_sums(len(keys))
+            for key in keys:
+                add_stat(sums, stats.get(prefix + key))
+            self.sums[group][category] = sums
+
+    def update(self, bank, categories, stats):
+        """{카테고리: (signature, keys_fn)} 중 signature가 바뀐 카테고리만 keys_fn()으로 다시 나열.
+        다시 계산한 카테고리 수 반환"""
+        rebuilt = 0
+        with self._lock:
+            cached = self.banks[bank]
+            for category, (signature, keys_fn) in categories.items():
+                entry = cached.get(category)
+                if entry is not None and entry['signature'] == signature:
+                    continue
+                self._drop(bank, category)
+                cached[category] = {'signature': signature, 'keys': list(keys_fn())}
+                self._own(bank, category)
+                self._recount(bank, category, stats)
+                rebuilt += 1
+            self.dirty |= bool(rebuilt)
+        return rebuilt
+
+    def sync(self, banks, stats, stats_signature, keep=()):
+        """시작할 때 맞추기. banks: {종류: {카테고리: (signature, keys_fn)}}.
+        없어진 카테고리는 제거 (keep은 아직 로드하지 않은 콘텐츠 팩 카테고리라 유지),
+        통계 파일이 캐시 이후 바뀌었으면 나머지 카테고리도 합계만 다시 계산. 다시 나열한 카테고리 수 반환"""
+        stats_changed = stats_signature != self.stats_signature
+        with self._lock:
+            for bank, categories in banks.items():
+                for category in [c for c in self.banks[bank] if c not in categories and c not in keep]:
+                    self._drop(bank, category)
+                    self.dirty = True
+
+        rebuilt = 0
+        for bank, categories in banks.items():
+            rebuilt += self.update(bank, categories, stats)
+
+        if stats_changed:
+            with self._lock:
+                for bank, categories in self.banks.items():
+                    for category in categories:
+                        self._recount(bank, category, stats)
+                self.stats_signature = stats_signature
+                self.dirty = True
+        return rebuilt
+
+    def on_stats_change(self, key, old, new):
+        """통계 저장소 listener (답변, 다른 인스턴스 기록 병합, 키 정리 모두 여기로)"""
+        owner = self._owners.get(key)
+        if owner is None:
+            return
+        group, category, count = owner
+        with self._lock:
+            sums = self.sums[group].get(category)
+            if sums is None:
+                return
+            add_stat(sums, old, -count)
+            add_stat(sums, new, count)
+            self.dirty = True
+
+    def summary(self, group, category, accuracy_filter=100):
+        """카테고리 요약 {'questions', 'due'(정답률 필터 이하), 'answered', 'accuracy'(%, 없으면 None)}.
+        캐시에 없으면 None"""
+        sums = self.sums[group].get(category)
+        if sums is None:
+            return None
+        limit = min(100, math.floor(accuracy_filter))
+        return {
+            'questions': sums['questions'],
+            'due': sum(sums['buckets'][:limit + 1]) if limit >= 0 else 0,
+            'answered': sums['answered'],
+            'accuracy': sums['correct'] / sums['total'] * 100 if sums['total'] else None,
+        }
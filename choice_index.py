@@ -0,0 +1,205 @@
+import re
+import sys
+import json
+import time
+import hashlib
+from pathlib import Path
+
+from quiz_log import logger
+
+INDEX_FILE = 'choice_index.json'
+INDEX_VERSION = 1
+
+_WORD = re.compile(r'\w+')
+
+
+def normalize(text):
+    """검색용 정규화 (소문자, 공백 제거)"""
+    return re.sub(r'\s+', '', str(text).lower())
+
+
+def tokenize(text):
+    """한 글자 + 두 글자(bigram) 토큰 집합"""
+    tokens = set()
+    for word in _WORD.findall(str(text).lower()):
+        tokens.update(word)
+        tokens.update(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+def query_tokens(query):
+    """검색어 토큰 (두 글자 이상 단어는 bigram만 사용)"""
+    tokens = set()
+    for word in _WORD.findall(str(query).lower()):
+        if len(word) == 1:
+            tokens.add(word)
+        else:
+            tokens.update(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+def category_hash(items):
+    """카테고리 내용 해시 (변경 감지용)"""
+    data = json.dumps(items, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+
+class ChoiceIndex:
+    """choices.yaml 선지 역색인 (카테고리 단위 증분 갱신)"""
+
+    def __init__(self):
+        self.docs = []            # 문서 ID → [카테고리, 항목, 선지] (삭제되면 None)
+        self.postings = {}        # 토큰 → 문서 ID 집합
+        self.category_hashes = {}
+        self.category_docs = {}   # 카테고리 → 문서 ID 목록
+
+    @classmethod
+    def load(cls, index_file=INDEX_FILE):
+        """디스크 캐시에서 로드 (없거나 버전이 다르면 빈 색인)"""
+        index = cls()
+        if not Path(index_file).exists():
+            return index
+        try:
+            with open(index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != INDEX_VERSION:
+                return index
+            index.docs = data['docs']
+            index.postings = {token: set(ids) for token, ids in data['postings'].items()}
+            index.category_hashes = data['category_hashes']
+            index.category_docs = data['category_docs']
+        except Exception as e:
+            logger.warning("선지 색인 로드 실패: %s", e)
+            return cls()
+        return index
+
+    def save(self, index_file=INDEX_FILE):
+        """디스크 캐시 저장"""
+        data = {
+            'version': INDEX_VERSION,
+            'docs': self.docs,
+            'postings': {token: sorted(ids) for token, ids in self.postings.items()},
+            'category_hashes': self.category_hashes,
+            'category_docs': self.category_docs,
+        }
+        with open(index_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+
+    def _remove_category(self, category):
+        """카테고리의 문서를 색인에서 제거"""
+        for doc_id in self.category_docs.pop(category, []):
+            _, item_name, description = self.docs[doc_id]
+            for token in tokenize(f"{item_name} {description}"):
+                ids = self.postings.get(token)
+                if ids is not None:
+                    ids.discard(doc_id)
+                    if not ids:
+                        del self.postings[token]
+            self.docs[doc_id] = None
+        self.category_hashes.pop(category, None)
+
+    def _add_category(self, category, items):
+        """카테고리의 모든 선지를 색인에 추가"""
+        doc_ids = []
+        if isinstance(items, dict):
+            for item_name, descriptions in items.items():
+                if not isinstance(descriptions, list):
+                    continue
+                for description in descriptions:
+                    doc_id = len(self.docs)
+                    self.docs.append([category, item_name, str(description)])
+                    doc_ids.append(doc_id)
+                    # 항목명도 함께 색인 (예: '규장각' 검색 시 규장각 선지 전체)
+                    for token in tokenize(f"{item_name} {description}"):
+                        self.postings.setdefault(token, set()).add(doc_id)
+        self.category_docs[category] = doc_ids
+        self.category_hashes[category] = category_hash(items)
+
+    def update(self, choice_data):
+        """YAML 데이터와 비교해 바뀐 카테고리만 다시 색인. 변경 여부 반환"""
+        changed = False
+
+        for category in list(self.category_hashes):
+            if category not in choice_data:
+                self._remove_category(category)
+                changed = True
+
+        for category, items in choice_data.items():
+            if self.category_hashes.get(category) == category_hash(items):
+                continue
+            self._remove_category(category)
+            self._add_category(category, items)
+            changed = True
+
+        # 삭제된 문서가 절반을 넘으면 처음부터 다시 색인
+        removed = sum(1 for doc in self.docs if doc is None)
+        if removed and removed * 2 > len(self.docs):
+            self.docs, self.postings = [], {}
+            self.category_hashes, self.category_docs = {}, {}
+            for category, items in choice_data.items():
+                self._add_category(category, items)
+
+        return changed
+
+    def search(self, query, categories=None):
+        """검색어를 모두 포함하는 선지 [(카테고리, 항목, 선지)]"""
+        tokens = query_tokens(query)
+        if not tokens:
+            return []
+
+        # 가장 짧은 포스팅부터 교집합
+        postings = sorted((self.postings.get(token, set()) for token in tokens), key=len)
+        candidates = set(postings[0])
+        for ids in postings[1:]:
+            candidates &= ids
+            if not candidates:
+                return []
+
+        # bigram 일치는 후보일 뿐이므로 원문 포함 여부로 확인
+        words = [normalize(word) for word in query.split() if word.strip()]
+        results = []
+        for doc_id in sorted(candidates):
+            category, item_name, description = self.docs[doc_id]
+            if categories is not None and category not in categories:
+                continue
+            text = normalize(f"{item_name} {description}")
+            if all(word in text for word in words):
+                results.append((category, item_name, description))
+        return results
+
+
+def load_index(choice_data, index_file=INDEX_FILE):
+    """캐시된 색인을 불러와 YAML 변경분만 반영"""
+    index = ChoiceIndex.load(index_file)
+    if index.update(choice_data):
+        try:
+            index.save(index_file)
+        except OSError as e:
+            logger.error("선지 색인 저장 실패: %s", e)
+    return index
+
+
+def main():
+    import yaml
+
+    if len(sys.argv) < 2:
+        print("사용법: python choice_index.py <검색어>")
+        return
+
+    with open('choices.yaml', 'r', encoding='utf-8') as f:
+        choice_data = yaml.safe_load(f) or {}
+
+    index = load_index(choice_data)
+    query = ' '.join(sys.argv[1:])
+
+    start = time.perf_counter()
+    results = index.search(query)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    for category, item_name, description in results:
+        print(f"  [{category}] {item_name}: {description}")
+    print(f"✓ '{query}': {len(results)}개 ({elapsed:.3f}ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+import sys
+import json
+import zlib
+import time
+import argparse
+from pathlib import Path
+import numpy as np
+
+from choice_index import normalize, category_hash
+from quiz_core import CHOICES_FILE, load_choice_data
+
+CACHE_FILE = 'choice_minhash.npz'
+CACHE_VERSION = 1
+
+# 글자 k-gram (한글은 2~3글자면 단어 일부가 겹쳐도 구분됨)
+SHINGLE_SIZE = 3
+
+# MinHash 서명 길이 = 밴드 수 x 밴드당 행 수
+# 후보가 될 확률 1-(1-J^r)^b: 임계값 근처 (1/b)^(1/r) ≈ 0.5에서 급격히 증가
+NUM_BANDS = 16
+BAND_ROWS = 4
+NUM_PERM = NUM_BANDS * BAND_ROWS
+
+# 기본 보고 기준 (추정이 아닌 실제 shingle Jaccard)
+DEFAULT_THRESHOLD = 0.5
+
+# 해시 계열: multiply-shift ((a*x + b) mod 2^64) >> 32 (나머지 연산 없이 곱셈/시프트만)
+# 고정 시드라 캐시된 서명과 호환
+MAX_HASH = np.uint64((1 << 32) - 1)
+_perm_rng = np.random.default_rng(20240501)
+PERM_A = _perm_rng.integers(1, 1 << 63, NUM_PERM, dtype=np.uint64) | np.uint64(1)
+PERM_B = _perm_rng.integers(0, 1 << 63, NUM_PERM, dtype=np.uint64)
+
+# 한 번에 해시할 shingle 수 (메모리: 이 값 x NUM_PERM x 8바이트)
+CHUNK_SHINGLES = 1 << 16
+
+
+def shingles(text):
+    """정규화한 글자 k-gram 집합 (짧은 선지는 전체를 하나로)"""
+    text = normalize(text)
+    if len(text) <= SHINGLE_SIZE:
+        return {text}
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def minhash(texts):
+    """여러 선지의 MinHash 서명 (개수 x NUM_PERM, uint32)
+
+    모든 shingle 해시를 이어 붙여 덩어리 단위로 순열 해시를 계산하고, 선지 경계별 최솟값 (reduceat)
+    """
+    signatures = np.full((len(texts), NUM_PERM), MAX_HASH, np.uint64)
+    values, owners = [], []
+    for doc, text in enumerate(texts):
+        hashes = [zlib.crc32(s.encode('utf-8')) for s in shingles(text)]
+        values.extend(hashes)
+        owners.extend([doc] * len(hashes))
+    if not values:
+        return signatures.astype(np.uint32)
+
+    values = np.array(values, np.uint64)
+    owners = np.array(owners, np.int64)
+    # (순열, shingle) 순서로 계산해서 선지 경계 reduceat이 연속 메모리를 따라가도록, 버퍼 재사용
+    buffer = np.empty((NUM_PERM, CHUNK_SHINGLES), np.uint64)
+    for start in range(0, len(values), CHUNK_SHINGLES):
+        # 덩어리 경계가 선지 중간이어도 최솟값끼리 다시 합치므로 문제없음
+        chunk = values[start:start + CHUNK_SHINGLES]
+        chunk_owners = owners[start:start + CHUNK_SHINGLES]
+        hashed = buffer[:, :len(chunk)]
+        np.multiply(PERM_A[:, None], chunk[None, :], out=hashed)
+        hashed += PERM_B[:, None]
+        hashed >>= np.uint64(32)
+        bounds = np.flatnonzero(np.r_[True, chunk_owners[1:] != chunk_owners[:-1]])
+        docs = chunk_owners[bounds]
+        signatures[docs] = np.minimum(signatures[docs], np.minimum.reduceat(hashed, bounds, axis=1).T)
+    return signatures.astype(np.uint32)
+
+
+def candidate_pairs(signatures):
+    """LSH 밴드별로 서명 일부가 같은 선지 쌍 (전체 쌍 비교 없이 O(n) 버킷팅)"""
+    pairs = set()
+    n = len(signatures)
+    if n < 2:
+        return pairs
+    mixer = np.random.default_rng(7).integers(1, 1 << 63, BAND_ROWS, dtype=np.uint64) | np.uint64(1)
+    for band in range(NUM_BANDS):
+        rows = signatures[:, band * BAND_ROWS:(band + 1) * BAND_ROWS].astype(np.uint64)
+        # 밴드 값을 64비트 하나로 섞어서 정렬 → 같은 값끼리 연속
+        keys = (rows * mixer).sum(axis=1)
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        ends = np.r_[starts[1:], n]
+        for start, end in zip(starts[ends - starts > 1], ends[ends - starts > 1]):
+            bucket = np.sort(order[start:end]).tolist()
+            for i, a in enumerate(bucket):
+                for b in bucket[i + 1:]:
+                    pairs.add((a, b))
+    return pairs
+
+
+def flatten(choice_data, category):
+    """카테고리의 선지 [[카테고리, 항목, 선지]]"""
+    docs = []
+    items = choice_data.get(category)
+    if isinstance(items, dict):
+        for item_name, descriptions in items.items():
+            if isinstance(descriptions, list):
+                docs.extend([category, item_name, str(d)] for d in descriptions)
+    return docs
+
+
+class MinHashIndex:
+    """선지 MinHash 서명 캐시 (카테고리 단위 증분 갱신, YAML을 고쳐도 바뀐 카테고리만 다시 계산)"""
+
+    def __init__(self):
+        self.docs = []               # [카테고리, 항목, 선지]
+        self.signatures = np.zeros((0, NUM_PERM), np.uint32)
+        self.category_hashes = {}
+
+    @classmethod
+    def load(cls, cache_file=CACHE_FILE):
+        """캐시 로드 (없거나 버전/해시 설정이 다르면 빈 인덱스)"""
+        index = cls()
+        if not Path(cache_file).exists():
+            return index
+        try:
+            with np.load(cache_file) as data:
+                meta = json.loads(str(data['meta']))
+                if meta.get('version') != CACHE_VERSION or data['signatures'].shape[1] != NUM_PERM:
+                    return index
+                index.docs = meta['docs']
+                index.category_hashes = meta['category_hashes']
+                index.signatures = data['signatures']
+        except Exception as e:
+            print(f"MinHash 캐시 로드 실패: {e}")
+            return cls()
+        return index
+
+    def save(self, cache_file=CACHE_FILE):
+        meta = json.dumps({'version': CACHE_VERSION, 'docs': self.docs,
+                           'category_hashes': self.category_hashes}, ensure_ascii=False)
+        with open(cache_file, 'wb') as f:
+            np.savez(f, meta=np.array(meta), signatures=self.signatures)
+
+    def update(self, choice_data):
+        """YAML 데이터와 비교해 바뀐 카테고리만 다시 계산. 다시 계산한 선지 수 반환"""
+        changed = {category for category, items in choice_data.items()
+                   if self.category_hashes.get(category) != category_hash(items)}
+        removed = set(self.category_hashes) - set(choice_data)
+        if not changed and not removed:
+            return 0
+
+        keep = [i for i, doc in enumerate(self.docs) if doc[0] not in changed | removed]
+        new_docs = [doc for category in choice_data if category in changed
+                    for doc in flatten(choice_data, category)]
+
+        self.docs = [self.docs[i] for i in keep] + new_docs
+        self.signatures = np.vstack([self.signatures[keep],
+                                     minhash([f"{doc[2]}" for doc in new_docs])])
+        self.category_hashes = {category: category_hash(items) for category, items in choice_data.items()}
+        return len(new_docs)
+
+    def find_similar(self, threshold=DEFAULT_THRESHOLD):
+        """비슷한 선지 쌍 [(유사도, 종류, 문서 a, 문서 b)] (유사도 높은 순)
+
+        종류: 'ambiguous' (같은 카테고리, 다른 항목 → 한 문제의 보기끼리 헷갈림),
+              'duplicate' (같은 항목에 같은 내용), 'cross' (다른 카테고리)
+        """
+        results = []
+        shingle_cache = {}
+        for a, b in candidate_pairs(self.signatures):
+            # 추정치로 먼저 거르고 실제 Jaccard로 확인
+            if np.mean(self.signatures[a] == self.signatures[b]) < threshold * 0.7:
+                continue
+            sa = shingle_cache.setdefault(a, shingles(self.docs[a][2]))
+            sb = shingle_cache.setdefault(b, shingles(self.docs[b][2]))
+            similarity = jaccard(sa, sb)
+            if similarity < threshold:
+                continue
+            doc_a, doc_b = self.docs[a], self.docs[b]
+            if doc_a[0] != doc_b[0]:
+                kind = 'cross'
+            elif doc_a[1] == doc_b[1]:
+                kind = 'duplicate'
+            else:
+                kind = 'ambiguous'
+            results.append((similarity, kind, doc_a, doc_b))
+        results.sort(key=lambda r: (-r[0], r[2], r[3]))
+        return results
+
+
+def brute_force(texts, threshold):
+    """전체 쌍 비교 (벤치마크 기준값)"""
+    sets = [shingles(t) for t in texts]
+    return {(a, b) for a in range(len(sets)) for b in range(a + 1, len(sets))
+            if jaccard(sets[a], sets[b]) >= threshold}
+
+
+def synthetic_texts(count, seed=0):
+    """합성 선지 (무작위 한글 음절 문장, 일부는 다른 선지를 조금 바꾼 것)"""
+    rng = np.random.default_rng(seed)
+    texts = []
+    for _ in range(count):
+        if texts and rng.random() < 0.05:
+            base = list(texts[rng.integers(len(texts))])
+            for _ in range(max(1, len(base) // 10)):
+                base[rng.integers(len(base))] = chr(0xAC00 + rng.integers(11172))
+            texts.append(''.join(base))
+        else:
+            length = rng.integers(8, 40)
+            texts.append(''.join(chr(0xAC00 + c) for c in rng.integers(0, 11172, length)))
+    return texts
+
+
+def benchmark(count, threshold):
+    """합성 선지 N개 서명 + LSH 시간 (작으면 전체 쌍 비교와 재현율도)"""
+    texts = synthetic_texts(count)
+    start = time.perf_counter()
+    signatures = minhash(texts)
+    minhash_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pairs = candidate_pairs(signatures)
+    lsh_s = time.perf_counter() - start
+    print(f"✓ 선지 {count:,}개: MinHash {minhash_s:.2f}초, LSH 후보 {len(pairs):,}쌍 {lsh_s:.2f}초")
+
+    if count <= 5000:
+        start = time.perf_counter()
+        truth = brute_force(texts, threshold)
+        brute_s = time.perf_counter() - start
+        sets = {}
+        found = {(a, b) for a, b in pairs
+                 if jaccard(sets.setdefault(a, shingles(texts[a])),
+                            sets.setdefault(b, shingles(texts[b]))) >= threshold}
+        recall = len(found & truth) / len(truth) if truth else 1.0
+        print(f"  전체 쌍 비교 {brute_s:.2f}초, 실제 {len(truth)}쌍 중 {recall:.1%} 찾음")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="choices.yaml 근접 중복/헷갈리는 선지 검사 (MinHash LSH)")
+    parser.add_argument('--choices', default=CHOICES_FILE, help="선지 YAML 파일")
+    parser.add_argument('--cache', default=CACHE_FILE, help="MinHash 캐시 파일")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="보고할 유사도 (글자 3-gram Jaccard)")
+    parser.add_argument('--all', action='store_true', help="다른 카테고리 사이 중복도 출력")
+    parser.add_argument('--report', help="결과 JSON 파일")
+    parser.add_argument('--bench', type=int, default=None, metavar='N',
+                        help="합성 선지 N개로 속도 측정")
+    args = parser.parse_args()
+
+    if args.bench:
+        benchmark(args.bench, args.threshold)
+        return
+
+    print("=" * 60)
+    print("🔎 선지 유사도 검사")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    choice_data = load_choice_data(args.choices)
+    index = MinHashIndex.load(args.cache)
+    computed = index.update(choice_data)
+    if computed:
+        index.save(args.cache)
+    results = index.find_similar(args.threshold)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"✓ 선지 {len(index.docs)}개 (새로 계산 {computed}개), {elapsed:.0f}ms")
+
+    labels = {'ambiguous': '⚠ 헷갈림', 'duplicate': '• 중복', 'cross': '· 카테고리 간'}
+    counts = dict.fromkeys(labels, 0)
+    for similarity, kind, doc_a, doc_b in results:
+        counts[kind] += 1
+        if kind == 'cross' and not args.all:
+            continue
+        print(f"\n{labels[kind]} ({similarity:.0%})")
+        print(f"  [{doc_a[0]}] {doc_a[1]}: {doc_a[2]}")
+        print(f"  [{doc_b[0]}] {doc_b[1]}: {doc_b[2]}")
+
+    print(f"\n헷갈림 {counts['ambiguous']}쌍, 중복 {counts['duplicate']}쌍, "
+          f"카테고리 간 {counts['cross']}쌍")
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump([{'similarity': s, 'kind': kind, 'a': a, 'b': b} for s, kind, a, b in results],
+                      f, ensure_ascii=False, indent=1)
+
+    # 같은 문제의 보기끼리 헷갈리는 선지가 있으면 실패 (커밋 전 검사용)
+    sys.exit(1 if counts['ambiguous'] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+import io
+import json
+import time
+import shutil
+import zipfile
+import threading
+import argparse
+from pathlib import Path
+from PIL import Image
+
+from quiz_core import IMAGE_SUFFIXES, folder_order, category_name, count_choices
+
+PACKS_FOLDER = 'packs'
+
+# 팩 구조 (폴더 또는 같은 구조의 zip):
+#   pack.json    {"title", "choices": {카테고리: 선지 수}, "eras": [{"folder", "name", "count"}]}
+#   choices.yaml (선택, 카테고리 → 항목 → 선지 목록, choices.yaml과 같은 형식)
+#   images/<시대 폴더>/<이미지> (선택)
+# 시작할 때는 pack.json만 읽고, 선지/이미지는 그 카테고리를 고를 때 로드
+PACK_MANIFEST = 'pack.json'
+PACK_CHOICES = 'choices.yaml'
+PACK_IMAGES = 'images'
+
+# zip 팩 안의 이미지를 가리키는 표시용 경로 접두사 ('pack:<팩 이름>:<zip 안 경로>')
+PACK_PREFIX = 'pack:'
+
+
+def parse_choices(data):
+    """선지 YAML 파싱 (libyaml이 있으면 C 로더 사용)"""
+    import yaml
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    return yaml.load(data, Loader=loader) or {}
+
+
+class ContentPack:
+    """추가 문제 팩 하나 (폴더 또는 zip). 매니페스트만 먼저 읽고 나머지는 필요할 때 로드"""
+
+    def __init__(self, path, manifest):
+        self.path = Path(path)
+        self.name = self.path.stem if self.path.suffix == '.zip' else self.path.name
+        self.title = manifest.get('title', self.name)
+        self.choice_counts = manifest.get('choices', {})
+        self.eras = manifest.get('eras', [])
+        self.is_zip = self.path.suffix == '.zip'
+        self._zip = None
+        self._zip_lock = threading.Lock()
+        self._choices = None
+        self._members = None
+
+    @classmethod
+    def open(cls, path):
+        """매니페스트만 읽어서 열기"""
+        path = Path(path)
+        if path.suffix == '.zip':
+            with zipfile.ZipFile(path) as zf:
+                manifest = json.loads(zf.read(PACK_MANIFEST).decode('utf-8'))
+        else:
+            with open(path / PACK_MANIFEST, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        return cls(path, manifest)
+
+    def _zipfile(self):
+        # 썸네일/통계 스레드에서 동시에 처음 열어도 한 번만
+        with self._zip_lock:
+            if self._zip is None:
+                self._zip = zipfile.ZipFile(self.path)
+            return self._zip
+
+    def load_choices(self):
+        """팩의 선지 데이터 (처음 한 번만 파싱)"""
+        if self._choices is None:
+            if self.is_zip:
+                names = set(self._zipfile().namelist())
+                data = self._zipfile().read(PACK_CHOICES).decode('utf-8') if PACK_CHOICES in names else ''
+                self._choices = parse_choices(data)
+            elif (self.path / PACK_CHOICES).exists():
+                with open(self.path / PACK_CHOICES, 'r', encoding='utf-8') as f:
+                    self._choices = parse_choices(f)
+            else:
+                self._choices = {}
+        return self._choices
+
+    def images_in(self, folder):
+        """시대 폴더의 이미지 (통계 키, 표시용 경로, 유물명) 목록 (이름순)"""
+        if not self.is_zip:
+            folder_path = self.path / PACK_IMAGES / folder
+            for img_file in sorted(folder_path.glob('*')):
+                if img_file.suffix.lower() in IMAGE_SUFFIXES:
+                    yield str(img_file), str(img_file), img_file.name
+            return
+
+        if self._members is None:
+            # zip 목록은 처음 필요할 때 한 번만 (시대 폴더별로 묶음)
+            members = {}
+            for member in sorted(self._zipfile().namelist()):
+                parts = member.split('/')
+                if (len(parts) == 3 and parts[0] == PACK_IMAGES
+                        and Path(member).suffix.lower() in IMAGE_SUFFIXES):
+                    members.setdefault(parts[1], []).append(member)
+            self._members = members
+        for member in self._members.get(folder, []):
+            yield (f"{self.path.as_posix()}/{member}", f"{PACK_PREFIX}{self.name}:{member}",
+                   member.rsplit('/', 1)[1])
+
+    def read(self, member):
+        """zip 안 이미지의 인코딩된 바이트"""
+        return self._zipfile().read(member)
+
+    def member_size(self, member):
+        """zip 안 파일의 원래 크기 (압축 해제 없이)"""
+        return self._zipfile().getinfo(member).file_size
+
+    def close(self):
+        with self._zip_lock:
+            if self._zip is not None:
+                self._zip.close()
+                self._zip = None
+
+
+class ContentLibrary:
+    """packs 폴더의 콘텐츠 팩 목록 (시작 비용 = 매니페스트 읽기만)"""
+
+    def __init__(self, folder=PACKS_FOLDER):
+        self.packs = {}
+        folder = Path(folder)
+        if not folder.exists():
+            return
+        for path in sorted(folder.iterdir()):
+            if not (path.suffix == '.zip' or (path / PACK_MANIFEST).exists()):
+                continue
+            try:
+                pack = ContentPack.open(path)
+            except Exception as e:
+                print(f"콘텐츠 팩 로드 실패 {path}: {e}")
+                continue
+            if pack.name in self.packs:
+                print(f"⚠ 같은 이름의 콘텐츠 팩: {path}")
+                continue
+            self.packs[pack.name] = pack
+
+    def choice_categories(self):
+        """팩의 선지 카테고리 {카테고리: (팩 이름, 선지 수)} (같은 카테고리는 먼저 나온 팩)"""
+        categories = {}
+        for pack in self.packs.values():
+            for category, count in pack.choice_counts.items():
+                categories.setdefault(category, (pack.name, count))
+        return categories
+
+    def merge_eras(self, categories):
+        """기본 시대 목록에 팩의 시대를 합침 (같은 이름이면 한 카테고리, category['packs']에 [팩, 폴더])"""
+        merged = [dict(category) for category in categories]
+        by_name = {category['name']: category for category in merged}
+        for pack in self.packs.values():
+            for era in pack.eras:
+                category = by_name.get(era['name'])
+                if category is None:
+                    category = {'folder': era['folder'], 'name': era['name']}
+                    by_name[era['name']] = category
+                    merged.append(category)
+                category.setdefault('packs', []).append([pack.name, era['folder']])
+        merged.sort(key=lambda c: folder_order(Path(c['folder'])))
+        return merged
+
+    def load_choices(self, categories):
+        """선택한 카테고리의 선지 데이터 (필요한 팩만 파싱).
+        ({카테고리: 항목}, {읽지 못한 팩 이름: 오류}) 반환 (읽지 못한 팩의 카테고리는 건너뜀)"""
+        owners = self.choice_categories()
+        loaded = {}
+        failed = {}
+        for category in categories:
+            owner = owners.get(category)
+            if owner is None or owner[0] in failed:
+                continue
+            try:
+                choices = self.packs[owner[0]].load_choices()
+            except Exception as e:
+                failed[owner[0]] = e
+                continue
+            items = choices.get(category)
+            if items is not None:
+                loaded[category] = items
+        return loaded, failed
+
+    def images_in(self, pack_name, folder):
+        """팩 시대 폴더의 이미지 (팩이 없으면 빈 목록)"""
+        pack = self.packs.get(pack_name)
+        return pack.images_in(folder) if pack else iter(())
+
+    def _member(self, ref):
+        """'pack:<팩>:<경로>' → (팩, zip 안 경로)"""
+        pack_name, member = ref[len(PACK_PREFIX):].split(':', 1)
+        return self.packs[pack_name], member
+
+    def read(self, ref):
+        """표시용 경로의 이미지 바이트"""
+        pack, member = self._member(ref)
+        return pack.read(member)
+
+    def stamp(self, ref):
+        """썸네일 캐시 변경 감지용 (팩 파일 수정 시각, 이미지 크기)"""
+        pack, member = self._member(ref)
+        return [pack.path.stat().st_mtime, pack.member_size(member)]
+
+    def open_image(self, ref):
+        """표시용 경로의 이미지 열기"""
+        return Image.open(io.BytesIO(self.read(ref)))
+
+    def close(self):
+        for pack in self.packs.values():
+            pack.close()
+
+
+def build_pack(name, choices_file=None, image_folder=None, title=None, packs_folder=PACKS_FOLDER,
+               as_zip=False):
+    """선지 YAML/시대별 이미지 폴더로 팩 만들기 (매니페스트의 카테고리/개수 자동 작성). 팩 경로 반환"""
+    manifest = {'title': title or name, 'choices': {}, 'eras': []}
+    files = []   # (팩 안 경로, 원본 파일)
+
+    if choices_file:
+        with open(choices_file, 'r', encoding='utf-8') as f:
+            choice_data = parse_choices(f)
+        manifest['choices'] = {category: count_choices(items) for category, items in choice_data.items()}
+        files.append((PACK_CHOICES, Path(choices_file)))
+
+    if image_folder:
+        for folder in sorted(Path(image_folder).iterdir(), key=folder_order):
+            if not folder.is_dir():
+                continue
+            images = [p for p in sorted(folder.iterdir()) if p.suffix.lower() in IMAGE_SUFFIXES]
+            manifest['eras'].append({'folder': folder.name, 'name': category_name(folder.name),
+                                     'count': len(images)})
+            files.extend((f"{PACK_IMAGES}/{folder.name}/{p.name}", p) for p in images)
+
+    packs_folder = Path(packs_folder)
+    packs_folder.mkdir(parents=True, exist_ok=True)
+    manifest_data = json.dumps(manifest, ensure_ascii=False, indent=1)
+
+    if as_zip:
+        path = packs_folder / f"{name}.zip"
+        with zipfile.ZipFile(path, 'w') as zf:
+            zf.writestr(PACK_MANIFEST, manifest_data)
+            for member, source in files:
+                # 이미지는 이미 압축된 포맷이라 저장만
+                compress = zipfile.ZIP_DEFLATED if member == PACK_CHOICES else zipfile.ZIP_STORED
+                zf.write(source, member, compress_type=compress)
+        return path
+
+    path = packs_folder / name
+    path.mkdir(parents=True, exist_ok=True)
+    for member, source in files:
+        (path / member).parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(source, path / member)
+    (path / PACK_MANIFEST).write_text(manifest_data, encoding='utf-8')
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="콘텐츠 팩 만들기/목록")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    build = sub.add_parser('build', help="선지 YAML/이미지 폴더로 팩 만들기")
+    build.add_argument('name', help="팩 이름")
+    build.add_argument('--choices', help="선지 YAML 파일")
+    build.add_argument('--images', help="시대별 이미지 폴더 ('1.구석기/...' 구조)")
+    build.add_argument('--title', help="표시 이름")
+    build.add_argument('--zip', action='store_true', help="zip 파일 하나로")
+    build.add_argument('--packs', default=PACKS_FOLDER, help="팩 폴더")
+
+    listing = sub.add_parser('list', help="팩 목록과 시작 시 읽기 시간")
+    listing.add_argument('--packs', default=PACKS_FOLDER, help="팩 폴더")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("📦 콘텐츠 팩")
+    print("=" * 60)
+
+    if args.command == 'build':
+        if not args.choices and not args.images:
+            print("⚠ --choices 또는 --images가 필요합니다.")
+            return
+        path = build_pack(args.name, args.choices, args.images, args.title, args.packs, args.zip)
+        pack = ContentPack.open(path)
+        print(f"✓ {path}: 선지 카테고리 {len(pack.choice_counts)}개 "
+              f"({sum(pack.choice_counts.values())}개), 시대 {len(pack.eras)}개 "
+              f"(이미지 {sum(era['count'] for era in pack.eras)}개)")
+        return
+
+    start = time.perf_counter()
+    library = ContentLibrary(args.packs)
+    elapsed = (time.perf_counter() - start) * 1000
+    for pack in library.packs.values():
+        print(f"• {pack.name} ({pack.title}) {'[zip]' if pack.is_zip else ''}")
+        for category, count in pack.choice_counts.items():
+            print(f"    선지 {category}: {count}개")
+        for era in pack.eras:
+            print(f"    시대 {era['name']}: 이미지 {era['count']}개")
+    print(f"\n✓ 팩 {len(library.packs)}개 매니페스트 ({elapsed:.1f}ms)")
+
+
+if __name__ == "__main__":
+    main()
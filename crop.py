@@ -1,19 +1,31 @@
 import cv2
 import os
+import time
 from pathlib import Path
 import numpy as np
-from PIL import Image
+from region_detect import propose_all, proposal_key
+from crop_manifest import CropManifest, MANIFEST_FILE, file_sha1
+from tile_cache import TiledImage, TILE_CACHE_FOLDER
 
 class ImageCropper:
-    def __init__(self, input_folder='input', output_folder='output'):
+    def __init__(self, input_folder='input', output_folder='output', auto_detect=True,
+                 manifest_file=MANIFEST_FILE, tile_cache=TILE_CACHE_FOLDER):
         self.input_folder = input_folder
         self.output_folder = output_folder
-        self.current_image = None
+        self.auto_detect = auto_detect
+        self.tile_cache = tile_cache
+        # 원본은 디스크 타일 캐시 (TiledImage, 화면에 보이는 타일만 읽음)
         self.original_image = None
         self.display_image = None
         self.image_name = ""
         self.crop_index = 0
         
+        # 크롭은 매니페스트에 기록만 하고 픽셀은 종료할 때 바뀐 것만 생성
+        self.manifest = CropManifest(manifest_file)
+        self.image_path = None
+        self.source_sha1 = None
+        self.last_crop_id = None
+        
         # 뷰포트 관련 변수
         self.zoom_level = 1.0
         self.offset_x = 0
@@ -26,6 +38,11 @@ class ImageCropper:
         self.start_point = None
         self.end_point = None
         
+        # 자동 검출 후보 영역 (파일명 → 사각형 목록)
+        self.all_proposals = {}
+        self.proposals = []
+        self.proposal_index = 0
+        
         # 화면 크기
         self.screen_width = 1200
         self.screen_height = 800
@@ -50,22 +67,13 @@ class ImageCropper:
         return sorted(image_files)
     
     def load_image(self, image_path):
-        """이미지 로드 (jfif 파일 지원)"""
+        """이미지 로드 (jfif 파일 지원). 처음 열 때 한 번만 디코딩해서 타일 캐시 생성"""
         try:
-            # PIL로 이미지 열기
-            pil_image = Image.open(str(image_path))
-            
-            # RGB로 변환 (RGBA나 다른 모드 처리)
-            if pil_image.mode != 'RGB':
-                pil_image = pil_image.convert('RGB')
-            
-            # numpy 배열로 변환
-            img_array = np.array(pil_image)
-            
-            # RGB에서 BGR로 변환 (OpenCV 형식)
-            img_bgr = cv2.cvtColor(img_array, cv2.COLOR_RGB2BGR)
-            
-            return img_bgr
+            start = time.perf_counter()
+            image, built = TiledImage.open(image_path, self.tile_cache)
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"   로드: 타일 캐시 {'생성' if built else '재사용'} | {elapsed:.1f}ms")
+            return image
         except Exception as e:
             print(f"이미지 로드 실패: {e}")
             return None
@@ -84,43 +92,33 @@ class ImageCropper:
             self.offset_y = 0
     
     def get_display_image(self):
-        """현재 뷰포트에 맞는 이미지 생성"""
-        if self.current_image is None:
+        """현재 뷰포트에 맞는 이미지 생성 (보이는 타일만 읽음)"""
+        if self.original_image is None:
             return None
         
-        h, w = self.current_image.shape[:2]
+        h, w = self.original_image.shape[:2]
         
         # 줌 적용
         new_w = int(w * self.zoom_level)
         new_h = int(h * self.zoom_level)
         
-        if new_w <= 0 or new_h <= 0:
-            return self.current_image
-        
-        zoomed = cv2.resize(self.current_image, (new_w, new_h))
-        
         # 오프셋 범위 제한
         max_offset_x = max(0, new_w - self.screen_width)
         max_offset_y = max(0, new_h - self.screen_height)
         self.offset_x = max(0, min(self.offset_x, max_offset_x))
         self.offset_y = max(0, min(self.offset_y, max_offset_y))
         
-        # 뷰포트 크롭
-        x1 = self.offset_x
-        y1 = self.offset_y
-        x2 = min(x1 + self.screen_width, new_w)
-        y2 = min(y1 + self.screen_height, new_h)
-        
-        display = zoomed[y1:y2, x1:x2]
-        
-        # 화면 크기에 맞게 패딩
-        if display.shape[0] < self.screen_height or display.shape[1] < self.screen_width:
-            canvas = np.zeros((self.screen_height, self.screen_width, 3), dtype=np.uint8)
-            canvas[:display.shape[0], :display.shape[1]] = display
-            display = canvas
-        
+        # 뷰포트 영역 (화면 크기에 맞게 패딩)
+        view = self.original_image.viewport(self.zoom_level, self.offset_x, self.offset_y,
+                                            self.screen_width, self.screen_height)
+        display = np.zeros((self.screen_height, self.screen_width, 3), dtype=np.uint8)
+        display[:view.shape[0], :view.shape[1]] = view
         return display
     
+    def image_to_screen_coords(self, x, y):
+        """원본 이미지 좌표를 화면 좌표로 변환"""
+        return int(x * self.zoom_level) - self.offset_x, int(y * self.zoom_level) - self.offset_y
+    
     def screen_to_image_coords(self, x, y):
         """화면 좌표를 원본 이미지 좌표로 변환"""
         img_x = int((x + self.offset_x) / self.zoom_level)
@@ -153,26 +151,15 @@ class ImageCropper:
             self.end_point = self.start_point
             
         elif event == cv2.EVENT_MOUSEMOVE and self.drawing:
+            # 선택 사각형은 화면에 그릴 때 표시 (원본 복사 없음)
             self.end_point = self.screen_to_image_coords(x, y)
-            # 사각형 그리기
-            temp = self.original_image.copy()
-            cv2.rectangle(temp, self.start_point, self.end_point, (0, 0, 255), 2)
-            self.current_image = temp
             
         elif event == cv2.EVENT_LBUTTONUP and self.drawing:
             self.drawing = False
             self.end_point = self.screen_to_image_coords(x, y)
             
-            # 최종 사각형
-            temp = self.original_image.copy()
-            cv2.rectangle(temp, self.start_point, self.end_point, (0, 0, 255), 2)
-            self.current_image = temp
-            
             # 크롭 및 저장
             self.crop_and_save()
-            
-            # 원본으로 복원
-            self.current_image = self.original_image.copy()
         
         # 마우스 휠로 줌
         elif event == cv2.EVENT_MOUSEWHEEL:
@@ -183,14 +170,18 @@ class ImageCropper:
             
             self.zoom_level = max(0.1, min(5.0, self.zoom_level))
     
-    def crop_and_save(self):
-        """선택 영역 크롭 및 저장"""
-        if self.start_point and self.end_point:
+    def crop_and_save(self, rect=None):
+        """선택 영역을 매니페스트에 기록 (rect가 주어지면 해당 영역, 이미지는 빌드할 때 생성)"""
+        if rect is None and self.start_point and self.end_point:
+            rect = (self.start_point[0], self.start_point[1],
+                    self.end_point[0], self.end_point[1])
+        
+        if rect:
             # 좌표 정렬
-            x1 = min(self.start_point[0], self.end_point[0])
-            y1 = min(self.start_point[1], self.end_point[1])
-            x2 = max(self.start_point[0], self.end_point[0])
-            y2 = max(self.start_point[1], self.end_point[1])
+            x1 = min(rect[0], rect[2])
+            y1 = min(rect[1], rect[3])
+            x2 = max(rect[0], rect[2])
+            y2 = max(rect[1], rect[3])
             
             # 영역이 너무 작으면 무시
             if abs(x2 - x1) < 10 or abs(y2 - y1) < 10:
@@ -204,40 +195,84 @@ class ImageCropper:
             x2 = max(0, min(x2, width))
             y2 = max(0, min(y2, height))
             
-            # 크롭
-            cropped = self.original_image[y1:y2, x1:x2].copy()
-            
-            if cropped.size == 0:
+            if x2 <= x1 or y2 <= y1:
                 print("⚠ 크롭된 이미지가 비어있습니다.")
                 return
             
-            # 저장 경로 생성
-            output_dir = Path(self.output_folder).resolve() / self.image_name
-            output_dir.mkdir(parents=True, exist_ok=True)
-            
-            image_path = output_dir / f"{self.crop_index}.png"
-            
-            # 저장 시도
+            # 픽셀 대신 (원본 해시, 사각형) 기록
+            crop_id = self.manifest.add(self.image_path, self.source_sha1, (x1, y1, x2, y2),
+                                        self.crop_index)
             try:
-                # cv2.imwrite로 저장
-                encode_param = [int(cv2.IMWRITE_PNG_COMPRESSION), 3]
-                success = cv2.imwrite(str(image_path), cropped, encode_param)
-                
-                if not success or not image_path.exists():
-                    # PIL로 재시도
-                    rgb_image = cv2.cvtColor(cropped, cv2.COLOR_BGR2RGB)
-                    pil_img = Image.fromarray(rgb_image)
-                    pil_img.save(str(image_path))
-                
-                if image_path.exists():
-                    file_size = image_path.stat().st_size
-                    print(f"✓ 저장완료 [{self.crop_index}]: {image_path.name} ({file_size:,} bytes)")
-                    self.crop_index += 1
-                else:
-                    print(f"❌ 저장 실패")
-                    
+                self.manifest.save()
             except Exception as e:
-                print(f"❌ 저장 오류: {e}")
+                print(f"❌ 매니페스트 저장 오류: {e}")
+                return
+            
+            print(f"✓ 기록 [{self.crop_index}]: {crop_id} ({x2 - x1}x{y2 - y1})")
+            self.last_crop_id = crop_id
+            self.crop_index += 1
+    
+    def rotate_last_crop(self):
+        """마지막 크롭 90도 회전 (매니페스트만 수정)"""
+        if not self.last_crop_id:
+            return
+        self.manifest.rotate(self.last_crop_id)
+        self.manifest.save()
+        rotation = self.manifest.crops[self.last_crop_id]['rotation']
+        print(f"↻ {self.last_crop_id}: {rotation}도")
+    
+    def build_crops(self):
+        """매니페스트에서 바뀐 크롭만 이미지로 생성"""
+        built, kept, removed, errors = self.manifest.build(self.output_folder,
+                                                           tile_cache=self.tile_cache)
+        print(f"📦 크롭 이미지 생성 {built}개 (변경 없음 {kept}개)"
+              + (f", 오류 {errors}개" if errors else ""))
+    
+    def draw_proposals(self, img):
+        """자동 검출 후보 영역 표시 (현재 후보는 굵은 노란색)"""
+        img = img.copy()
+        for i, (x1, y1, x2, y2) in enumerate(self.proposals):
+            p1 = self.image_to_screen_coords(x1, y1)
+            p2 = self.image_to_screen_coords(x2, y2)
+            if i == self.proposal_index:
+                cv2.rectangle(img, p1, p2, (0, 255, 255), 3)
+            else:
+                cv2.rectangle(img, p1, p2, (255, 200, 0), 1)
+        
+        # 드래그 중인 선택 영역
+        if self.drawing and self.start_point and self.end_point:
+            cv2.rectangle(img, self.image_to_screen_coords(*self.start_point),
+                          self.image_to_screen_coords(*self.end_point), (0, 0, 255), 2)
+        return img
+    
+    def accept_proposal(self):
+        """현재 후보 영역 저장 후 목록에서 제거"""
+        if not self.proposals:
+            return
+        rect = self.proposals.pop(self.proposal_index)
+        self.crop_and_save(rect)
+        self.proposal_index = min(self.proposal_index, max(0, len(self.proposals) - 1))
+    
+    def reject_proposal(self):
+        """현재 후보 영역 버리기"""
+        if not self.proposals:
+            return
+        self.proposals.pop(self.proposal_index)
+        self.proposal_index = min(self.proposal_index, max(0, len(self.proposals) - 1))
+    
+    def next_proposal(self):
+        """다음 후보 영역으로 이동"""
+        if self.proposals:
+            self.proposal_index = (self.proposal_index + 1) % len(self.proposals)
+    
+    def export_all_proposals(self):
+        """남은 후보 영역 일괄 저장"""
+        count = len(self.proposals)
+        for rect in self.proposals:
+            self.crop_and_save(rect)
+        self.proposals = []
+        self.proposal_index = 0
+        print(f"📦 후보 영역 {count}개 일괄 저장")
     
     def draw_info(self, img):
         """화면에 정보 표시"""
@@ -245,15 +280,18 @@ class ImageCropper:
         
         # 반투명 배경
         overlay = info_img.copy()
-        cv2.rectangle(overlay, (10, 10), (400, 120), (0, 0, 0), -1)
+        cv2.rectangle(overlay, (10, 10), (400, 195), (0, 0, 0), -1)
         cv2.addWeighted(overlay, 0.7, info_img, 0.3, 0, info_img)
         
         # 정보 텍스트
         font = cv2.FONT_HERSHEY_SIMPLEX
         cv2.putText(info_img, f"Zoom: {self.zoom_level:.1f}x", (20, 35), font, 0.6, (255, 255, 255), 1)
-        cv2.putText(info_img, f"Crops: {self.crop_index}", (20, 60), font, 0.6, (255, 255, 255), 1)
+        cv2.putText(info_img, f"Crops: {self.crop_index} | Proposals: {len(self.proposals)}", (20, 60), font, 0.6, (255, 255, 255), 1)
         cv2.putText(info_img, "Left Click: Crop", (20, 85), font, 0.5, (0, 255, 0), 1)
         cv2.putText(info_img, "Right Drag: Pan | Wheel: Zoom", (20, 105), font, 0.5, (0, 255, 255), 1)
+        cv2.putText(info_img, "Enter/Y: Accept | N: Reject | Tab: Next", (20, 130), font, 0.5, (0, 255, 255), 1)
+        cv2.putText(info_img, "B: Save All Proposals", (20, 155), font, 0.5, (0, 255, 255), 1)
+        cv2.putText(info_img, "T: Rotate Last Crop", (20, 180), font, 0.5, (0, 255, 255), 1)
         
         return info_img
     
@@ -265,9 +303,15 @@ class ImageCropper:
             print(f"⚠ 이미지를 불러올 수 없습니다: {image_path}")
             return False
         
-        self.current_image = self.original_image.copy()
         self.image_name = image_path.stem
-        self.crop_index = 0
+        self.image_path = image_path
+        self.source_sha1 = file_sha1(image_path)
+        self.crop_index = self.manifest.next_index(self.image_name)
+        self.last_crop_id = None
+        
+        # 자동 검출 후보 영역
+        self.proposals = list(self.all_proposals.get(proposal_key(image_path), []))
+        self.proposal_index = 0
         
         # 뷰 초기화
         self.reset_view()
@@ -280,7 +324,10 @@ class ImageCropper:
         print("🖱️  좌클릭 드래그: 영역 선택")
         print("🖱️  우클릭 드래그: 이미지 이동")
         print("🖱️  마우스 휠: 확대/축소")
-        print("⌨️  R: 뷰 리셋 | Space: 다음 | ESC: 종료")
+        print("⌨️  R: 뷰 리셋 | T: 마지막 크롭 회전 | Space: 다음 | ESC: 종료")
+        if self.proposals:
+            print(f"🔍 자동 검출 후보 {len(self.proposals)}개")
+            print("⌨️  Enter/Y: 저장 | N: 버리기 | Tab: 다음 후보 | B: 남은 후보 모두 저장")
         
         return True
     
@@ -297,6 +344,10 @@ class ImageCropper:
         
         print(f"\n✓ 총 {len(image_files)}개의 이미지를 찾았습니다.")
         
+        # 모든 자료 시트의 후보 영역을 미리 검출 (프로세스 풀)
+        if self.auto_detect:
+            self.all_proposals = propose_all(image_files)
+        
         cv2.namedWindow('Image Cropper', cv2.WINDOW_NORMAL)
         cv2.resizeWindow('Image Cropper', self.screen_width, self.screen_height)
         cv2.setMouseCallback('Image Cropper', self.mouse_callback)
@@ -312,6 +363,7 @@ class ImageCropper:
                 # 디스플레이 이미지 생성
                 display = self.get_display_image()
                 if display is not None:
+                    display = self.draw_proposals(display)
                     display = self.draw_info(display)
                     cv2.imshow('Image Cropper', display)
                 
@@ -320,6 +372,7 @@ class ImageCropper:
                 if key == 27:  # ESC
                     print("\n👋 프로그램 종료")
                     cv2.destroyAllWindows()
+                    self.build_crops()
                     return
                     
                 elif key == 32:  # Space
@@ -330,9 +383,25 @@ class ImageCropper:
                 elif key == ord('r') or key == ord('R'):  # R - 리셋
                     self.reset_view()
                     print("🔄 뷰 리셋")
+                
+                elif key in (13, ord('y'), ord('Y')):  # Enter/Y - 후보 저장
+                    self.accept_proposal()
+                
+                elif key == ord('n') or key == ord('N'):  # N - 후보 버리기
+                    self.reject_proposal()
+                
+                elif key == 9:  # Tab - 다음 후보
+                    self.next_proposal()
+                
+                elif key == ord('b') or key == ord('B'):  # B - 후보 일괄 저장
+                    self.export_all_proposals()
+                
+                elif key == ord('t') or key == ord('T'):  # T - 마지막 크롭 회전
+                    self.rotate_last_crop()
         
         print("\n✅ 모든 이미지 처리 완료!")
         cv2.destroyAllWindows()
+        self.build_crops()
 
 def main():
     print("=" * 60)
@@ -0,0 +1,257 @@
+import os
+import json
+import hashlib
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image
+
+from image_loader import load_image
+from tile_cache import TiledImage, TILE_CACHE_FOLDER
+
+MANIFEST_FILE = 'crops.json'
+BUILD_STATE_FILE = 'crops_built.json'
+OUTPUT_FOLDER = 'output'
+
+# 매니페스트 구조:
+# {"settings": {"padding": 0, "max_size": null},
+#  "crops": {"<원본 이름>/<번호>": {"source", "source_sha1", "rect": [x1, y1, x2, y2], "rotation",
+#                                  "name" (선택, 유물명. 결과 파일 이름)}}}
+# 픽셀은 저장하지 않고 빌드(또는 필요할 때 바로) 원본에서 잘라냄
+DEFAULT_SETTINGS = {'padding': 0, 'max_size': None}
+
+# 90도 단위 회전 → PIL transpose
+ROTATIONS = {
+    90: Image.Transpose.ROTATE_270,    # 시계 방향 90도
+    180: Image.Transpose.ROTATE_180,
+    270: Image.Transpose.ROTATE_90,
+}
+
+
+def file_sha1(path, chunk_size=1 << 20):
+    """원본 파일 해시 (원본이 바뀌었는지 확인)"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint(crop, settings, source_sha1):
+    """크롭 결과를 결정하는 값 (바뀌면 다시 생성)"""
+    data = json.dumps([source_sha1, crop['rect'], crop.get('rotation', 0),
+                       settings.get('padding', 0), settings.get('max_size')])
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+
+def state_entry(value):
+    """빌드 기록 값 → (fingerprint, 결과 파일 경로 또는 None). 예전 기록은 fingerprint만 있음"""
+    if isinstance(value, str):
+        return value, None
+    return value[0], value[1]
+
+
+def crop_box(size, crop, settings):
+    """여백을 더하고 이미지 경계로 자른 사각형"""
+    padding = settings.get('padding', 0)
+    x1, y1, x2, y2 = crop['rect']
+    return (max(0, x1 - padding), max(0, y1 - padding),
+            min(size[0], x2 + padding), min(size[1], y2 + padding))
+
+
+def render_crop(image, crop, settings):
+    """원본 이미지(PIL 또는 TiledImage)에서 크롭 하나 생성 (여백 → 자르기 → 회전 → 크기 제한)"""
+    if isinstance(image, TiledImage):
+        # 타일 캐시가 있으면 사각형에 걸치는 타일만 읽음
+        box = crop_box((image.width, image.height), crop, settings)
+        result = Image.fromarray(image.region(*box)[:, :, ::-1])
+    else:
+        result = image.crop(crop_box(image.size, crop, settings))
+
+    rotation = crop.get('rotation', 0) % 360
+    if rotation:
+        result = result.transpose(ROTATIONS[rotation])
+
+    max_size = settings.get('max_size')
+    if max_size:
+        result.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
+    return result
+
+
+def open_source(source, cache_folder=TILE_CACHE_FOLDER):
+    """원본 시트 열기 (타일 캐시가 있으면 사용, 없으면 한 번만 디코딩)"""
+    image = TiledImage.cached(source, cache_folder)
+    if image is None:
+        image, _ = load_image(source)
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+    return image
+
+
+def build_source(task):
+    """원본 한 장의 크롭들 생성 (타일 캐시가 있으면 사용, 없으면 한 번만 디코딩, 프로세스 풀 워커)"""
+    source, crops, settings, cache_folder = task
+    done, errors = [], []
+    try:
+        image = open_source(source, cache_folder)
+    except Exception as e:
+        return done, [(crop_id, str(e)) for crop_id, _, _ in crops]
+
+    for crop_id, crop, output_path in crops:
+        try:
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+            render_crop(image, crop, settings).save(output_path, compress_level=3)
+            done.append(crop_id)
+        except Exception as e:
+            errors.append((crop_id, str(e)))
+    return done, errors
+
+
+class CropManifest:
+    """크롭 기록 (원본 해시, 사각형, 회전). 픽셀은 빌드할 때만 생성"""
+
+    def __init__(self, path=MANIFEST_FILE):
+        self.path = path
+        self.settings = dict(DEFAULT_SETTINGS)
+        self.crops = {}
+        if Path(path).exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.settings.update(data.get('settings', {}))
+            self.crops = data.get('crops', {})
+
+    def save(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({'settings': self.settings, 'crops': self.crops}, f,
+                      ensure_ascii=False, indent=1)
+
+    def next_index(self, name):
+        """원본 이름의 다음 크롭 번호 (이전 실행의 크롭을 덮어쓰지 않도록)"""
+        numbers = [int(crop_id.rsplit('/', 1)[1]) for crop_id in self.crops
+                   if crop_id.rsplit('/', 1)[0] == name]
+        return max(numbers) + 1 if numbers else 0
+
+    def add(self, source, source_sha1, rect, index, rotation=0):
+        """크롭 기록 추가. 크롭 ID 반환"""
+        crop_id = f"{Path(source).stem}/{index}"
+        self.crops[crop_id] = {
+            'source': Path(source).as_posix(),
+            'source_sha1': source_sha1,
+            'rect': [int(v) for v in rect],
+            'rotation': rotation,
+        }
+        return crop_id
+
+    def rotate(self, crop_id, degrees=90):
+        """크롭 회전 (90도 단위)"""
+        crop = self.crops[crop_id]
+        crop['rotation'] = (crop.get('rotation', 0) + degrees) % 360
+
+    def output_path(self, crop_id, output_folder=OUTPUT_FOLDER):
+        """크롭 결과 파일 경로 (output/<원본 이름>/<유물명 또는 번호>.png)"""
+        name = self.crops.get(crop_id, {}).get('name')
+        if name:
+            return Path(output_folder) / crop_id.rsplit('/', 1)[0] / f"{name}.png"
+        return Path(output_folder) / f"{crop_id}.png"
+
+    def set_name(self, crop_id, name, output_folder=OUTPUT_FOLDER):
+        """크롭 이름 지정. 이미 만든 결과 파일은 새 이름으로 옮김 (다시 생성하지 않음)"""
+        old_path = self.output_path(crop_id, output_folder)
+        self.crops[crop_id]['name'] = name
+        new_path = self.output_path(crop_id, output_folder)
+        if old_path != new_path and old_path.exists():
+            new_path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(old_path, new_path)
+
+    def build(self, output_folder=OUTPUT_FOLDER, workers=None, force=False, tile_cache=TILE_CACHE_FOLDER):
+        """바뀐 크롭만 다시 생성 (원본 파일/사각형/회전/설정 기준, tile_cache: 원본 타일 캐시 폴더).
+        (생성, 유지, 삭제, 오류) 개수 반환"""
+        state_file = Path(output_folder) / BUILD_STATE_FILE
+        state = {}
+        if state_file.exists() and not force:
+            with open(state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+
+        # 원본 해시는 원본마다 한 번만 계산
+        source_hashes = {}
+        tasks = {}
+        fingerprints = {}
+        for crop_id, crop in sorted(self.crops.items()):
+            source = crop['source']
+            if source not in source_hashes:
+                source_hashes[source] = file_sha1(source) if Path(source).exists() else None
+            if source_hashes[source] is None:
+                print(f"⚠ 원본 없음: {source} ({crop_id})")
+                continue
+            if source_hashes[source] != crop['source_sha1']:
+                print(f"⚠ 크롭 후 원본이 바뀜: {source} ({crop_id})")
+
+            fingerprints[crop_id] = fingerprint(crop, self.settings, source_hashes[source])
+            output_path = self.output_path(crop_id, output_folder)
+            if (crop_id in state and state_entry(state[crop_id])[0] == fingerprints[crop_id]
+                    and output_path.exists()):
+                # 이름만 바뀐 경우에도 기록의 파일 경로는 현재 이름으로
+                state[crop_id] = [fingerprints[crop_id], output_path.as_posix()]
+                continue
+            tasks.setdefault(source, []).append((crop_id, crop, str(output_path)))
+
+        built, errors = 0, 0
+        if tasks:
+            jobs = [(source, crops, self.settings, tile_cache) for source, crops in tasks.items()]
+            with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+                for done, failed in executor.map(build_source, jobs):
+                    for crop_id in done:
+                        state[crop_id] = [fingerprints[crop_id],
+                                          self.output_path(crop_id, output_folder).as_posix()]
+                    for crop_id, error in failed:
+                        print(f"❌ {crop_id}: {error}")
+                    built += len(done)
+                    errors += len(failed)
+
+        # 매니페스트에서 지운 크롭의 결과 파일 정리 (이 빌드가 만든 파일만)
+        removed = 0
+        for crop_id in [crop_id for crop_id in state if crop_id not in self.crops]:
+            path = state_entry(state[crop_id])[1] or self.output_path(crop_id, output_folder)
+            Path(path).unlink(missing_ok=True)
+            del state[crop_id]
+            removed += 1
+
+        Path(output_folder).mkdir(parents=True, exist_ok=True)
+        with open(state_file, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, indent=1)
+
+        kept = len(fingerprints) - built - errors
+        return built, kept, removed, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="크롭 매니페스트에서 크롭 이미지 생성")
+    parser.add_argument('--manifest', default=MANIFEST_FILE, help="크롭 매니페스트 파일")
+    parser.add_argument('--output', default=OUTPUT_FOLDER, help="크롭 이미지 폴더")
+    parser.add_argument('--padding', type=int, default=None, help="크롭 여백 (px, 매니페스트에 저장)")
+    parser.add_argument('--max-size', type=int, default=None,
+                        help="크롭 긴 변 최대 크기 (px, 0이면 제한 없음, 매니페스트에 저장)")
+    parser.add_argument('--cache', default=TILE_CACHE_FOLDER, help="타일 캐시 폴더")
+    parser.add_argument('--force', action='store_true', help="모든 크롭 다시 생성")
+    parser.add_argument('--workers', type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("✂️  크롭 빌드")
+    print("=" * 60)
+
+    manifest = CropManifest(args.manifest)
+    if args.padding is not None or args.max_size is not None:
+        if args.padding is not None:
+            manifest.settings['padding'] = args.padding
+        if args.max_size is not None:
+            manifest.settings['max_size'] = args.max_size or None
+        manifest.save()
+
+    built, kept, removed, errors = manifest.build(args.output, args.workers, args.force, args.cache)
+    print(f"✓ 크롭 {len(manifest.crops)}개: 생성 {built}개, 변경 없음 {kept}개, 삭제 {removed}개"
+          + (f", 오류 {errors}개" if errors else ""))
+
+
+if __name__ == "__main__":
+    main()
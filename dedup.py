@@ -0,0 +1,268 @@
+import os
+import json
+import shutil
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from PIL import Image
+
+from optimize_images import find_images
+from sprite_atlas import REVERSE_PREFIX
+from stats_store import STATS_FILE, StatsStore
+
+HASH_CACHE_FILE = 'image_hashes.json'
+DUPLICATES_FOLDER = 'duplicates'
+
+HASH_SIZE = 8
+PHASH_SIZE = 32
+
+
+def dct_matrix(n):
+    """n x n DCT-II 변환 행렬"""
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    matrix = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * np.sqrt(2 / n)
+    matrix[0] /= np.sqrt(2)
+    return matrix
+
+
+_DCT = dct_matrix(PHASH_SIZE)
+
+
+def bits_to_int(bits):
+    """bool 배열을 정수 해시로"""
+    value = 0
+    for bit in bits.ravel():
+        value = (value << 1) | int(bit)
+    return value
+
+
+def grayscale(img, size):
+    """흑백 변환 후 지정 크기로 축소한 float 배열"""
+    return np.asarray(img.convert('L').resize(size, Image.Resampling.LANCZOS), dtype=np.float64)
+
+
+def average_hash(img):
+    """aHash: 8x8 평균 밝기 기준"""
+    pixels = grayscale(img, (HASH_SIZE, HASH_SIZE))
+    return bits_to_int(pixels > pixels.mean())
+
+
+def difference_hash(img):
+    """dHash: 이웃 픽셀 밝기 차이 부호"""
+    pixels = grayscale(img, (HASH_SIZE + 1, HASH_SIZE))
+    return bits_to_int(pixels[:, 1:] > pixels[:, :-1])
+
+
+def perceptual_hash(img):
+    """pHash: 32x32 DCT 저주파 8x8 계수의 중앙값 기준"""
+    pixels = grayscale(img, (PHASH_SIZE, PHASH_SIZE))
+    coefficients = (_DCT @ pixels @ _DCT.T)[:HASH_SIZE, :HASH_SIZE]
+    # 직류 성분(평균 밝기)은 제외하고 중앙값 계산
+    median = np.median(coefficients.ravel()[1:])
+    return bits_to_int(coefficients > median)
+
+
+def hamming(a, b):
+    """두 해시의 해밍 거리"""
+    return bin(a ^ b).count('1')
+
+
+def hash_file(path):
+    """이미지 한 장의 세 가지 해시 계산 (프로세스 풀 워커)"""
+    try:
+        with Image.open(path) as img:
+            if img.mode in ('RGBA', 'LA', 'P'):
+                # 투명 영역은 흰 배경으로 (퀴즈 화면과 동일)
+                rgba = img.convert('RGBA')
+                img = Image.new('RGB', rgba.size, 'white')
+                img.paste(rgba, mask=rgba.split()[3])
+            return path, {
+                'a': f"{average_hash(img):016x}",
+                'd': f"{difference_hash(img):016x}",
+                'p': f"{perceptual_hash(img):016x}",
+            }, None
+    except Exception as e:
+        return path, None, str(e)
+
+
+class BKTree:
+    """해밍 거리 BK-트리 (임계값 이내 이웃 검색)"""
+
+    def __init__(self):
+        self.root = None
+
+    def add(self, value, item):
+        """(해시, 항목) 추가"""
+        node = [value, item, {}]
+        if self.root is None:
+            self.root = node
+            return
+
+        current = self.root
+        while True:
+            distance = hamming(value, current[0])
+            child = current[2].get(distance)
+            if child is None:
+                current[2][distance] = node
+                return
+            current = child
+
+    def search(self, value, threshold):
+        """해밍 거리 threshold 이하 항목 [(거리, 항목)]"""
+        if self.root is None:
+            return []
+
+        results = []
+        stack = [self.root]
+        while stack:
+            node_value, item, children = stack.pop()
+            distance = hamming(value, node_value)
+            if distance <= threshold:
+                results.append((distance, item))
+            # 삼각 부등식으로 탐색 범위 제한
+            for child_distance, child in children.items():
+                if distance - threshold <= child_distance <= distance + threshold:
+                    stack.append(child)
+        return results
+
+
+def update_hashes(images, cache_file=HASH_CACHE_FILE, workers=None):
+    """해시 캐시 갱신 (새로 추가되거나 바뀐 이미지만 계산)"""
+    cache = {}
+    if Path(cache_file).exists():
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+
+    current = {}
+    pending = []
+    for path in images:
+        key = Path(path).as_posix()
+        stat = Path(path).stat()
+        signature = [stat.st_mtime, stat.st_size]
+        entry = cache.get(key)
+        if entry and entry['signature'] == signature:
+            current[key] = entry
+        else:
+            current[key] = {'signature': signature}
+            pending.append(key)
+
+    if pending:
+        print(f"🔍 해시 계산 중... ({len(pending)}개 이미지, 캐시 {len(images) - len(pending)}개)")
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+            for key, hashes, error in executor.map(hash_file, pending, chunksize=8):
+                if error:
+                    print(f"❌ {key}: {error}")
+                    del current[key]
+                    continue
+                current[key].update(hashes)
+
+    # 삭제된 이미지는 캐시에서도 제거
+    with open(cache_file, 'w', encoding='utf-8') as f:
+        json.dump(current, f, ensure_ascii=False, indent=1)
+
+    return current
+
+
+def find_duplicate_groups(hashes, threshold):
+    """pHash 거리 threshold 이하인 이미지끼리 묶은 그룹 목록"""
+    keys = sorted(hashes)
+    tree = BKTree()
+    parent = {key: key for key in keys}
+
+    def find(key):
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    for key in keys:
+        value = int(hashes[key]['p'], 16)
+        for _, other in tree.search(value, threshold):
+            # pHash가 가까워도 dHash가 크게 다르면 다른 이미지로 간주
+            if hamming(int(hashes[key]['d'], 16), int(hashes[other]['d'], 16)) <= threshold * 2:
+                parent[find(key)] = find(other)
+        tree.add(value, key)
+
+    groups = {}
+    for key in keys:
+        groups.setdefault(find(key), []).append(key)
+    return [sorted(group) for group in groups.values() if len(group) > 1]
+
+
+def pick_canonical(group, stats):
+    """그룹에서 남길 이미지 (풀이 기록이 가장 많은 것)"""
+    return max(group, key=lambda key: (stats.get(str(Path(key)), {}).get('total', 0), -len(key)))
+
+
+def merge_group(group, canonical, source_folder, duplicates_folder):
+    """중복 이미지 파일은 duplicates 폴더로 이동. 통계 키 이동 목록 {예전 키: 남길 키} 반환"""
+    mapping = {}
+    for key in group:
+        if key == canonical:
+            continue
+
+        mapping[str(Path(key))] = str(Path(canonical))
+        # 역방향(시대 → 유물) 통계도 같이 이동
+        mapping[REVERSE_PREFIX + str(Path(key))] = REVERSE_PREFIX + str(Path(canonical))
+
+        destination = Path(duplicates_folder) / Path(key).relative_to(source_folder)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(key, destination)
+    return mapping
+
+
+def main():
+    parser = argparse.ArgumentParser(description="legacy_images 중복 이미지 검출")
+    parser.add_argument('--source', default='legacy_images', help="이미지 폴더")
+    parser.add_argument('--cache', default=HASH_CACHE_FILE, help="해시 캐시 파일")
+    parser.add_argument('--stats', default=STATS_FILE, help="통계 파일")
+    parser.add_argument('--threshold', type=int, default=6, help="pHash 해밍 거리 임계값")
+    parser.add_argument('--merge', action='store_true',
+                        help="중복 이미지 통계 합치기 및 파일을 duplicates 폴더로 이동")
+    parser.add_argument('--cross-folder', action='store_true',
+                        help="서로 다른 시대 폴더에 걸친 중복도 합치기")
+    parser.add_argument('--workers', type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🧩 중복 이미지 검출")
+    print("=" * 60)
+
+    images = [p.as_posix() for p in find_images(args.source)]
+    if not images:
+        print(f"⚠ '{args.source}' 폴더에 이미지 파일이 없습니다.")
+        return
+
+    hashes = update_hashes(images, args.cache, args.workers)
+    groups = find_duplicate_groups(hashes, args.threshold)
+    store = StatsStore(args.stats)
+    stats = store.totals
+
+    print(f"✓ 이미지 {len(hashes)}개 중 중복 그룹 {len(groups)}개")
+
+    merged = 0
+    mapping = {}
+    for group in groups:
+        canonical = pick_canonical(group, stats)
+        cross_folder = len({Path(key).parent for key in group}) > 1
+
+        print(f"\n{'⚠ 시대 폴더가 다름' if cross_folder else '•'} ({len(group)}개)")
+        for key in group:
+            stat = stats.get(str(Path(key)), {'total': 0, 'correct': 0})
+            mark = '★' if key == canonical else ' '
+            print(f"  {mark} {key} ({stat['correct']}/{stat['total']}회)")
+
+        if args.merge and (args.cross_folder or not cross_folder):
+            mapping.update(merge_group(group, canonical, args.source, DUPLICATES_FOLDER))
+            merged += 1
+
+    if args.merge:
+        # 실행 중인 퀴즈가 있어도 잠금 후 병합해서 키 이동
+        store.move_keys(mapping)
+        print(f"\n✓ {merged}개 그룹 합침 (중복 파일은 '{DUPLICATES_FOLDER}' 폴더로 이동)")
+
+
+if __name__ == "__main__":
+    main()
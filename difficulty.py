@@ -0,0 +1,241 @@
+import math
+import time
+import sqlite3
+import argparse
+from pathlib import Path
+import numpy as np
+
+from history import HISTORY_FILE
+
+# 1PL(Rasch) 모델: P(정답) = σ(θ_세션 - b_문제)
+# θ: 세션별 실력 (학습하면서 변함), b: 문제 난이도
+# 몇 번 안 본 문제의 난이도는 사전분포(전체 평균 난이도) 쪽으로 당겨짐
+
+# 사전분포 정밀도 (클수록 평균 쪽으로 강하게 당김)
+PRIOR_ITEM = 1.0
+PRIOR_ABILITY = 0.5
+
+# 현재 실력 추정에 쓰는 최근 세션 수
+RECENT_SESSIONS = 5
+
+# 기록 DB보다 먼저 쌓인 통계(quiz_stats.json - 기록 DB)를 묶는 세션 이름
+LEGACY_SESSION = '(stats)'
+
+# Newton 단계 최대 크기 (초기 반복 발산 방지)
+MAX_STEP = 1.0
+
+
+def sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def fit_arrays(items, sessions, totals, corrects, n_items, n_sessions, iterations=30):
+    """묶음 데이터 (문제 번호, 세션 번호, 시도 수, 정답 수) 배열로 난이도/실력 추정
+
+    난이도와 실력을 번갈아 대각 Newton 단계로 갱신 (반복마다 O(행 수) 벡터 연산).
+    (난이도 배열, 실력 배열, 문제별 정보량, 평균 난이도) 반환
+    """
+    totals = totals.astype(np.float64)
+    corrects = corrects.astype(np.float64)
+    b = np.zeros(n_items)
+    theta = np.zeros(n_sessions)
+    seen = np.bincount(items, totals, n_items) > 0
+    mean_b = 0.0
+
+    for _ in range(iterations):
+        p = sigmoid(theta[sessions] - b[items])
+        resid = corrects - totals * p
+        info = totals * p * (1 - p)
+        grad = -np.bincount(items, resid, n_items) - PRIOR_ITEM * (b - mean_b)
+        b += np.clip(grad / (np.bincount(items, info, n_items) + PRIOR_ITEM), -MAX_STEP, MAX_STEP)
+        mean_b = b[seen].mean() if seen.any() else 0.0
+
+        p = sigmoid(theta[sessions] - b[items])
+        resid = corrects - totals * p
+        info = totals * p * (1 - p)
+        grad = np.bincount(sessions, resid, n_sessions) - PRIOR_ABILITY * theta
+        theta += np.clip(grad / (np.bincount(sessions, info, n_sessions) + PRIOR_ABILITY),
+                         -MAX_STEP, MAX_STEP)
+
+    p = sigmoid(theta[sessions] - b[items])
+    item_info = np.bincount(items, totals * p * (1 - p), n_items)
+    b[~seen] = mean_b
+    return b, theta, item_info, mean_b
+
+
+def load_rows(db_file=HISTORY_FILE, stats=None):
+    """기록 DB를 (세션, 문제)별로 묶은 행 [(세션, 통계 키, 시도, 정답)] (최근 세션 순서 목록도 반환)
+
+    stats({키: {'total', 'correct'}})에서 기록 DB에 없는 만큼은 LEGACY_SESSION 행으로 추가
+    """
+    rows = []
+    session_order = []
+    if Path(db_file).exists():
+        # 화면 스레드의 연결과 별도 연결 (백그라운드 스레드에서 호출)
+        conn = sqlite3.connect(db_file)
+        try:
+            rows = conn.execute(
+                "SELECT session_id, stats_key, COUNT(*), SUM(is_correct) FROM answers"
+                " GROUP BY session_id, stats_key").fetchall()
+            session_order = [row[0] for row in conn.execute(
+                "SELECT session_id FROM answers GROUP BY session_id ORDER BY MAX(ts) DESC"
+                " LIMIT ?", (RECENT_SESSIONS,))]
+        finally:
+            conn.close()
+
+    if stats:
+        logged = {}
+        for _, key, total, correct in rows:
+            count = logged.setdefault(key, [0, 0])
+            count[0] += total
+            count[1] += correct
+        for key, stat in stats.items():
+            total, correct = logged.get(key, (0, 0))
+            extra_total = stat['total'] - total
+            if extra_total > 0:
+                extra_correct = min(max(stat['correct'] - correct, 0), extra_total)
+                rows.append((LEGACY_SESSION, key, extra_total, extra_correct))
+    return rows, session_order
+
+
+class DifficultyModel:
+    """문제 난이도/학습자 실력 모델. 시작할 때 일괄 추정하고 답할 때마다 O(1) 갱신"""
+
+    def __init__(self, difficulty=None, info=None, ability=0.0, mean_difficulty=0.0):
+        self.difficulty = difficulty or {}   # 통계 키 → b
+        self.info = info or {}               # 통계 키 → 누적 정보량 (많이 볼수록 갱신 폭 작아짐)
+        self.ability = ability               # 현재 실력 θ
+        self.ability_info = 0.0
+        self.mean_difficulty = mean_difficulty
+
+    @classmethod
+    def fit_rows(cls, rows, recent_sessions=(), iterations=30):
+        """묶음 행 [(세션, 통계 키, 시도, 정답)]으로 일괄 추정"""
+        if not rows:
+            return cls()
+
+        session_index = {}
+        item_index = {}
+        sessions = np.fromiter((session_index.setdefault(row[0], len(session_index)) for row in rows),
+                               np.int64, len(rows))
+        items = np.fromiter((item_index.setdefault(row[1], len(item_index)) for row in rows),
+                            np.int64, len(rows))
+        totals = np.fromiter((row[2] for row in rows), np.float64, len(rows))
+        corrects = np.fromiter((row[3] for row in rows), np.float64, len(rows))
+
+        b, theta, item_info, mean_b = fit_arrays(items, sessions, totals, corrects,
+                                                 len(item_index), len(session_index), iterations)
+
+        # 현재 실력: 최근 세션들의 평균
+        recent = [session_index[s] for s in recent_sessions if s in session_index]
+        ability = float(theta[recent].mean()) if recent else 0.0
+
+        keys = list(item_index)
+        return cls(dict(zip(keys, b.tolist())), dict(zip(keys, item_info.tolist())),
+                   ability, float(mean_b))
+
+    @classmethod
+    def fit_history(cls, db_file=HISTORY_FILE, stats=None, iterations=30):
+        """학습 기록 DB (+ 기록 이전 통계)로 일괄 추정"""
+        rows, recent_sessions = load_rows(db_file, stats)
+        return cls.fit_rows(rows, recent_sessions, iterations)
+
+    def difficulty_of(self, key):
+        """난이도 (처음 보는 문제는 평균 난이도)"""
+        return self.difficulty.get(key, self.mean_difficulty)
+
+    def predict(self, key):
+        """현재 실력으로 맞힐 확률"""
+        return 1.0 / (1.0 + math.exp(self.difficulty_of(key) - self.ability))
+
+    def update(self, key, is_correct):
+        """답변 한 건으로 난이도/실력 갱신 (Elo 방식 한 단계, 정보량이 쌓일수록 보폭 감소)"""
+        p = self.predict(key)
+        err = (1.0 if is_correct else 0.0) - p
+        weight = p * (1 - p)
+
+        info = self.info.get(key, 0.0) + weight
+        self.info[key] = info
+        self.difficulty[key] = self.difficulty_of(key) - err / (info + PRIOR_ITEM)
+
+        self.ability_info += weight
+        self.ability += err / (self.ability_info + PRIOR_ABILITY)
+
+    def sort_key(self, question):
+        """출제 순서 키 (맞힐 확률 낮은 문제 먼저)"""
+        return self.predict(question['stats_key'])
+
+
+def synthetic_answers(count, n_items, n_sessions, seed=0):
+    """합성 답변 (문제, 세션, 정답 여부)과 실제 난이도/실력"""
+    rng = np.random.default_rng(seed)
+    true_b = rng.normal(0, 1, n_items)
+    true_theta = rng.normal(0, 0.7, n_sessions)
+    # 문제마다 노출 빈도가 다름 (대부분은 몇 번만 봄)
+    weights = rng.pareto(2.0, n_items) + 0.2
+    items = rng.choice(n_items, count, p=weights / weights.sum())
+    sessions = rng.integers(0, n_sessions, count)
+    correct = rng.random(count) < sigmoid(true_theta[sessions] - true_b[items])
+    return items, sessions, correct, true_b
+
+
+def benchmark(count, n_items=200000, n_sessions=50000):
+    """합성 답변 N건 일괄 추정 시간과 정확도 (누적 정답률 대비)"""
+    items, sessions, correct, true_b = synthetic_answers(count, n_items, n_sessions)
+
+    start = time.perf_counter()
+    ones = np.ones(count)
+    b, _, _, _ = fit_arrays(items, sessions, ones, correct, n_items, n_sessions)
+    fit_s = time.perf_counter() - start
+    print(f"✓ 답변 {count:,}건 (문제 {n_items:,}개, 세션 {n_sessions:,}개) 일괄 추정: {fit_s:.2f}초")
+
+    # 몇 번만 본 문제에서 난이도 추정 vs 누적 정답률
+    totals = np.bincount(items, minlength=n_items)
+    rights = np.bincount(items, correct, minlength=n_items)
+    for low, high in [(1, 3), (4, 10), (11, None)]:
+        mask = (totals >= low) & (totals <= (high or totals.max()))
+        if mask.sum() < 3:
+            continue
+        model_r = np.corrcoef(b[mask], true_b[mask])[0, 1]
+        accuracy_r = np.corrcoef(-(rights[mask] / totals[mask]), true_b[mask])[0, 1]
+        label = f"{low}~{high}회" if high else f"{low}회 이상"
+        print(f"  {label} 본 문제 {mask.sum():,}개: 실제 난이도와 상관 "
+              f"모델 {model_r:.3f} / 누적 정답률 {accuracy_r:.3f}")
+
+    model = DifficultyModel(dict(enumerate(b.tolist())))
+    start = time.perf_counter()
+    for i in range(100000):
+        model.update(i % n_items, i % 3 != 0)
+    print(f"  온라인 갱신: {(time.perf_counter() - start) * 10:.2f}µs/건")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="문제 난이도 모델 (1PL IRT)")
+    parser.add_argument('--db', default=HISTORY_FILE, help="학습 기록 DB 파일")
+    parser.add_argument('--stats', default=None, help="기록 이전 통계 파일 (quiz_stats.json)")
+    parser.add_argument('--top', type=int, default=20, help="어려운 문제 N개 출력")
+    parser.add_argument('--bench', type=int, default=None, metavar='N',
+                        help="합성 답변 N건으로 일괄 추정 속도 측정")
+    args = parser.parse_args()
+
+    if args.bench:
+        benchmark(args.bench)
+        return
+
+    stats = None
+    if args.stats:
+        from stats_store import StatsStore
+        stats = StatsStore(args.stats).totals
+
+    start = time.perf_counter()
+    model = DifficultyModel.fit_history(args.db, stats)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"✓ 문제 {len(model.difficulty)}개 추정 ({elapsed:.0f}ms), 현재 실력 {model.ability:+.2f}")
+
+    hardest = sorted(model.difficulty, key=model.difficulty.get, reverse=True)[:args.top]
+    for key in hardest:
+        print(f"  {model.difficulty[key]:+.2f}  맞힐 확률 {model.predict(key):.0%}  {key}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+import os
+import json
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+import cv2
+import numpy as np
+from PIL import Image
+
+from image_loader import load_image
+from optimize_images import find_images
+from dedup import perceptual_hash
+
+INDEX_FILE = 'era_index.npz'
+SUGGESTIONS_FILE = 'era_suggestions.json'
+
+# 특징 추출용 축소 크기 (원본 해상도와 무관하게 같은 비용)
+FEATURE_MAX_SIZE = (256, 256)
+
+# HSV 색 히스토그램 구간 (색상, 채도, 명도)
+HIST_BINS = (12, 4, 4)
+
+# HOG: 64x64 흑백을 16px 셀 4x4개로 나눠 셀마다 기울기 방향 9구간 → 144차원
+# (cv2.HOGDescriptor는 OpenCV 5에서 contrib로 빠져서 Sobel로 직접 계산)
+HOG_SIZE = 64
+HOG_CELL = 16
+HOG_BINS = 9
+
+# 색/모양 특징 가중치 (합쳐서 단위 벡터)
+COLOR_WEIGHT = 0.6
+SHAPE_WEIGHT = 0.8
+
+# 근접 중복 기준: pHash 해밍 거리 (같은 이미지) 또는 특징 유사도 (같은 유물을 조금 다르게 크롭)
+DUPLICATE_THRESHOLD = 6
+DUPLICATE_SIMILARITY = 0.9
+
+
+def load_rgb(path):
+    """축소 디코딩한 RGB 배열 (투명 영역은 흰 배경, 퀴즈 화면과 동일)"""
+    img, _ = load_image(path, FEATURE_MAX_SIZE)
+    if img.mode in ('RGBA', 'LA', 'P'):
+        rgba = img.convert('RGBA')
+        img = Image.new('RGB', rgba.size, 'white')
+        img.paste(rgba, mask=rgba.split()[3])
+    return img.convert('RGB')
+
+
+def hog_features(gray):
+    """셀별 기울기 방향 히스토그램 (크기 가중, 셀마다 L2 정규화)"""
+    gray = np.float32(gray)
+    gx = cv2.Sobel(gray, cv2.CV_32F, 1, 0, ksize=1)
+    gy = cv2.Sobel(gray, cv2.CV_32F, 0, 1, ksize=1)
+    magnitude, angle = cv2.cartToPolar(gx, gy, angleInDegrees=True)
+
+    # 방향 부호 무시 (0~180도)
+    bins = (angle % 180 // (180 / HOG_BINS)).astype(np.int64) % HOG_BINS
+    cells = HOG_SIZE // HOG_CELL
+    cell = np.arange(HOG_SIZE) // HOG_CELL
+    cell_index = cell[:, None] * cells + cell[None, :]
+    hist = np.bincount((cell_index * HOG_BINS + bins).ravel(), magnitude.ravel(),
+                       cells * cells * HOG_BINS).reshape(cells * cells, HOG_BINS)
+    hist /= np.maximum(np.linalg.norm(hist, axis=1, keepdims=True), 1e-6)
+    return hist.ravel()
+
+
+def feature_vector(img):
+    """색 히스토그램 + HOG 특징 (단위 벡터, 내적 = 코사인 유사도)"""
+    rgb = np.asarray(img)
+    hsv = cv2.cvtColor(rgb, cv2.COLOR_RGB2HSV)
+    hist = cv2.calcHist([hsv], [0, 1, 2], None, list(HIST_BINS), [0, 180, 0, 256, 0, 256]).ravel()
+    # Hellinger 커널 (큰 구간이 유사도를 독차지하지 않도록)
+    color = np.sqrt(hist / max(hist.sum(), 1))
+
+    gray = cv2.resize(cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY), (HOG_SIZE, HOG_SIZE),
+                      interpolation=cv2.INTER_AREA)
+    shape = hog_features(gray)
+    shape /= max(np.linalg.norm(shape), 1e-6)
+
+    vector = np.concatenate([COLOR_WEIGHT * color, SHAPE_WEIGHT * shape]).astype(np.float32)
+    return vector / max(np.linalg.norm(vector), 1e-6)
+
+
+def feature_file(path):
+    """이미지 한 장의 (경로, 특징, pHash, 오류) (프로세스 풀 워커)"""
+    try:
+        img = load_rgb(path)
+        return path, feature_vector(img), perceptual_hash(img), None
+    except Exception as e:
+        return path, None, 0, str(e)
+
+
+def extract_features(paths, workers=None):
+    """여러 이미지 특징 일괄 추출. {경로: (특징, pHash)}"""
+    results = {}
+    if not paths:
+        return results
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        for path, vector, phash, error in executor.map(feature_file, paths, chunksize=8):
+            if error:
+                print(f"❌ {path}: {error}")
+                continue
+            results[path] = (vector, phash)
+    return results
+
+
+def signature_of(path):
+    """변경 감지용 (수정 시각, 크기)"""
+    stat = Path(path).stat()
+    return [stat.st_mtime, stat.st_size]
+
+
+class EraIndex:
+    """시대가 정해진 이미지의 특징 벡터 인덱스 (NumPy 배열, .npz 파일)"""
+
+    def __init__(self, paths=(), labels=(), signatures=(), features=None, hashes=None):
+        self.paths = list(paths)
+        self.labels = list(labels)
+        self.signatures = list(signatures)
+        dim = len(feature_vector(Image.new('RGB', (8, 8))))
+        self.features = features if features is not None else np.zeros((0, dim), np.float32)
+        self.hashes = hashes if hashes is not None else np.zeros(0, np.uint64)
+
+    @classmethod
+    def load(cls, index_file=INDEX_FILE):
+        """인덱스 파일 로드 (없거나 읽을 수 없으면 빈 인덱스)"""
+        if Path(index_file).exists():
+            try:
+                with np.load(index_file) as data:
+                    meta = json.loads(str(data['meta']))
+                    return cls(meta['paths'], meta['labels'], meta['signatures'],
+                               data['features'], data['hashes'])
+            except Exception as e:
+                print(f"특징 인덱스 로드 실패: {e}")
+        return cls()
+
+    def save(self, index_file=INDEX_FILE):
+        meta = json.dumps({'paths': self.paths, 'labels': self.labels,
+                           'signatures': self.signatures}, ensure_ascii=False)
+        with open(index_file, 'wb') as f:
+            np.savez(f, meta=np.array(meta), features=self.features, hashes=self.hashes)
+
+    def update(self, source_folder, workers=None):
+        """시대 폴더 이미지로 인덱스 갱신 (새로 추가되거나 바뀐 이미지만 계산). 계산한 개수 반환"""
+        source = Path(source_folder)
+        current = [p.as_posix() for p in find_images(source_folder)]
+        cached = {path: i for i, path in enumerate(self.paths)}
+
+        keep, pending = [], []
+        for path in current:
+            i = cached.get(path)
+            if i is not None and self.signatures[i] == signature_of(path):
+                keep.append(i)
+            else:
+                pending.append(path)
+
+        computed = extract_features(pending, workers)
+        new_paths = [path for path in pending if path in computed]
+
+        # 삭제된 이미지는 빠지고, 바뀐 이미지는 새로 계산한 값으로
+        self.paths = [self.paths[i] for i in keep] + new_paths
+        self.labels = [Path(path).relative_to(source.as_posix()).parts[0] for path in self.paths]
+        self.signatures = [self.signatures[i] for i in keep] + [signature_of(p) for p in new_paths]
+        self.features = np.vstack([self.features[keep]] + [computed[p][0][None] for p in new_paths])
+        self.hashes = np.concatenate([self.hashes[keep],
+                                      np.array([computed[p][1] for p in new_paths], np.uint64)])
+        return len(new_paths)
+
+    def suggest(self, features, hashes, k=5, exclude_self=False):
+        """여러 이미지 특징을 한 번에 kNN 분류. 이미지마다 {'era', 'confidence', 'neighbors', 'duplicates'}"""
+        if not self.paths:
+            return [None] * len(features)
+
+        # (질의 수 x 인덱스 수) 코사인 유사도 행렬
+        similarity = features @ self.features.T
+        if exclude_self:
+            np.fill_diagonal(similarity, -np.inf)
+        k = min(k, len(self.paths) - (1 if exclude_self else 0))
+        top = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+
+        # pHash 해밍 거리 (XOR 후 비트 수)
+        xor = hashes[:, None] ^ self.hashes[None, :]
+        distance = np.unpackbits(xor.view(np.uint8).reshape(len(hashes), -1, 8), axis=2).sum(axis=2)
+
+        labels = self.labels
+        results = []
+        for row, neighbors in enumerate(top):
+            neighbors = neighbors[np.argsort(-similarity[row, neighbors])]
+            votes = {}
+            for i in neighbors:
+                votes[labels[i]] = votes.get(labels[i], 0.0) + max(float(similarity[row, i]), 0.0)
+            era = max(votes, key=votes.get)
+            total = sum(votes.values())
+
+            duplicate_mask = ((distance[row] <= DUPLICATE_THRESHOLD)
+                              | (similarity[row] >= DUPLICATE_SIMILARITY))
+            if exclude_self:
+                duplicate_mask[row] = False
+            results.append({
+                'era': era,
+                'confidence': votes[era] / total if total else 0.0,
+                'neighbors': [(self.paths[i], float(similarity[row, i])) for i in neighbors],
+                'duplicates': [self.paths[i] for i in np.flatnonzero(duplicate_mask)],
+            })
+        return results
+
+
+def classify_folder(index, output_folder, k=5, workers=None):
+    """output 폴더의 크롭 전체를 한 번에 분류. {경로: 제안}"""
+    crops = [p.as_posix() for p in find_images(output_folder)]
+    computed = extract_features(crops, workers)
+    paths = [path for path in crops if path in computed]
+    if not paths:
+        return {}
+
+    features = np.vstack([computed[path][0] for path in paths])
+    hashes = np.array([computed[path][1] for path in paths], np.uint64)
+    return dict(zip(paths, index.suggest(features, hashes, k)))
+
+
+def evaluate(index, k=5):
+    """인덱스 자체로 leave-one-out 정확도"""
+    results = index.suggest(index.features, index.hashes, k, exclude_self=True)
+    correct = sum(result['era'] == label for result, label in zip(results, index.labels))
+    return correct / len(results) if results else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="새 크롭 이미지의 시대 추천 (특징 벡터 kNN)")
+    parser.add_argument('--source', default='legacy_images', help="시대별 이미지 폴더")
+    parser.add_argument('--output', default='output', help="분류할 크롭 폴더")
+    parser.add_argument('--index', default=INDEX_FILE, help="특징 인덱스 파일")
+    parser.add_argument('--report', default=SUGGESTIONS_FILE, help="추천 결과 JSON 파일")
+    parser.add_argument('-k', type=int, default=5, help="이웃 수")
+    parser.add_argument('--evaluate', action='store_true', help="기존 이미지로 정확도 측정")
+    parser.add_argument('--workers', type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🏺 시대 추천")
+    print("=" * 60)
+
+    index = EraIndex.load(args.index)
+    computed = index.update(args.source, args.workers)
+    index.save(args.index)
+    print(f"✓ 인덱스: 이미지 {len(index.paths)}개 (새로 계산 {computed}개)")
+
+    if args.evaluate:
+        print(f"  leave-one-out 정확도 (k={args.k}): {evaluate(index, args.k):.1%}")
+
+    if not Path(args.output).exists():
+        print(f"⚠ '{args.output}' 폴더가 없습니다.")
+        return
+
+    suggestions = classify_folder(index, args.output, args.k, args.workers)
+    for path, result in suggestions.items():
+        print(f"\n• {path}")
+        print(f"  → {result['era']} ({result['confidence']:.0%})")
+        for duplicate in result['duplicates']:
+            print(f"  ⚠ 근접 중복: {duplicate}")
+
+    with open(args.report, 'w', encoding='utf-8') as f:
+        json.dump(suggestions, f, ensure_ascii=False, indent=1)
+    print(f"\n✓ 크롭 {len(suggestions)}개 분류 → {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+import time
+import uuid
+import sqlite3
+import random
+import argparse
+import tempfile
+from pathlib import Path
+from datetime import date, timedelta
+
+HISTORY_FILE = 'quiz_history.db'
+
+# 응답 시간 분포 구간 상한 (ms). 마지막 구간은 그 이상 전부
+LATENCY_BUCKETS = [500, 1000, 2000, 3000, 5000, 10000, 20000, 60000]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS answers (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    day INTEGER NOT NULL,
+    session_id TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    stats_key TEXT NOT NULL,
+    category TEXT NOT NULL,
+    chosen TEXT NOT NULL,
+    is_correct INTEGER NOT NULL,
+    latency_ms INTEGER NOT NULL,
+    latency_bucket INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS answers_session ON answers(session_id);
+
+-- 일자/모드/카테고리별 누적 (분석 쿼리는 이 테이블만 읽음)
+CREATE TABLE IF NOT EXISTS daily_rollup (
+    day INTEGER NOT NULL,
+    mode TEXT NOT NULL,
+    category TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    correct INTEGER NOT NULL,
+    latency_sum INTEGER NOT NULL,
+    PRIMARY KEY (day, mode, category)
+) WITHOUT ROWID;
+
+-- 모드별 응답 시간 분포
+CREATE TABLE IF NOT EXISTS latency_rollup (
+    mode TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (mode, bucket)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS answers_rollup AFTER INSERT ON answers
+BEGIN
+    INSERT INTO daily_rollup (day, mode, category, total, correct, latency_sum)
+    VALUES (NEW.day, NEW.mode, NEW.category, 1, NEW.is_correct, NEW.latency_ms)
+    ON CONFLICT (day, mode, category) DO UPDATE SET
+        total = total + 1,
+        correct = correct + NEW.is_correct,
+        latency_sum = latency_sum + NEW.latency_ms;
+
+    INSERT INTO latency_rollup (mode, bucket, count)
+    VALUES (NEW.mode, NEW.latency_bucket, 1)
+    ON CONFLICT (mode, bucket) DO UPDATE SET count = count + 1;
+END;
+"""
+
+
+def new_session_id():
+    """학습 세션 ID 생성"""
+    return uuid.uuid4().hex
+
+
+def latency_bucket(latency_ms):
+    """응답 시간이 속하는 분포 구간 번호"""
+    for i, upper in enumerate(LATENCY_BUCKETS):
+        if latency_ms < upper:
+            return i
+    return len(LATENCY_BUCKETS)
+
+
+def bucket_label(bucket):
+    """분포 구간 표시 문자열"""
+    if bucket >= len(LATENCY_BUCKETS):
+        return f"{LATENCY_BUCKETS[-1] / 1000:g}초 이상"
+    upper = LATENCY_BUCKETS[bucket] / 1000
+    lower = LATENCY_BUCKETS[bucket - 1] / 1000 if bucket > 0 else 0
+    return f"{lower:g}~{upper:g}초"
+
+
+class HistoryStore:
+    """답변 이벤트 로그 (SQLite) 및 집계 조회"""
+
+    def __init__(self, db_file=HISTORY_FILE):
+        self.db_file = db_file
+        self.conn = sqlite3.connect(db_file)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def _row(self, session_id, mode, stats_key, category, chosen, is_correct, latency_ms, ts):
+        """answers 테이블 한 행 생성"""
+        latency_ms = max(0, int(latency_ms))
+        return (ts, date.fromtimestamp(ts).toordinal(), session_id, mode, stats_key,
+                category, chosen, int(bool(is_correct)), latency_ms, latency_bucket(latency_ms))
+
+    def record(self, session_id, mode, stats_key, category, chosen, is_correct,
+               latency_ms, ts=None):
+        """답변 이벤트 한 건 기록"""
+        row = self._row(session_id, mode, stats_key, category, chosen, is_correct,
+                        latency_ms, time.time() if ts is None else ts)
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO answers (ts, day, session_id, mode, stats_key, category, chosen,"
+                " is_correct, latency_ms, latency_bucket) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                row)
+
+    def record_many(self, events):
+        """답변 이벤트 일괄 기록 (events: record 인자와 같은 순서의 튜플)"""
+        rows = (self._row(*event) for event in events)
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO answers (ts, day, session_id, mode, stats_key, category, chosen,"
+                " is_correct, latency_ms, latency_bucket) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows)
+
+    def accuracy_by_category(self, days=30, mode=None):
+        """최근 N일 카테고리별 (카테고리, 문제 수, 정답 수, 평균 응답 ms)"""
+        first_day = (date.today() - timedelta(days=days - 1)).toordinal()
+        query = ("SELECT category, SUM(total), SUM(correct), SUM(latency_sum)"
+                 " FROM daily_rollup WHERE day >= ?")
+        params = [first_day]
+        if mode:
+            query += " AND mode = ?"
+            params.append(mode)
+        query += " GROUP BY category ORDER BY SUM(correct) * 1.0 / SUM(total)"
+
+        return [(category, total, correct, latency_sum / total if total else 0)
+                for category, total, correct, latency_sum
+                in self.conn.execute(query, params)]
+
+    def daily_accuracy(self, days=30, mode=None):
+        """최근 N일 일자별 (날짜, 문제 수, 정답 수)"""
+        first_day = (date.today() - timedelta(days=days - 1)).toordinal()
+        query = "SELECT day, SUM(total), SUM(correct) FROM daily_rollup WHERE day >= ?"
+        params = [first_day]
+        if mode:
+            query += " AND mode = ?"
+            params.append(mode)
+        query += " GROUP BY day ORDER BY day"
+
+        return [(date.fromordinal(day), total, correct)
+                for day, total, correct in self.conn.execute(query, params)]
+
+    def latency_distribution(self, mode=None):
+        """응답 시간 분포 [(구간 번호, 횟수)]"""
+        query = "SELECT bucket, SUM(count) FROM latency_rollup"
+        params = []
+        if mode:
+            query += " WHERE mode = ?"
+            params.append(mode)
+        query += " GROUP BY bucket ORDER BY bucket"
+        return list(self.conn.execute(query, params))
+
+    def session_summary(self, session_id):
+        """세션 요약 (문제 수, 정답 수, 평균 응답 ms)"""
+        total, correct, latency = self.conn.execute(
+            "SELECT COUNT(*), SUM(is_correct), AVG(latency_ms) FROM answers WHERE session_id = ?",
+            (session_id,)).fetchone()
+        return total, correct or 0, latency or 0
+
+    def close(self):
+        """DB 닫기"""
+        self.conn.close()
+
+
+def print_report(store, days, mode):
+    """집계 결과 출력"""
+    print(f"\n📊 최근 {days}일 카테고리별 정답률")
+    for category, total, correct, latency in store.accuracy_by_category(days, mode):
+        print(f"  {category}: {correct / total * 100:.1f}% ({correct}/{total}, 평균 {latency / 1000:.1f}초)")
+
+    print("\n⏱️  응답 시간 분포")
+    for bucket, count in store.latency_distribution(mode):
+        print(f"  {bucket_label(bucket)}: {count}회")
+
+
+def benchmark(count):
+    """합성 이벤트 N건 기록 후 집계 쿼리 시간 측정"""
+    categories = [f"카테고리{i}" for i in range(20)]
+    now = time.time()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = HistoryStore(str(Path(tmp) / 'bench.db'))
+
+        start = time.perf_counter()
+        batch = []
+        for i in range(count):
+            category = random.choice(categories)
+            batch.append((f"s{i // 50}", 'choice', f"{category}|항목|{i % 3000}", category,
+                          '항목', random.random() < 0.7, random.expovariate(1 / 4000),
+                          now - random.random() * 90 * 86400))
+            if len(batch) == 100000:
+                store.record_many(batch)
+                batch = []
+        store.record_many(batch)
+        print(f"✓ {count:,}건 기록: {time.perf_counter() - start:.1f}초")
+
+        for name, query in [('카테고리별 정답률(30일)', lambda: store.accuracy_by_category(30)),
+                            ('일자별 정답률(30일)', lambda: store.daily_accuracy(30)),
+                            ('응답 시간 분포', lambda: store.latency_distribution())]:
+            start = time.perf_counter()
+            query()
+            print(f"  {name}: {(time.perf_counter() - start) * 1000:.2f}ms")
+
+        store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="학습 기록 조회")
+    parser.add_argument('--db', default=HISTORY_FILE, help="기록 DB 파일")
+    parser.add_argument('--days', type=int, default=30, help="조회 기간 (일)")
+    parser.add_argument('--mode', choices=['artifact', 'choice', 'reverse'], default=None)
+    parser.add_argument('--bench', type=int, default=None, metavar='N',
+                        help="합성 이벤트 N건으로 집계 속도 측정")
+    args = parser.parse_args()
+
+    if args.bench:
+        benchmark(args.bench)
+        return
+
+    if not Path(args.db).exists():
+        print(f"⚠ '{args.db}' 파일이 없습니다.")
+        return
+
+    store = HistoryStore(args.db)
+    print_report(store, args.days, args.mode)
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+import io
+import sys
+import math
+import time
+from pathlib import Path
+from collections import namedtuple
+from PIL import Image
+
+# 이미지 한 장 로드 결과
+# strategy: 'full' | 'draft' (JPEG 축소 디코딩) | 'reduce' (정수배 축소 후 LANCZOS) | 'thumbnail'
+# peak_bytes: 로드 중 가장 큰 픽셀 버퍼 크기 (추정치, PIL 버퍼는 tracemalloc에 잡히지 않음)
+LoadReport = namedtuple('LoadReport', [
+    'source', 'strategy', 'source_size', 'decoded_size', 'final_size', 'elapsed_ms', 'peak_bytes'])
+
+# draft()로 축소 디코딩이 가능한 포맷
+DRAFT_FORMATS = ('JPEG', 'MPO')
+
+# reduce()를 쓸 수 없거나 (P, 1) 팔레트 번호를 평균내게 되는 (PA) 모드 → 변환할 모드
+# (I;16 등 나머지 미지원 모드는 thumbnail로)
+REDUCE_CONVERT = {'P': 'RGBA', 'PA': 'RGBA', '1': 'L'}
+REDUCE_UNSUPPORTED = ('I;16', 'I;16L', 'I;16B', 'I;16N', 'BGR;15', 'BGR;16', 'BGR;24')
+
+
+def open_image(source):
+    """파일 경로 또는 인코딩된 바이트(memoryview 포함)에서 이미지 열기 (헤더만 읽음)"""
+    if isinstance(source, Image.Image):
+        return source
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return Image.open(io.BytesIO(source))
+    return Image.open(str(source))
+
+
+def buffer_bytes(img):
+    """이미지 픽셀 버퍼 크기"""
+    return img.width * img.height * len(img.getbands())
+
+
+def fitted_size(size, max_size):
+    """비율을 유지하며 max_size 안에 들어가는 크기"""
+    ratio = min(max_size[0] / size[0], max_size[1] / size[1], 1.0)
+    return max(1, math.ceil(size[0] * ratio)), max(1, math.ceil(size[1] * ratio))
+
+
+def load_image(source, max_size=None):
+    """목표 크기에 맞는 가장 저렴한 방법으로 디코딩. (이미지, LoadReport) 반환"""
+    start = time.perf_counter()
+    img = open_image(source)
+    source_size = img.size
+    name = getattr(img, 'filename', '') or str(source if isinstance(source, (str, Path)) else '')
+
+    if max_size is None:
+        strategy = 'full'
+        img.load()
+        decoded_size = img.size
+        peak = buffer_bytes(img)
+    elif img.format in DRAFT_FORMATS:
+        # JPEG은 1/2, 1/4, 1/8 배율로 바로 디코딩 (목표 크기 이상 중 가장 작은 배율)
+        strategy = 'draft'
+        img.draft(img.mode, fitted_size(img.size, max_size))
+        img.load()
+        decoded_size = img.size
+        peak = buffer_bytes(img)
+        img.thumbnail(max_size, Image.Resampling.LANCZOS)
+    else:
+        img.load()
+        decoded_size = img.size
+        peak = buffer_bytes(img)
+
+        target = fitted_size(img.size, max_size)
+        factor = min(img.width // target[0], img.height // target[1])
+        if factor >= 2 and img.mode not in REDUCE_UNSUPPORTED:
+            # 정수배 박스 축소로 크기를 먼저 줄인 뒤 LANCZOS
+            strategy = 'reduce'
+            if img.mode in REDUCE_CONVERT:
+                # 투명 정보가 없는 팔레트 이미지는 RGB로
+                mode = REDUCE_CONVERT[img.mode]
+                if img.mode == 'P' and 'transparency' not in img.info:
+                    mode = 'RGB'
+                img = img.convert(mode)
+                peak += buffer_bytes(img)
+            img = img.reduce(factor)
+        else:
+            strategy = 'thumbnail'
+        img.thumbnail(max_size, Image.Resampling.LANCZOS)
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    return img, LoadReport(name, strategy, source_size, decoded_size, img.size, elapsed_ms, peak)
+
+
+def format_report(report):
+    """LoadReport 한 줄 요약"""
+    sw, sh = report.source_size
+    dw, dh = report.decoded_size
+    fw, fh = report.final_size
+    return (f"{report.strategy:<9} {sw}x{sh} → 디코딩 {dw}x{dh} → {fw}x{fh} | "
+            f"{report.elapsed_ms:.1f}ms, 최대 {report.peak_bytes / 1024 / 1024:.1f}MB")
+
+
+def main():
+    """이미지별 로드 전략/시간/메모리 비교 (전체 디코딩 + thumbnail 대비)"""
+    args = sys.argv[1:]
+    max_size = (790, 440)
+    if args and args[0].startswith('--max='):
+        w, h = args.pop(0)[len('--max='):].split('x')
+        max_size = (int(w), int(h))
+
+    files = []
+    for arg in args or ['legacy_images']:
+        path = Path(arg)
+        if path.is_dir():
+            files.extend(sorted(p for p in path.rglob('*')
+                                if p.suffix.lower() in ('.png', '.jpg', '.jpeg', '.jfif', '.webp')))
+        elif path.exists():
+            files.append(path)
+
+    total_full = total_fast = 0.0
+    for path in files:
+        # 기준: 전체 디코딩 후 thumbnail (기존 방식)
+        start = time.perf_counter()
+        with Image.open(path) as img:
+            img.load()
+            full_peak = buffer_bytes(img)
+            img.thumbnail(max_size, Image.Resampling.LANCZOS)
+        full_ms = (time.perf_counter() - start) * 1000
+
+        _, report = load_image(path, max_size)
+        total_full += full_ms
+        total_fast += report.elapsed_ms
+        print(f"{path.name}: {format_report(report)} (기존 {full_ms:.1f}ms, {full_peak / 1024 / 1024:.1f}MB)")
+
+    if files:
+        print(f"\n✓ {len(files)}개: 기존 {total_full:.0f}ms → {total_fast:.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
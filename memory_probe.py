@@ -0,0 +1,159 @@
+import gc
+import sys
+import json
+import time
+import tracemalloc
+from collections import Counter
+
+from quiz_log import logger
+
+MEMORY_FILE = 'memory_probe.json'
+
+# 할당 위치 비교에서 뺄 파일 (측정 도구 자체)
+IGNORED_FILES = ('<frozen importlib._bootstrap>', '<frozen importlib._bootstrap_external>',
+                 '<unknown>', tracemalloc.__file__)
+
+
+def process_rss():
+    """현재 프로세스 RSS (bytes, 알 수 없으면 None). psutil이 있으면 사용"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    if sys.platform.startswith('linux'):
+        import os
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    return None
+
+
+def type_counts():
+    """살아 있는 Python 객체 수 (타입 이름별)"""
+    return Counter(type(obj).__name__ for obj in gc.get_objects())
+
+
+def tk_counts(root):
+    """Tk 쪽 자원 수 (이미지 등록 수, Tcl 명령 수, 위젯 수, root에 등록된 Python 콜백 수)"""
+    widgets = 0
+    pending = [root]
+    while pending:
+        widget = pending.pop()
+        children = widget.winfo_children()
+        widgets += len(children)
+        pending.extend(children)
+    return {
+        'images': len(root.tk.call('image', 'names')),
+        'commands': len(root.tk.call('info', 'commands')),
+        'widgets': widgets,
+        'callbacks': len(getattr(root, '_tclCommands', None) or ()),
+    }
+
+
+class MemoryProbe:
+    """N문제마다 메모리 표본 (tracemalloc, 객체 수, Tk 자원 수). 첫 표본 대비 증가량을 기록"""
+
+    def __init__(self, every=100, root=None, top=10, frames=1):
+        self.every = every
+        self.root = root
+        self.top = top
+        self.answers = 0
+        self.samples = []
+        self._baseline_types = None
+        self._baseline_snapshot = None
+
+        # 이미 추적 중이면 (python -X tracemalloc) 그대로 사용
+        self._started = not tracemalloc.is_tracing()
+        if self._started:
+            tracemalloc.start(frames)
+
+    @classmethod
+    def from_config(cls, config, root=None):
+        """quiz_config.json의 memory_probe_every (0이면 끔, 추적 비용이 있어 기본은 끔)"""
+        every = config.get('memory_probe_every', 0)
+        return cls(every, root, config.get('memory_probe_top', 10)) if every else None
+
+    def on_answer(self):
+        """답변 한 건마다 호출 (every번째마다 표본)"""
+        self.answers += 1
+        if self.answers % self.every == 0:
+            self.sample()
+
+    def _snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, name) for name in IGNORED_FILES])
+
+    def sample(self):
+        """표본 하나 기록 (gc 후 측정). 표본 dict 반환"""
+        gc.collect()
+        start = time.perf_counter()
+        traced, peak = tracemalloc.get_traced_memory()
+        types = type_counts()
+        snapshot = self._snapshot()
+
+        if self._baseline_snapshot is None:
+            self._baseline_types = types
+            self._baseline_snapshot = snapshot
+
+        type_growth = (types - self._baseline_types).most_common(self.top)
+        site_growth = [stat for stat in snapshot.compare_to(self._baseline_snapshot, 'lineno')
+                       if stat.size_diff > 0][:self.top]
+
+        sample = {
+            'answers': self.answers,
+            'time': time.time(),
+            'traced_bytes': traced,
+            'peak_bytes': peak,
+            'rss_bytes': process_rss(),
+            'objects': sum(types.values()),
+            'tk': tk_counts(self.root) if self.root is not None else None,
+            'type_growth': type_growth,
+            'site_growth': [[str(stat.traceback), stat.size_diff, stat.count_diff]
+                            for stat in site_growth],
+            'sample_ms': (time.perf_counter() - start) * 1000,
+        }
+        self.samples.append(sample)
+        logger.info("메모리 (%d문제): 추적 %.1fMB, 객체 %d개%s", self.answers, traced / 1024 / 1024,
+                    sample['objects'],
+                    f", Tk 이미지 {sample['tk']['images']}개 / 명령 {sample['tk']['commands']}개"
+                    if sample['tk'] else "")
+        return sample
+
+    def growth(self, since=0):
+        """since번째 표본 대비 마지막 표본의 증가량 {'traced_bytes', 'rss_bytes', 'objects', Tk 항목...}"""
+        if len(self.samples) <= since:
+            return {}
+        first, last = self.samples[since], self.samples[-1]
+        result = {key: last[key] - first[key] for key in ('traced_bytes', 'objects')}
+        if first['rss_bytes'] is not None and last['rss_bytes'] is not None:
+            result['rss_bytes'] = last['rss_bytes'] - first['rss_bytes']
+        if first['tk'] and last['tk']:
+            result.update({f"tk_{key}": last['tk'][key] - first['tk'][key] for key in first['tk']})
+        return result
+
+    def lines(self):
+        """진단 패널용 요약"""
+        if not self.samples:
+            return [f"표본 없음 ({self.every}문제마다 측정)"]
+        last = self.samples[-1]
+        lines = [f"{len(self.samples)}개 표본, 최근 {last['answers']}문제: "
+                 f"추적 {last['traced_bytes'] / 1024 / 1024:.1f}MB "
+                 f"(최대 {last['peak_bytes'] / 1024 / 1024:.1f}MB), 객체 {last['objects']}개"]
+        if last['tk']:
+            lines.append("Tk: " + ", ".join(f"{key} {value}" for key, value in last['tk'].items()))
+        growth = self.growth()
+        if growth:
+            lines.append("첫 표본 대비: " + ", ".join(f"{key} {value:+,}" for key, value in growth.items()))
+        lines += [f"  {name}: {count:+}" for name, count in last['type_growth']]
+        lines += [f"  {site}: {size / 1024:+.1f}KB ({count:+})" for site, size, count in last['site_growth']]
+        return lines
+
+    def export(self, path=MEMORY_FILE):
+        """표본 전체를 JSON으로 저장"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'every': self.every, 'samples': self.samples}, f, ensure_ascii=False, indent=1)
+
+    def stop(self):
+        """직접 시작한 추적 종료"""
+        if self._started and tracemalloc.is_tracing():
+            tracemalloc.stop()
@@ -0,0 +1,228 @@
+import os
+import json
+import time
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image
+
+# 퀴즈 화면(show_quiz_screen)의 이미지 영역 크기
+DEFAULT_MAX_WIDTH = 790
+DEFAULT_MAX_HEIGHT = 440
+
+SOURCE_FOLDER = 'legacy_images'
+OUTPUT_FOLDER = 'optimized_images'
+MANIFEST_FILE = 'image_manifest.json'
+
+IMAGE_EXTENSIONS = ['.png', '.jpg', '.jpeg']
+
+# 포맷별 (PIL 포맷명, 확장자, 저장 옵션)
+OUTPUT_FORMATS = {
+    'webp': ('WEBP', '.webp', {'quality': 85, 'method': 6}),
+    'jpeg': ('JPEG', '.jpg', {'quality': 85, 'optimize': True, 'progressive': True}),
+    'png': ('PNG', '.png', {'optimize': True}),
+}
+
+
+def find_images(source_folder):
+    """이미지 트리에서 원본 이미지 목록 가져오기"""
+    source_path = Path(source_folder)
+    if not source_path.exists():
+        return []
+    return sorted(p for p in source_path.rglob('*')
+                  if p.is_file() and p.suffix.lower() in IMAGE_EXTENSIONS)
+
+
+def measure_decode(path):
+    """이미지 한 장의 디코딩 시간(초) 측정"""
+    start = time.perf_counter()
+    with Image.open(path) as img:
+        img.load()
+    return time.perf_counter() - start
+
+
+def optimize_one(task):
+    """이미지 한 장 축소 및 재인코딩 (프로세스 풀 워커)"""
+    src, dst, max_size, fmt, quality, force = task
+    src_path = Path(src)
+    dst_path = Path(dst)
+    pil_format, _, save_options = OUTPUT_FORMATS[fmt]
+    save_options = dict(save_options)
+    if quality is not None and 'quality' in save_options:
+        save_options['quality'] = quality
+
+    result = {
+        'src': src,
+        'dst': dst,
+        'src_bytes': src_path.stat().st_size,
+        'skipped': False,
+        'error': None,
+    }
+
+    # 원본보다 최신인 결과물이 있으면 건너뛰기 (설정이 바뀌었으면 main에서 force)
+    if (not force and dst_path.exists()
+            and dst_path.stat().st_mtime >= src_path.stat().st_mtime):
+        result['skipped'] = True
+        result['dst_bytes'] = dst_path.stat().st_size
+        return result
+
+    try:
+        result['src_decode'] = measure_decode(src_path)
+
+        with Image.open(src_path) as img:
+            img.thumbnail(max_size, Image.Resampling.LANCZOS)
+
+            if pil_format == 'JPEG' and img.mode != 'RGB':
+                # JPEG은 투명도를 지원하지 않으므로 흰 배경(퀴즈 화면 배경)에 합성
+                rgba = img.convert('RGBA')
+                background = Image.new('RGB', rgba.size, 'white')
+                background.paste(rgba, mask=rgba.split()[3])
+                img = background
+            elif img.mode not in ('RGB', 'RGBA'):
+                img = img.convert('RGBA' if 'transparency' in img.info else 'RGB')
+
+            dst_path.parent.mkdir(parents=True, exist_ok=True)
+            img.save(dst_path, pil_format, **save_options)
+
+        result['dst_bytes'] = dst_path.stat().st_size
+        result['dst_decode'] = measure_decode(dst_path)
+    except Exception as e:
+        result['error'] = str(e)
+
+    return result
+
+
+def build_tasks(images, source_folder, output_folder, max_size, fmt, quality, force):
+    """원본 경로 → 결과 경로 작업 목록 생성"""
+    extension = OUTPUT_FORMATS[fmt][1]
+    source_path = Path(source_folder)
+    output_path = Path(output_folder)
+
+    tasks = []
+    for src in images:
+        relative = src.relative_to(source_path)
+        dst = (output_path / relative).with_suffix(extension)
+        tasks.append((str(src), str(dst), max_size, fmt, quality, force))
+    return tasks
+
+
+def write_manifest(manifest_file, results, max_size, fmt, quality=None):
+    """원본 경로 → 최적화 경로 매니페스트 저장 (통계 키 유지용, 다음 실행의 설정 비교용 설정 포함)"""
+    images = {}
+    for r in results:
+        if r['error']:
+            continue
+        images[Path(r['src']).as_posix()] = Path(r['dst']).as_posix()
+
+    manifest = {
+        'max_size': list(max_size),
+        'format': fmt,
+        'quality': quality,
+        'images': images,
+    }
+    with open(manifest_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+def load_manifest(manifest_file=MANIFEST_FILE):
+    """매니페스트 로드 (없으면 빈 매핑)"""
+    if not Path(manifest_file).exists():
+        return {}
+    try:
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            return json.load(f).get('images', {})
+    except Exception as e:
+        print(f"이미지 매니페스트 로드 실패: {e}")
+        return {}
+
+
+def manifest_settings(manifest_file=MANIFEST_FILE):
+    """지난 실행의 설정 (max_size, format, quality). 매니페스트가 없거나 읽지 못하면 None"""
+    if not Path(manifest_file).exists():
+        return None
+    try:
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except Exception:
+        return None
+    return {'max_size': manifest.get('max_size'), 'format': manifest.get('format'),
+            'quality': manifest.get('quality')}
+
+
+def print_report(results, elapsed):
+    """절감 용량 및 디코딩 시간 개선 보고"""
+    done = [r for r in results if not r['error'] and not r['skipped']]
+    skipped = [r for r in results if r['skipped']]
+    failed = [r for r in results if r['error']]
+
+    src_bytes = sum(r['src_bytes'] for r in results if not r['error'])
+    dst_bytes = sum(r['dst_bytes'] for r in results if not r['error'])
+    saved = src_bytes - dst_bytes
+    ratio = (saved / src_bytes * 100) if src_bytes > 0 else 0
+
+    print(f"\n{'='*60}")
+    print(f"✓ 처리: {len(done)}개 | 건너뜀(최신): {len(skipped)}개 | 실패: {len(failed)}개")
+    print(f"   용량: {src_bytes:,} → {dst_bytes:,} bytes ({saved:,} bytes 절감, {ratio:.1f}%)")
+
+    if done:
+        src_decode = sum(r['src_decode'] for r in done)
+        dst_decode = sum(r['dst_decode'] for r in done)
+        speedup = (src_decode / dst_decode) if dst_decode > 0 else 0
+        print(f"   디코딩: 평균 {src_decode / len(done) * 1000:.1f}ms → "
+              f"{dst_decode / len(done) * 1000:.1f}ms ({speedup:.1f}배 빠름)")
+
+    for r in failed:
+        print(f"❌ {r['src']}: {r['error']}")
+
+    print(f"   소요 시간: {elapsed:.1f}초")
+    print(f"{'='*60}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="legacy_images 일괄 최적화")
+    parser.add_argument('--source', default=SOURCE_FOLDER, help="원본 이미지 폴더")
+    parser.add_argument('--output', default=OUTPUT_FOLDER, help="결과 이미지 폴더")
+    parser.add_argument('--manifest', default=MANIFEST_FILE, help="매니페스트 파일")
+    parser.add_argument('--max-width', type=int, default=DEFAULT_MAX_WIDTH)
+    parser.add_argument('--max-height', type=int, default=DEFAULT_MAX_HEIGHT)
+    parser.add_argument('--format', choices=list(OUTPUT_FORMATS), default='webp')
+    parser.add_argument('--quality', type=int, default=None, help="손실 압축 품질 (1-100)")
+    parser.add_argument('--workers', type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    parser.add_argument('--force', action='store_true', help="최신 결과물도 다시 생성")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🗜️  이미지 일괄 최적화")
+    print("=" * 60)
+
+    images = find_images(args.source)
+    if not images:
+        print(f"⚠ '{args.source}' 폴더에 이미지 파일이 없습니다.")
+        return
+
+    max_size = (args.max_width, args.max_height)
+    # 크기/포맷/품질이 지난 실행과 다르면 기존 결과물은 최신이어도 다시 생성
+    force = args.force
+    previous = manifest_settings(args.manifest)
+    settings = {'max_size': list(max_size), 'format': args.format, 'quality': args.quality}
+    if previous and previous != settings:
+        print(f"⚠ 설정이 바뀌어 모두 다시 생성합니다 ({previous} → {settings})")
+        force = True
+    tasks = build_tasks(images, args.source, args.output, max_size,
+                        args.format, args.quality, force)
+    print(f"✓ 총 {len(tasks)}개 이미지 | 최대 {max_size[0]}x{max_size[1]} | {args.format}")
+
+    start = time.perf_counter()
+    workers = args.workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(optimize_one, tasks, chunksize=8))
+    elapsed = time.perf_counter() - start
+
+    write_manifest(args.manifest, results, max_size, args.format, args.quality)
+    print(f"✓ 매니페스트 저장: {args.manifest}")
+    print_report(results, elapsed)
+
+
+if __name__ == "__main__":
+    main()
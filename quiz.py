@@ -1,11 +1,30 @@
 import os
 import json
-import random
+import time
+import logging
+import threading
 from pathlib import Path
 import tkinter as tk
 from tkinter import ttk, messagebox
 from PIL import Image, ImageTk
-import yaml
+from optimize_images import load_manifest
+from asset_pack import ASSET_PREFIX, open_pack, file_stamp
+from content_pack import ContentLibrary, PACK_PREFIX
+from history import HistoryStore, HISTORY_FILE, new_session_id, bucket_label
+from tracing import Tracer, traced, TRACE_FILE
+from memory_probe import MemoryProbe, MEMORY_FILE
+from quiz_log import logger, setup_logging, stage, metrics, panel_handler
+from choice_index import load_index, category_hash
+from category_stats import CategoryAggregates, AGGREGATES_FILE
+from session import SessionCheckpoint
+from image_loader import load_image, format_report
+from sprite_atlas import AtlasStore, REVERSE_PREFIX
+from stats_store import StatsStore
+from quiz_core import (load_categories, load_choice_data, accuracy_of, artifact_questions,
+                       choice_questions, order_questions, new_seed, session_rng, count_choices,
+                       choice_keys)
+from stats_compact import (QuestionBank, compact_if_needed, load_image_hashes, DEFAULT_ORPHAN_RATIO,
+                           DEFAULT_MAX_INSTANCES, DEFAULT_MAX_ARCHIVE_RATIO)
 
 class QuizApp:
     def __init__(self):
@@ -22,12 +41,37 @@ class QuizApp:
         self.config = self.load_config()
         self.stats = self.load_stats()
         
+        # 로그 레벨/파일 설정 (quiz_config.json의 log_level, log_file)
+        setup_logging(self.config)
+        
+        # 화면/응답 구간 기록 (quiz_config.json의 trace_enabled로 켜기)
+        self.tracer = Tracer.from_config(self.config)
+        
+        # N문제마다 메모리 표본 (quiz_config.json의 memory_probe_every로 켜기)
+        self.memory_probe = MemoryProbe.from_config(self.config, self.root)
+        
+        # 최적화 이미지 매니페스트 (원본 경로 → 최적화 경로)
+        self.image_manifest = load_manifest()
+        
+        # 빌드 시 만든 에셋 팩 (있으면 폴더 탐색 대신 인덱스 사용)
+        # (legacy_images가 팩보다 새로우면 팩 무시)
+        self.asset_pack = open_pack(source_folder=self.image_folder_name)
+        
+        # 추가 콘텐츠 팩 (매니페스트만 읽음, 선지/이미지는 카테고리를 고를 때 로드)
+        self.library = ContentLibrary(self.config.get('packs_folder', 'packs'))
+        
         # 창 크기 및 위치 복원
         geometry = self.config.get('window_geometry', '700x1150')
         self.root.geometry(geometry)
         
         # 창 닫을 때 위치 저장
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+        
+        # F12: 진단 패널
+        self.root.bind('<F12>', lambda e: self.show_diagnostics_panel())
+        
+        # 피드백 화면의 클릭/키 바인딩 ID (해제할 때 등록된 콜백도 함께 삭제)
+        self.advance_bindings = []
 
         # 퀴즈 데이터
         self.categories = []
@@ -36,23 +80,44 @@ class QuizApp:
         self.current_question = 0
         self.correct_count = 0
         self.total_questions = 0
-        self.quiz_mode = None  # 'artifact' or 'choice'
+        self.quiz_mode = None  # 'artifact', 'reverse' or 'choice'
         
         # 사용자 답변 기록 (이전 문제로 돌아갈 때 사용)
         self.user_answers = []
         
+        # 답변 이벤트 로그 (세션 ID, 문제 표시 시각)
+        self.history = self.open_history()
+        self.session_id = None
+        self.question_shown_ns = None
+        
+        # 세션별 난수 (시드를 체크포인트에 기록, quiz_config.json의 random_seed로 고정 가능)
+        self.session_seed = None
+        self.rng = session_rng()
+        
         # 타이머 ID
         self.after_id = None
         
-        # output 폴더에서 카테고리 로드
-        self.load_categories()
-        
-        # YAML 파일에서 선지 데이터 로드
+        # 카테고리/선지 데이터 (모드 선택 화면에서 처음 한 번 로드)
         self.choice_data = {}
-        self.load_choice_data()
+        self.choice_index = None
+        self.choices_loaded = False   # choices.yaml을 정상적으로 읽었는지 (빈 선지와 구분)
+        self.data_loaded = False
+        
+        # 시대/주제별 통계 합계 캐시 (설정 화면 표시, 출제 문제 수 미리 계산)
+        self.aggregates = None
+        
+        # 역방향(시대 → 유물) 모드용 썸네일 아틀라스 (처음 사용할 때 로드)
+        self.atlases = None
         
-        # 초기 화면 표시 (모드 선택)
-        self.show_mode_selection_screen()
+        # 문제 난이도 모델 (백그라운드에서 추정, 준비되기 전에는 누적 정답률로 정렬)
+        self.difficulty = None
+        
+        # 진행 중이던 세션 체크포인트
+        self.checkpoint = SessionCheckpoint()
+        
+        # 이어서 하지 않으면 초기 화면 표시 (모드 선택)
+        if not self.offer_resume():
+            self.show_mode_selection_screen()
 
     def load_config(self):
         """설정 로드"""
@@ -65,13 +130,27 @@ class QuizApp:
             "show_artifact_name": True,
             "auto_next_delay": 1.5,
             "prioritize_wrong_answers": False,
-            "quiz_mode": "artifact"
+            "quiz_mode": "artifact",
+            "trace_enabled": False,
+            "log_level": "WARNING"
         }
 
     def on_closing(self):
         """프로그램 종료 시 창 위치 저장"""
         self.config['window_geometry'] = self.root.geometry()
         self.save_config()
+        if self.asset_pack:
+            self.asset_pack.close()
+        self.library.close()
+        if self.history:
+            self.history.close()
+        if self.aggregates and self.aggregates.dirty:
+            self.save_aggregates()
+        if self.memory_probe:
+            self.memory_probe.export(self.config.get('memory_probe_file', MEMORY_FILE))
+        if self.tracer.enabled:
+            self.tracer.export(self.config.get('trace_file', TRACE_FILE),
+                               self.config.get('trace_format', 'chrome'))
         self.root.destroy()
         
     def save_config(self):
@@ -80,57 +159,331 @@ class QuizApp:
             json.dump(self.config, f, ensure_ascii=False, indent=2)
     
     def load_stats(self):
-        """통계 로드"""
-        if Path(self.stats_file).exists():
-            with open(self.stats_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return {}
+        """통계 로드 (다른 인스턴스와 함께 쓰는 G-counter 저장소의 합계 뷰)"""
+        self.stats_store = StatsStore(self.stats_file)
+        return self.stats_store.totals
     
+    @traced('save_stats')
     def save_stats(self):
-        """통계 저장"""
-        with open(self.stats_file, 'w', encoding='utf-8') as f:
-            json.dump(self.stats, f, ensure_ascii=False, indent=2)
+        """통계 저장 (잠금 후 다른 인스턴스 기록과 병합)"""
+        try:
+            self.stats_store.save()
+        except Exception as e:
+            logger.error("통계 저장 실패: %s", e)
     
-    def load_categories(self):
-        """output 폴더에서 카테고리 로드"""
-        output_path = Path("legacy_images")
-        if not output_path.exists():
-            print("legacy_images 폴더가 없습니다.")
+    def open_history(self):
+        """학습 기록 DB 열기"""
+        try:
+            return HistoryStore()
+        except Exception as e:
+            logger.error("학습 기록 DB 로드 실패: %s", e)
+            return None
+    
+    def measure_response(self, stats_key):
+        """문제 표시부터 응답까지 걸린 시간(ms) 측정 및 구간 기록"""
+        if self.question_shown_ns is None:
+            return 0
+        
+        now = time.perf_counter_ns()
+        self.tracer.add('response', self.question_shown_ns, now, key=stats_key)
+        return (now - self.question_shown_ns) / 1e6
+    
+    def record_answer(self, stats_key, category, user_answer, is_correct, latency_ms):
+        """답변 이벤트 기록 (난이도 모델도 갱신)"""
+        if self.difficulty:
+            self.difficulty.update(stats_key, is_correct)
+        
+        if self.memory_probe:
+            self.memory_probe.on_answer()
+        
+        if not self.history:
+            return
+        
+        try:
+            self.history.record(self.session_id, self.quiz_mode, stats_key, category,
+                                user_answer, is_correct, latency_ms)
+        except Exception as e:
+            logger.error("학습 기록 저장 실패: %s", e)
+    
+    def ensure_data_loaded(self):
+        """카테고리 및 선지 데이터 로드 (처음 한 번만)"""
+        if self.data_loaded:
             return
         
-        # 숫자 기준으로 정렬
-        folders = sorted(output_path.iterdir(), 
-                        key=lambda x: int(x.name.split('.')[0]) if '.' in x.name and x.name.split('.')[0].isdigit() else 999)
+        # output 폴더에서 카테고리 로드
+        self.categories = []
+        self.load_categories()
         
-        for folder in folders:
-            if folder.is_dir():
-                folder_name = folder.name
-                if '.' in folder_name:
-                    category_name = folder_name.split('.', 1)[1]
-                else:
-                    category_name = folder_name
+        # YAML 파일에서 선지 데이터 로드
+        self.load_choice_data()
+        self.data_loaded = True
+        
+        # 카테고리별 통계 합계 (바뀐 카테고리만 다시 계산)
+        self.sync_aggregates()
+        
+        # 없어진 문제의 통계 정리 (고아 키 비율이 기준을 넘을 때만, 백그라운드, 선지는 지금 시점 복사본)
+        threading.Thread(target=self.compact_stats,
+                         args=(dict(self.choice_data), self.choices_loaded),
+                         daemon=True).start()
+        
+        # 학습 기록으로 문제 난이도 추정 (백그라운드, 통계는 지금 시점 복사본)
+        if self.config.get('difficulty_model', True):
+            threading.Thread(target=self.fit_difficulty, args=(dict(self.stats),),
+                             daemon=True).start()
+    
+    def era_signature(self, category):
+        """시대 이미지 목록 변경 감지용 (에셋 팩 또는 폴더, 콘텐츠 팩의 수정 시각)"""
+        if self.asset_pack:
+            base = [self.asset_pack.pack_file, Path(self.asset_pack.pack_file).stat().st_mtime]
+        else:
+            folder = Path(self.image_folder_name) / category['folder']
+            base = [folder.as_posix(), folder.stat().st_mtime if folder.exists() else None]
+        packs = [[pack_name, folder, self.library.packs[pack_name].path.stat().st_mtime]
+                 for pack_name, folder in category.get('packs', [])]
+        return base + packs
+    
+    def choice_signature(self, category):
+        """선지 카테고리 변경 감지용 (검색 색인의 카테고리 해시 재사용)"""
+        if self.choice_index and category in self.choice_index.category_hashes:
+            return self.choice_index.category_hashes[category]
+        return category_hash(self.choice_data[category])
+    
+    def era_keys(self, category):
+        return (stats_key for stats_key, _, _ in self.iter_category_images(category))
+    
+    def sync_aggregates(self):
+        """카테고리별 통계 합계 캐시 맞추기 (목록이 바뀐 카테고리만 다시 나열)"""
+        try:
+            with stage('aggregates.sync') as st:
+                if self.aggregates is None:
+                    self.aggregates = CategoryAggregates.load(AGGREGATES_FILE)
+                    # 답변/병합/정리로 합계가 바뀔 때마다 반영
+                    self.stats_store.listeners.append(self.aggregates.on_stats_change)
                 
-                self.categories.append({
-                    'folder': folder_name,
-                    'name': category_name
-                })
+                eras = {category['name']: (self.era_signature(category),
+                                           lambda c=category: self.era_keys(c))
+                        for category in self.categories}
+                choices = {category: (self.choice_signature(category),
+                                      lambda c=category, items=items: choice_keys(c, items))
+                           for category, items in self.choice_data.items()}
+                # 아직 로드하지 않은 콘텐츠 팩 카테고리는 지난 캐시 유지
+                unloaded = [c for c in self.library.choice_categories() if c not in self.choice_data]
+                st.items = self.aggregates.sync({'era': eras, 'choice': choices}, self.stats,
+                                                self.stats_store.file_signature, unloaded)
+            if self.aggregates.dirty:
+                self.save_aggregates()
+        except Exception as e:
+            logger.error("카테고리 합계 계산 실패: %s", e)
+            self.aggregates = None
+    
+    def save_aggregates(self):
+        """카테고리 합계 캐시 저장 (마지막으로 저장한 통계 파일 기준)"""
+        try:
+            self.aggregates.save(AGGREGATES_FILE, self.stats_store.file_signature)
+        except OSError as e:
+            logger.error("카테고리 합계 캐시 저장 실패: %s", e)
+    
+    def category_summary(self, group, category):
+        """카테고리 요약 (캐시에 없으면 None)"""
+        if not self.aggregates:
+            return None
+        return self.aggregates.summary(group, category, self.config.get('accuracy_filter', 100))
+    
+    def summary_text(self, summary):
+        """설정 화면용 요약 ('12/40문제 · 정답률 73%', 출제 대상/전체)"""
+        accuracy = f"{summary['accuracy']:.0f}%" if summary['accuracy'] is not None else "-"
+        return f"{summary['due']}/{summary['questions']}문제 · 정답률 {accuracy}"
+    
+    def expected_questions(self, group, categories):
+        """선택한 카테고리의 출제 문제 수 (정답률 필터 적용, 문제 목록을 만들지 않고 합계로). 모르면 None"""
+        counts = self.choice_category_counts() if group == 'choice' else {}
+        expected = 0
+        for category in categories:
+            summary = self.category_summary(group, category)
+            if summary is not None:
+                expected += summary['due']
+            elif category in counts:
+                # 한 번도 로드하지 않은 콘텐츠 팩 카테고리 (매니페스트의 선지 수)
+                expected += counts[category]
+            else:
+                return None
+        return expected
+    
+    def update_selection_label(self, group, checkbox_vars, label):
+        """설정 화면 하단: 선택한 카테고리의 출제 문제 수"""
+        selected = [name for name, var in checkbox_vars.items() if var.get()]
+        expected = self.expected_questions(group, selected)
+        if expected is None:
+            label.config(text=f"{len(selected)}개 선택")
+        else:
+            label.config(text=f"{len(selected)}개 선택 · {expected}문제 출제")
+    
+    def compact_stats(self, choice_data, choices_loaded):
+        """통계 파일의 고아 키 정리 (백그라운드 스레드)"""
+        try:
+            # 콘텐츠 팩 이미지는 나열하지 않음 (zip을 열지 않도록 팩 경로 아래 통계는 그대로 둠)
+            image_keys = [stats_key for category in self.categories
+                          for stats_key, _, _ in self.iter_base_images(category)]
+            pack_roots = [pack.path for pack in self.library.packs.values()]
+            # 아직 로드하지 않은 콘텐츠 팩 카테고리의 통계는 건드리지 않음
+            unloaded = [c for c in self.library.choice_categories() if c not in choice_data]
+            # 이미지 폴더가 없거나 choices.yaml을 읽지 못했으면 그 종류의 키는 모두 고아로 보이므로 건너뜀
+            skip_kinds = []
+            if not image_keys:
+                skip_kinds.append('image')
+            if not choices_loaded or not choice_data:
+                skip_kinds.append('choice')
+            bank = QuestionBank(image_keys, choice_data, unloaded, skip_kinds, pack_roots,
+                                load_image_hashes())
+            report = compact_if_needed(
+                self.stats_store, bank,
+                ratio=self.config.get('stats_compact_ratio', DEFAULT_ORPHAN_RATIO),
+                max_instances=self.config.get('stats_fold_instances', DEFAULT_MAX_INSTANCES),
+                max_archive=self.config.get('stats_compact_max_archive', DEFAULT_MAX_ARCHIVE_RATIO))
+            if report and report.get('skipped'):
+                logger.warning("통계 자동 정리 건너뜀: 키 %d개 중 %d개를 보관해야 함 "
+                               "(python stats_compact.py --dry-run으로 확인 후 정리)",
+                               report['keys'], len(report['archived']))
+            elif report:
+                logger.info("통계 정리: 키 %d개 중 이동 %d개, 보관 %d개", report['keys'],
+                            len(report['remapped']), len(report['archived']))
+        except Exception as e:
+            logger.error("통계 정리 실패: %s", e)
+    
+    def fit_difficulty(self, stats):
+        """문제 난이도 모델 일괄 추정 (백그라운드 스레드)"""
+        try:
+            from difficulty import DifficultyModel
+            start = time.perf_counter()
+            self.difficulty = DifficultyModel.fit_history(HISTORY_FILE, stats)
+            logger.info("난이도 모델: 문제 %d개 (%.0fms)", len(self.difficulty.difficulty),
+                        (time.perf_counter() - start) * 1000)
+        except Exception as e:
+            logger.error("난이도 모델 추정 실패: %s", e)
+    
+    def question_sort_key(self):
+        """오답률 우선 정렬 키 (난이도 모델이 있으면 맞힐 확률, 없으면 누적 정답률)"""
+        return self.difficulty.sort_key if self.difficulty else None
+    
+    def offer_resume(self):
+        """중단된 세션이 있으면 이어서 할지 묻고 복원 (복원하면 True)"""
+        state = self.checkpoint.load()
+        if not state:
+            self.checkpoint.finish()
+            return False
+        
+        mode_name = {'artifact': "유물맞추기", 'reverse': "유물찾기"}.get(state['mode'], "선지맞추기")
+        progress = f"{state['current_question']}/{len(state['quiz_data'])}"
+        if not messagebox.askyesno("이어서 학습",
+                                   f"중단된 {mode_name} 학습이 있습니다 ({progress}).\n이어서 하시겠습니까?"):
+            self.checkpoint.finish()
+            return False
+        
+        # 문제 목록과 답변 기록을 그대로 복원 (폴더 탐색, YAML 파싱 없음)
+        self.quiz_mode = state['mode']
+        self.session_id = state['session_id']
+        self.session_seed = state.get('seed')
+        self.rng = session_rng(self.session_seed)
+        self.categories = state['categories']
+        self.selected_categories = state['selected_categories']
+        self.quiz_data = state['quiz_data']
+        self.total_questions = len(self.quiz_data)
+        self.user_answers = state['user_answers']
+        self.correct_count = state['correct_count']
+        self.current_question = state['current_question']
+        self.checkpoint.record_position(self.current_question)
+        
+        if self.quiz_mode == 'choice':
+            self.show_choice_quiz_screen()
+        elif self.quiz_mode == 'reverse':
+            self.show_reverse_quiz_screen()
+        else:
+            self.show_quiz_screen()
+        return True
+    
+    def start_checkpoint(self):
+        """새 세션 체크포인트 기록"""
+        self.checkpoint.start(self.quiz_mode, self.session_id, self.quiz_data,
+                              self.categories, self.selected_categories,
+                              seed=self.session_seed)
+    
+    def start_session_rng(self):
+        """새 세션 난수 생성기 (출제 순서, 보기 구성은 모두 이 시드에서 결정)"""
+        seed = self.config.get('random_seed')
+        self.session_seed = new_seed() if seed is None else seed
+        self.rng = session_rng(self.session_seed)
+        logger.info("세션 시드: %d", self.session_seed)
+    
+    def load_categories(self):
+        """output 폴더에서 카테고리 로드 (콘텐츠 팩의 시대도 합침)"""
+        if self.asset_pack:
+            self.categories = [dict(category) for category in self.asset_pack.categories]
+        elif Path(self.image_folder_name).exists():
+            # 숫자 기준으로 정렬
+            self.categories = load_categories(self.image_folder_name)
+        elif not self.library.packs:
+            logger.warning("legacy_images 폴더가 없습니다.")
+        
+        self.categories = self.library.merge_eras(self.categories)
     
     def load_choice_data(self):
         """YAML 파일에서 선지 데이터 로드"""
         yaml_file = Path("choices.yaml")
         if not yaml_file.exists():
-            print("choices.yaml 파일이 없습니다.")
+            logger.warning("choices.yaml 파일이 없습니다.")
             return
         
         try:
-            with open(yaml_file, 'r', encoding='utf-8') as f:
-                self.choice_data = yaml.safe_load(f) or {}
+            self.choice_data = load_choice_data(yaml_file)
+            self.choices_loaded = True
         except Exception as e:
-            print(f"YAML 파일 로드 실패: {e}")
+            logger.error("YAML 파일 로드 실패: %s", e)
             self.choice_data = {}
+        
+        # 선지 검색용 역색인 (바뀐 카테고리만 다시 색인)
+        with stage('choice.index'):
+            self.choice_index = load_index(self.choice_data)
+    
+    def choice_category_counts(self):
+        """선지 카테고리별 선지 수 (콘텐츠 팩은 매니페스트의 개수)"""
+        counts = {category: count_choices(items) for category, items in self.choice_data.items()}
+        for category, (_, count) in self.library.choice_categories().items():
+            counts.setdefault(category, count)
+        return counts
+    
+    def load_pack_choices(self, categories):
+        """선택한 카테고리 중 콘텐츠 팩 선지 로드 (필요한 팩만, 처음 한 번)"""
+        missing = [category for category in categories if category not in self.choice_data]
+        if not missing:
+            return
+        with stage('pack.load') as st:
+            loaded, failed = self.library.load_choices(missing)
+            self.choice_data.update(loaded)
+            st.items = len(loaded)
+        
+        # 읽지 못한 팩은 건너뛰고 알림 (나머지 카테고리로 진행)
+        for pack_name, error in failed.items():
+            logger.error("콘텐츠 팩 선지 로드 실패 %s: %s", pack_name, error)
+        if failed:
+            messagebox.showwarning(
+                "콘텐츠 팩 오류",
+                "다음 콘텐츠 팩의 선지를 읽지 못해 제외합니다:\n" + "\n".join(failed))
+        
+        # 검색 색인에도 추가 (바뀐 카테고리만)
+        if loaded and self.choice_index:
+            self.choice_index.update(self.choice_data)
+        
+        # 카테고리 합계도 (지난번과 내용이 같으면 캐시 그대로)
+        if loaded and self.aggregates:
+            self.aggregates.update('choice', {
+                category: (self.choice_signature(category),
+                           lambda c=category: choice_keys(c, self.choice_data[c]))
+                for category in loaded}, self.stats)
     
     def show_mode_selection_screen(self):
         """1단계: 모드 선택 화면"""
+        self.ensure_data_loaded()
+        
         # 기존 위젯 제거
         for widget in self.root.winfo_children():
             widget.destroy()
@@ -151,6 +504,11 @@ class QuizApp:
                                      font=("맑은 고딕", 14))
         rb_artifact.pack(anchor='w', pady=10, padx=20)
         
+        rb_reverse = tk.Radiobutton(mode_frame, text="유물찾기 (시대 → 유물)", 
+                                    variable=self.mode_var, value='reverse',
+                                    font=("맑은 고딕", 14))
+        rb_reverse.pack(anchor='w', pady=10, padx=20)
+        
         rb_choice = tk.Radiobutton(mode_frame, text="선지맞추기", 
                                    variable=self.mode_var, value='choice',
                                    font=("맑은 고딕", 14))
@@ -235,19 +593,20 @@ class QuizApp:
         self.save_config()
         
         # 모드에 따라 다른 화면으로 이동
-        if self.quiz_mode == 'artifact':
+        if self.quiz_mode in ('artifact', 'reverse'):
             self.show_artifact_setup_screen()
         elif self.quiz_mode == 'choice':
             self.show_choice_setup_screen()
     
     def show_artifact_setup_screen(self):
-        """2단계: 유물맞추기 상세 설정 화면"""
+        """2단계: 유물맞추기/유물찾기 상세 설정 화면"""
         # 기존 위젯 제거
         for widget in self.root.winfo_children():
             widget.destroy()
         
         # 타이틀
-        title = tk.Label(self.root, text="유물맞추기 설정", 
+        title_text = "유물찾기 설정" if self.quiz_mode == 'reverse' else "유물맞추기 설정"
+        title = tk.Label(self.root, text=title_text, 
                         font=("맑은 고딕", 16, "bold"))
         title.pack(pady=20)
         
@@ -262,6 +621,12 @@ class QuizApp:
         # 체크박스 변수 저장
         self.checkbox_vars = {}
         
+        # 선택한 시대의 출제 문제 수 (체크할 때마다 캐시된 합계로 갱신)
+        group = 'reverse' if self.quiz_mode == 'reverse' else 'artifact'
+        selection_label = tk.Label(self.root, font=("맑은 고딕", 11), fg='gray')
+        update_selection = lambda: self.update_selection_label(group, self.checkbox_vars,
+                                                               selection_label)
+        
         # 3열로 배치
         for i, category in enumerate(self.categories):
             row = i // 3
@@ -272,12 +637,20 @@ class QuizApp:
             if category['name'] in self.config.get('selected_categories', []):
                 var.set(True)
             
-            cb = tk.Checkbutton(checkbox_frame, text=category['name'], 
+            # 시대명 아래에 출제 대상/전체 문제 수, 정답률
+            summary = self.category_summary(group, category['name'])
+            text = category['name'] if summary is None \
+                else f"{category['name']}\n{self.summary_text(summary)}"
+            cb = tk.Checkbutton(checkbox_frame, text=text, 
                                variable=var, font=("맑은 고딕", 11),
-                               width=15, anchor='w')
+                               width=20, anchor='w', justify='left',
+                               command=update_selection)
             cb.grid(row=row, column=col, padx=10, pady=5, sticky='w')
             self.checkbox_vars[category['name']] = var
         
+        selection_label.pack()
+        update_selection()
+        
         # 구분선
         separator = tk.Frame(self.root, height=2, bg='gray')
         separator.pack(fill='x', padx=20, pady=20)
@@ -295,6 +668,19 @@ class QuizApp:
                                       font=("맑은 고딕", 12))
         show_name_cb.pack(pady=10)
         
+        # 유물찾기: 보기(썸네일) 개수
+        if self.quiz_mode == 'reverse':
+            count_frame = tk.Frame(options_frame)
+            count_frame.pack(pady=10)
+            
+            tk.Label(count_frame, text="보기 개수",
+                    font=("맑은 고딕", 12)).pack(side='left', padx=5)
+            
+            self.reverse_count_var = tk.IntVar(value=self.config.get('reverse_choice_count', 6))
+            tk.Spinbox(count_frame, from_=4, to=9,
+                      textvariable=self.reverse_count_var,
+                      width=6, font=("맑은 고딕", 12)).pack(side='left', padx=5)
+        
         # 버튼 프레임
         btn_frame = tk.Frame(self.root)
         btn_frame.pack(pady=30)
@@ -326,6 +712,21 @@ class QuizApp:
                         font=("맑은 고딕", 16, "bold"))
         title.pack(pady=20)
         
+        # 검색어 (선지 내용으로 문제 고르기)
+        search_frame = tk.Frame(self.root)
+        search_frame.pack(pady=10)
+        
+        tk.Label(search_frame, text="검색어:",
+                font=("맑은 고딕", 12)).pack(side='left', padx=5)
+        
+        self.search_var = tk.StringVar(value=self.config.get('choice_search_query', ''))
+        search_entry = tk.Entry(search_frame, textvariable=self.search_var,
+                                width=20, font=("맑은 고딕", 12))
+        search_entry.pack(side='left', padx=5)
+        
+        tk.Label(self.root, text="(예: 정조, 탕평 - 주제를 선택하지 않으면 전체에서 검색)",
+                font=("맑은 고딕", 10), fg='gray').pack()
+        
         # 대분류 선택 안내
         tk.Label(self.root, text="학습할 주제 선택:", 
                 font=("맑은 고딕", 12)).pack(pady=10)
@@ -337,21 +738,33 @@ class QuizApp:
         # 체크박스 변수 저장
         self.choice_checkbox_vars = {}
         
-        # YAML 데이터의 대분류(키)로 체크박스 생성
-        choice_categories = list(self.choice_data.keys())
+        # YAML 데이터(+ 콘텐츠 팩 매니페스트)의 대분류(키)로 체크박스 생성
+        choice_counts = self.choice_category_counts()
+        
+        # 선택한 주제의 출제 문제 수 (체크할 때마다 캐시된 합계로 갱신)
+        selection_label = tk.Label(self.root, font=("맑은 고딕", 11), fg='gray')
+        update_selection = lambda: self.update_selection_label('choice', self.choice_checkbox_vars,
+                                                               selection_label)
         
-        for i, category in enumerate(choice_categories):
+        for i, category in enumerate(choice_counts):
             var = tk.BooleanVar()
             # 이전 설정 복원
             if category in self.config.get('selected_choice_categories', []):
                 var.set(True)
             
-            cb = tk.Checkbutton(checkbox_frame, text=category, 
+            # 출제 대상/전체 선지 수, 정답률 (로드한 적 없는 콘텐츠 팩은 선지 수만)
+            summary = self.category_summary('choice', category)
+            text = f"{category} ({choice_counts[category]})" if summary is None \
+                else f"{category} ({self.summary_text(summary)})"
+            cb = tk.Checkbutton(checkbox_frame, text=text, 
                                variable=var, font=("맑은 고딕", 11),
-                               anchor='w')
+                               anchor='w', command=update_selection)
             cb.pack(anchor='w', padx=20, pady=5)
             self.choice_checkbox_vars[category] = var
         
+        selection_label.pack()
+        update_selection()
+        
         # 버튼 프레임
         btn_frame = tk.Frame(self.root)
         btn_frame.pack(pady=30)
@@ -377,17 +790,34 @@ class QuizApp:
         # 선택된 대분류 가져오기
         selected_choice_categories = [name for name, var in self.choice_checkbox_vars.items() 
                                      if var.get()]
+        query = self.search_var.get().strip()
         
-        if not selected_choice_categories:
-            messagebox.showwarning("경고", "최소 1개 이상 선택해주세요.")
+        if not selected_choice_categories and not query:
+            messagebox.showwarning("경고", "최소 1개 이상 선택하거나 검색어를 입력해주세요.")
             return
         
         # 설정 저장
         self.config['selected_choice_categories'] = selected_choice_categories
+        self.config['choice_search_query'] = query
         self.save_config()
         
-        # 퀴즈 데이터 준비
-        self.prepare_choice_quiz_data(selected_choice_categories)
+        # 검색어만 있으면 전체 주제에서 검색
+        if not selected_choice_categories:
+            selected_choice_categories = list(self.choice_category_counts())
+        
+        # 정답률 필터로 남는 문제가 없으면 선지 로드/목록 생성 없이 바로 알림 (검색어가 있으면 알 수 없음)
+        expected = None if query else self.expected_questions('choice', selected_choice_categories)
+        if expected == 0:
+            messagebox.showinfo("알림", "출제할 문제가 없습니다.")
+            return
+        
+        # 퀴즈 데이터 준비 (콘텐츠 팩 선지는 여기서 로드)
+        self.load_pack_choices(selected_choice_categories)
+        if expected is not None:
+            # 처음 로드한 팩은 매니페스트 선지 수 대신 실제 합계로
+            expected = self.expected_questions('choice', selected_choice_categories)
+        self.start_session_rng()
+        self.prepare_choice_quiz_data(selected_choice_categories, query, expected)
         
         if not self.quiz_data:
             messagebox.showinfo("알림", "출제할 문제가 없습니다.")
@@ -398,73 +828,67 @@ class QuizApp:
         self.correct_count = 0
         self.total_questions = len(self.quiz_data)
         self.user_answers = []  # 답변 기록 초기화
+        self.session_id = new_session_id()
+        self.start_checkpoint()
         self.show_choice_quiz_screen()
     
-    def prepare_choice_quiz_data(self, selected_categories):
-        """선지맞추기 퀴즈 데이터 준비"""
-        all_questions = []
+    def prepare_choice_quiz_data(self, selected_categories, query=None, expected=None):
+        """선지맞추기 퀴즈 데이터 준비 (query가 있으면 검색된 선지만, expected: 합계 캐시의 예상 문제 수)"""
         accuracy_filter = self.config['accuracy_filter']
         
-        for category in selected_categories:
-            if category not in self.choice_data:
-                continue
-            
-            items = self.choice_data[category]
-            if not isinstance(items, dict):
-                continue
-            
-            # 해당 카테고리의 모든 소분류(항목) 이름 = 보기
-            choices = list(items.keys())
-            
-            # 각 소분류의 모든 선지를 문제로 생성
-            for item_name, descriptions in items.items():
-                if not isinstance(descriptions, list):
-                    continue
-                
-                for description in descriptions:
-                    # 통계 키 생성
-                    stats_key = f"{category}|{item_name}|{description}"
-                    
-                    # 정답률 계산
-                    accuracy = 100
-                    if stats_key in self.stats:
-                        stat = self.stats[stats_key]
-                        if stat['total'] > 0:
-                            accuracy = (stat['correct'] / stat['total'] * 100)
-                    
-                    # 정답률 필터링
-                    if accuracy > accuracy_filter:
-                        continue
-                    
-                    all_questions.append({
-                        'category': category,
-                        'question': description,
-                        'answer': item_name,
-                        'choices': choices,
-                        'stats_key': stats_key,
-                        'accuracy': accuracy
-                    })
-        
-        # 먼저 완전히 랜덤 섞기 (모든 문제를 무작위로)
-        random.shuffle(all_questions)
-        print(f"[DEBUG] 초기 랜덤 섞기 후 첫 5문제:")
-        for i, q in enumerate(all_questions[:5]):
-            print(f"  {i+1}. [{q['category']}] {q['answer']}: {q['question'][:30]}... (정답률: {q['accuracy']:.1f}%)")
-        
-        # 오답률 우선보기 옵션 적용
-        if self.config.get('prioritize_wrong_answers', False):
-            # 정답률 낮은 순으로 정렬 (같은 정답률은 위의 랜덤 순서 유지)
-            all_questions.sort(key=lambda x: x['accuracy'])
-            print(f"[DEBUG] 오답률 우선보기 활성화 - 정답률 순 정렬 후 첫 5문제:")
-            for i, q in enumerate(all_questions[:5]):
-                print(f"  {i+1}. [{q['category']}] {q['answer']}: {q['question'][:30]}... (정답률: {q['accuracy']:.1f}%)")
-        else:
-            print(f"[DEBUG] 랜덤 모드 - 섞인 순서 그대로 사용")
+        # 검색어에 해당하는 (카테고리, 항목, 선지)
+        matches = None
+        if query and self.choice_index:
+            with stage('choice.search') as st:
+                matches = set(self.choice_index.search(query, set(selected_categories)))
+                st.items = len(matches)
+        
+        with stage('choice.collect') as st:
+            all_questions = choice_questions(self.choice_data, selected_categories, self.stats,
+                                             accuracy_filter, matches)
+            st.items = len(all_questions)
+        self.check_expected('choice', expected, len(all_questions))
+        
+        with stage('choice.order') as st:
+            # 랜덤으로 섞은 뒤 오답률 우선보기면 정답률 낮은 순 (같은 정답률은 랜덤 순서 유지)
+            prioritize = self.config.get('prioritize_wrong_answers', False)
+            order_questions(all_questions, prioritize, self.rng, self.question_sort_key())
+            if prioritize:
+                logger.debug("선지맞추기 - 오답률 우선보기 활성화 (정답률 순 정렬)")
+            else:
+                logger.debug("선지맞추기 - 랜덤 모드")
+            st.items = len(all_questions)
         
         self.quiz_data = all_questions
-        print(f"[DEBUG] 총 {len(self.quiz_data)}개 문제 준비 완료")
-
+        self.log_first_questions()
+    
+    def check_expected(self, group, expected, actual):
+        """합계 캐시의 예상 문제 수와 실제 문제 수 비교 (다르면 캐시를 처음부터 다시 계산)"""
+        if expected is None or expected == actual:
+            return
+        # 유물찾기는 오답 보기가 부족한 시대를 빼므로 적을 수 있음
+        if group == 'reverse' and actual < expected:
+            return
+        logger.warning("카테고리 합계 불일치 (%s): 예상 %d문제, 실제 %d문제", group, expected, actual)
+        if self.aggregates:
+            self.aggregates.clear()
+            self.sync_aggregates()
+    
+    def log_first_questions(self, count=5):
+        """준비된 문제 앞부분을 디버그 로그로 출력 (DEBUG 레벨일 때만 포맷)"""
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        
+        for i, q in enumerate(self.quiz_data[:count]):
+            if 'question' in q:
+                logger.debug("  %d. [%s] %s: %s... (정답률: %.1f%%)",
+                             i + 1, q['category'], q['answer'], q['question'][:30], q['accuracy'])
+            else:
+                logger.debug("  %d. [%s] %s (정답률: %.1f%%)",
+                             i + 1, q['answer'], q['artifact_name'], q['accuracy'])
+        logger.debug("총 %d개 문제 준비 완료", len(self.quiz_data))
     
+    @traced('show_choice_quiz_screen')
     def show_choice_quiz_screen(self):
         """선지맞추기 퀴즈 화면 표시"""
         # 기존 위젯 제거
@@ -568,7 +992,10 @@ class QuizApp:
                           bg='white', relief='solid', bd=1,
                           wraplength=button_width * 8)  # 글자 길이에 따라 자동 줄바꿈
             btn.grid(row=row, column=col, padx=8, pady=8)
+        
+        self.question_shown_ns = time.perf_counter_ns()
     
+    @traced('check_choice_answer')
     def check_choice_answer(self, user_answer):
         """선지맞추기 정답 체크"""
         if not user_answer:
@@ -577,6 +1004,7 @@ class QuizApp:
         current_data = self.quiz_data[self.current_question]
         correct_answer = current_data['answer']
         stats_key = current_data['stats_key']
+        latency_ms = self.measure_response(stats_key)
         
         # 정답 여부
         is_correct = (user_answer.strip() == correct_answer)
@@ -596,16 +1024,16 @@ class QuizApp:
             })
             
             # 통계 업데이트
-            if stats_key not in self.stats:
-                self.stats[stats_key] = {'total': 0, 'correct': 0}
-            
-            self.stats[stats_key]['total'] += 1
+            self.stats_store.increment(stats_key, is_correct)
             if is_correct:
-                self.stats[stats_key]['correct'] += 1
                 self.correct_count += 1
             
             # 통계 저장
             self.save_stats()
+            self.record_answer(stats_key, current_data['category'], user_answer, is_correct,
+                               latency_ms)
+        
+        self.checkpoint.record_answer(self.current_question, user_answer, is_correct)
         
         # 피드백 표시
         self.show_choice_feedback(is_correct, correct_answer, current_data['question'])
@@ -695,8 +1123,19 @@ class QuizApp:
                     fg='gray').pack(pady=20)
             
             # 클릭 또는 키 입력 대기
-            self.root.bind('<Button-1>', lambda e: self.next_choice_question())
-            self.root.bind('<Key>', lambda e: self.next_choice_question())
+            self.bind_advance(self.next_choice_question)
+    
+    def bind_advance(self, callback):
+        """피드백 화면에서 클릭/키 입력으로 다음 문제"""
+        self.unbind_advance()
+        self.advance_bindings = [(sequence, self.root.bind(sequence, lambda e: callback()))
+                                 for sequence in ('<Button-1>', '<Key>')]
+    
+    def unbind_advance(self):
+        """클릭/키 바인딩 해제 (funcid 없이 unbind하면 Tcl 명령과 람다가 문제마다 쌓임)"""
+        for sequence, funcid in self.advance_bindings:
+            self.root.unbind(sequence, funcid)
+        self.advance_bindings = []
     
     def next_choice_question(self):
         """선지맞추기 다음 문제로"""
@@ -706,8 +1145,7 @@ class QuizApp:
             self.after_id = None
         
         # 이벤트 바인딩 해제
-        self.root.unbind('<Button-1>')
-        self.root.unbind('<Key>')
+        self.unbind_advance()
         
         self.current_question += 1
         
@@ -716,6 +1154,7 @@ class QuizApp:
             self.show_result()
         else:
             # 다음 문제 표시
+            self.checkpoint.record_position(self.current_question)
             self.show_choice_quiz_screen()
     
     def prev_question(self):
@@ -729,14 +1168,16 @@ class QuizApp:
             self.after_id = None
         
         # 이벤트 바인딩 해제
-        self.root.unbind('<Button-1>')
-        self.root.unbind('<Key>')
+        self.unbind_advance()
         
         self.current_question -= 1
+        self.checkpoint.record_position(self.current_question)
         
         # 모드에 따라 적절한 화면 표시
         if self.quiz_mode == 'choice':
             self.show_choice_quiz_screen()
+        elif self.quiz_mode == 'reverse':
+            self.show_reverse_quiz_screen()
         else:
             self.show_quiz_screen()
     
@@ -751,9 +1192,10 @@ class QuizApp:
                 self.after_id = None
             
             # 이벤트 바인딩 해제
-            self.root.unbind('<Button-1>')
-            self.root.unbind('<Key>')
+            self.unbind_advance()
             
+            # 직접 종료한 세션은 이어서 하지 않음
+            self.checkpoint.finish()
             self.show_mode_selection_screen()
     
     def start_artifact_quiz(self):
@@ -769,10 +1211,23 @@ class QuizApp:
         # 설정 저장
         self.config['selected_categories'] = self.selected_categories
         self.config['show_artifact_name'] = self.show_name_var.get()
+        if self.quiz_mode == 'reverse':
+            self.config['reverse_choice_count'] = self.reverse_count_var.get()
         self.save_config()
         
+        # 정답률 필터로 남는 문제가 없으면 목록 생성(유물찾기는 아틀라스 준비) 없이 바로 알림
+        group = 'reverse' if self.quiz_mode == 'reverse' else 'artifact'
+        expected = self.expected_questions(group, self.selected_categories)
+        if expected == 0:
+            messagebox.showinfo("알림", "출제할 문제가 없습니다.")
+            return
+        
         # 퀴즈 데이터 준비
-        self.prepare_quiz_data()
+        self.start_session_rng()
+        if self.quiz_mode == 'reverse':
+            self.prepare_reverse_quiz_data(expected)
+        else:
+            self.prepare_quiz_data(expected)
         
         if not self.quiz_data:
             messagebox.showinfo("알림", "출제할 문제가 없습니다.")
@@ -783,63 +1238,73 @@ class QuizApp:
         self.correct_count = 0
         self.total_questions = len(self.quiz_data)
         self.user_answers = []  # 답변 기록 초기화
-        self.show_quiz_screen()
+        self.session_id = new_session_id()
+        self.start_checkpoint()
+        if self.quiz_mode == 'reverse':
+            self.show_reverse_quiz_screen()
+        else:
+            self.show_quiz_screen()
     
-    def prepare_quiz_data(self):
-        """퀴즈 데이터 준비"""
-        self.quiz_data = []
+    def prepare_quiz_data(self, expected=None):
+        """퀴즈 데이터 준비 (expected: 합계 캐시의 예상 문제 수)"""
         accuracy_filter = self.config['accuracy_filter']
         
-        output_path = Path(self.image_folder_name)
-        
-        for category in self.categories:
-            if category['name'] not in self.selected_categories:
-                continue
-            
-            folder_path = output_path / category['folder']
-            
-            # 이미지 파일 찾기 (png, jpg, jpeg)
-            for img_file in folder_path.glob("*"):
-                if img_file.suffix.lower() in ['.png', '.jpg', '.jpeg']:
-                    img_path = str(img_file)
-                    
-                    # 정답률 계산
-                    accuracy = 100  # 기본값 (통계 없는 경우)
-                    if img_path in self.stats:
-                        stat = self.stats[img_path]
-                        if stat['total'] > 0:
-                            accuracy = (stat['correct'] / stat['total'] * 100)
-                    
-                    # 정답률 필터링
-                    if accuracy > accuracy_filter:
-                        continue
-                    
-                    self.quiz_data.append({
-                        'image': img_path,
-                        'answer': category['name'],
-                        'artifact_name': img_file.name,
-                        'accuracy': accuracy
-                    })
+        with stage('artifact.collect') as st:
+            self.quiz_data = artifact_questions(self.categories, self.selected_categories, self.stats,
+                                                accuracy_filter, self.iter_category_images)
+            st.items = len(self.quiz_data)
+        self.check_expected('artifact', expected, len(self.quiz_data))
+        
+        with stage('artifact.order') as st:
+            # 랜덤으로 섞은 뒤 오답률 우선보기면 정답률 낮은 순 (같은 정답률은 랜덤 순서 유지)
+            prioritize = self.config.get('prioritize_wrong_answers', False)
+            order_questions(self.quiz_data, prioritize, self.rng, self.question_sort_key())
+            if prioritize:
+                logger.debug("유물맞추기 - 오답률 우선보기 활성화 (정답률 순 정렬)")
+            else:
+                logger.debug("유물맞추기 - 랜덤 모드")
+            st.items = len(self.quiz_data)
+        
+        self.log_first_questions()
+
+    def iter_category_images(self, category):
+        """카테고리의 이미지 (통계 키, 표시용 경로, 유물명) 목록 (콘텐츠 팩 이미지 포함)"""
+        yield from self.iter_base_images(category)
+        for pack_name, folder in category.get('packs', []):
+            yield from self.library.images_in(pack_name, folder)
+    
+    def iter_base_images(self, category):
+        """기본 이미지 폴더(또는 에셋 팩)의 카테고리 이미지"""
+        if self.asset_pack:
+            for entry in self.asset_pack.images_in(category['folder']):
+                yield entry['stats_key'], ASSET_PREFIX + entry['stats_key'], entry['name']
+            return
         
-        # 오답률 우선보기 옵션 적용
-        if self.config.get('prioritize_wrong_answers', False):
-            # 먼저 완전히 랜덤 섞기
-            random.shuffle(self.quiz_data)
-            # 그 다음 정답률 낮은 순으로 stable sort (같은 정답률은 랜덤 순서 유지)
-            self.quiz_data.sort(key=lambda x: x['accuracy'])
-            print(f"[DEBUG] 유물맞추기 - 오답률 우선보기 활성화")
-            print(f"[DEBUG] 정답률 순 정렬 (같은 정답률은 랜덤)")
-            for i, q in enumerate(self.quiz_data[:5]):
-                print(f"  {i+1}. [{q['answer']}] {q['artifact_name']} (정답률: {q['accuracy']:.1f}%)")
-        else:
-            # 완전히 랜덤 섞기
-            random.shuffle(self.quiz_data)
-            print(f"[DEBUG] 유물맞추기 - 랜덤 모드")
-            for i, q in enumerate(self.quiz_data[:5]):
-                print(f"  {i+1}. [{q['answer']}] {q['artifact_name']} (정답률: {q['accuracy']:.1f}%)")
+        folder_path = Path(self.image_folder_name) / category['folder']
         
-        print(f"[DEBUG] 총 {len(self.quiz_data)}개 유물 문제 준비 완료")
-
+        # 이미지 파일 찾기 (png, jpg, jpeg, 시드 재현을 위해 이름순)
+        for img_file in sorted(folder_path.glob("*")):
+            if img_file.suffix.lower() in ['.png', '.jpg', '.jpeg']:
+                img_path = str(img_file)
+                
+                # 최적화된 이미지가 있으면 표시용으로 사용 (통계 키는 원본 경로 유지)
+                optimized = self.image_manifest.get(img_file.as_posix())
+                if optimized and Path(optimized).exists():
+                    display_path = str(Path(optimized))
+                else:
+                    display_path = img_path
+                
+                yield img_path, display_path, img_file.name
+    
+    def open_quiz_image(self, image):
+        """퀴즈 이미지 열기 (에셋 팩, 콘텐츠 팩 zip 또는 파일)"""
+        if image.startswith(ASSET_PREFIX) and self.asset_pack:
+            return self.asset_pack.open_image(image[len(ASSET_PREFIX):])
+        if image.startswith(PACK_PREFIX):
+            return self.library.open_image(image)
+        return Image.open(image)
+    
+    @traced('show_quiz_screen')
     def show_quiz_screen(self):
         """퀴즈 화면 표시"""
         # 기존 위젯 제거
@@ -878,14 +1343,15 @@ class QuizApp:
         img_frame.pack_propagate(False)
 
         try:
-            img = Image.open(current_data['image'])
-            
-            # 프레임 크기에 맞게 비율 유지하며 축소
-            max_width = 790
-            max_height = 440
-            
-            img.thumbnail((max_width, max_height), Image.Resampling.LANCZOS)
-            photo = ImageTk.PhotoImage(img)
+            with self.tracer.span('image_load', image=current_data['image']):
+                # 프레임 크기에 맞게 비율 유지하며 축소 (가능하면 축소 디코딩)
+                max_width = 790
+                max_height = 440
+                
+                img, report = load_image(self.open_quiz_image(current_data['image']),
+                                         (max_width, max_height))
+                logger.debug("이미지 로드 %s: %s", current_data['image'], format_report(report))
+                photo = ImageTk.PhotoImage(img)
             
             img_label = tk.Label(img_frame, image=photo, bg='white')
             img_label.image = photo
@@ -908,7 +1374,7 @@ class QuizApp:
             artifact_label.pack()
         
         # 정답률 표시
-        img_path = current_data['image']
+        img_path = current_data['stats_key']
         if img_path in self.stats:
             stat = self.stats[img_path]
             total = stat['total']
@@ -954,7 +1420,10 @@ class QuizApp:
                         width=10, height=2,
                         bg='white', relief='solid', bd=1)
             btn.grid(row=row, column=col, padx=8, pady=8)
+        
+        self.question_shown_ns = time.perf_counter_ns()
     
+    @traced('check_answer')
     def check_answer(self, user_answer):
         """정답 체크"""
         if not user_answer:
@@ -963,7 +1432,8 @@ class QuizApp:
         current_data = self.quiz_data[self.current_question]
         correct_answer = current_data['answer']
         artifact_name = current_data['artifact_name']
-        img_path = current_data['image']
+        img_path = current_data['stats_key']
+        latency_ms = self.measure_response(img_path)
         
         # 정답 여부
         is_correct = (user_answer.strip() == correct_answer)
@@ -983,16 +1453,15 @@ class QuizApp:
             })
             
             # 통계 업데이트
-            if img_path not in self.stats:
-                self.stats[img_path] = {'total': 0, 'correct': 0}
-            
-            self.stats[img_path]['total'] += 1
+            self.stats_store.increment(img_path, is_correct)
             if is_correct:
-                self.stats[img_path]['correct'] += 1
                 self.correct_count += 1
             
             # 통계 저장
             self.save_stats()
+            self.record_answer(img_path, correct_answer, user_answer, is_correct, latency_ms)
+        
+        self.checkpoint.record_answer(self.current_question, user_answer, is_correct)
         
         # 피드백 표시
         self.show_feedback(is_correct, correct_answer, artifact_name)
@@ -1050,7 +1519,7 @@ class QuizApp:
         
         # 통계 정보 표시
         current_data = self.quiz_data[self.current_question]
-        img_path = current_data['image']
+        img_path = current_data['stats_key']
         
         if img_path in self.stats:
             stat = self.stats[img_path]
@@ -1077,8 +1546,7 @@ class QuizApp:
                     fg='gray').pack(pady=20)
             
             # 클릭 또는 키 입력 대기
-            self.root.bind('<Button-1>', lambda e: self.next_question())
-            self.root.bind('<Key>', lambda e: self.next_question())
+            self.bind_advance(self.next_question)
             
     def next_question(self):
         """다음 문제로"""
@@ -1088,8 +1556,7 @@ class QuizApp:
             self.after_id = None
         
         # 이벤트 바인딩 해제
-        self.root.unbind('<Button-1>')
-        self.root.unbind('<Key>')
+        self.unbind_advance()
         
         self.current_question += 1
         
@@ -1098,10 +1565,329 @@ class QuizApp:
             self.show_result()
         else:
             # 다음 문제 표시
-            self.show_quiz_screen()
+            self.checkpoint.record_position(self.current_question)
+            if self.quiz_mode == 'reverse':
+                self.show_reverse_quiz_screen()
+            else:
+                self.show_quiz_screen()
+    
+    def category_atlas_images(self, category):
+        """아틀라스 생성용 이미지 목록 [(통계 키, 유물명, 이미지 원본, 스탬프)]"""
+        images = []
+        for stats_key, display_ref, artifact_name in self.iter_category_images(category):
+            if display_ref.startswith(ASSET_PREFIX) and self.asset_pack:
+                # 팩 안의 바이트 (생성이 필요할 때만 디코딩)
+                source = self.asset_pack.read(stats_key)
+                stamp = self.asset_pack.stamp(stats_key)
+            elif display_ref.startswith(PACK_PREFIX):
+                source = self.library.read(display_ref)
+                stamp = self.library.stamp(display_ref)
+            else:
+                source = display_ref
+                stamp = file_stamp(display_ref)
+            images.append((stats_key, artifact_name, source, stamp))
+        return images
+    
+    def ensure_atlases(self, categories):
+        """카테고리별 썸네일 아틀라스 준비 (바뀐 시대만 다시 생성)"""
+        if self.atlases is None:
+            self.atlases = AtlasStore()
+        
+        built = False
+        for category in categories:
+            if self.atlases.ensure(category['folder'], self.category_atlas_images(category)):
+                logger.info("아틀라스 생성: %s", category['folder'])
+                built = True
+        
+        if built:
+            try:
+                self.atlases.save_index()
+            except OSError as e:
+                logger.error("아틀라스 인덱스 저장 실패: %s", e)
+    
+    def prepare_reverse_quiz_data(self, expected=None):
+        """유물찾기(시대 → 유물) 퀴즈 데이터 준비 (보기 구성까지 미리 결정, expected: 예상 문제 수)"""
+        self.quiz_data = []
+        accuracy_filter = self.config['accuracy_filter']
+        option_count = max(4, min(9, self.config.get('reverse_choice_count', 6)))
+        
+        selected = [c for c in self.categories if c['name'] in self.selected_categories]
+        # 오답 보기는 다른 선택 시대에서 (한 시대만 골랐으면 전체 시대에서)
+        distractor_categories = selected if len(selected) > 1 else self.categories
+        
+        with stage('reverse.atlas') as st:
+            needed = {c['folder']: c for c in selected + distractor_categories}
+            self.ensure_atlases(needed.values())
+            entries = {folder: list(self.atlases.entries(folder).values()) for folder in needed}
+            st.items = sum(len(items) for items in entries.values())
+        
+        with stage('reverse.collect') as st:
+            for category in selected:
+                others = [{'stats_key': item['stats_key'], 'folder': other['folder'],
+                           'era': other['name'], 'name': item['name']}
+                          for other in distractor_categories if other['folder'] != category['folder']
+                          for item in entries[other['folder']]]
+                if len(others) < 3:
+                    logger.warning("유물찾기 - 오답 보기가 부족합니다: %s", category['name'])
+                    continue
+                
+                for item in entries[category['folder']]:
+                    stats_key = REVERSE_PREFIX + item['stats_key']
+                    
+                    # 정답률 필터링
+                    accuracy = accuracy_of(self.stats, stats_key)
+                    if accuracy > accuracy_filter:
+                        continue
+                    
+                    options = self.rng.sample(others, min(option_count - 1, len(others)))
+                    options.append({'stats_key': item['stats_key'], 'folder': category['folder'],
+                                    'era': category['name'], 'name': item['name']})
+                    self.rng.shuffle(options)
+                    
+                    self.quiz_data.append({
+                        'stats_key': stats_key,
+                        'answer': category['name'],
+                        'artifact_name': item['name'],
+                        'options': options,
+                        'accuracy': accuracy
+                    })
+            st.items = len(self.quiz_data)
+        self.check_expected('reverse', expected, len(self.quiz_data))
+        
+        with stage('reverse.order') as st:
+            prioritize = self.config.get('prioritize_wrong_answers', False)
+            order_questions(self.quiz_data, prioritize, self.rng, self.question_sort_key())
+            if prioritize:
+                logger.debug("유물찾기 - 오답률 우선보기 활성화 (정답률 순 정렬)")
+            else:
+                logger.debug("유물찾기 - 랜덤 모드")
+            st.items = len(self.quiz_data)
+        
+        self.log_first_questions()
+    
+    def option_photo(self, option):
+        """보기 썸네일 (아틀라스에서 잘라냄, 없으면 None)"""
+        if self.atlases is None:
+            # 이어서 하기로 바로 들어온 경우 (저장된 인덱스 사용)
+            self.atlases = AtlasStore()
+        try:
+            return ImageTk.PhotoImage(self.atlases.thumbnail(option['folder'], option['stats_key']))
+        except Exception as e:
+            logger.warning("썸네일 로드 실패 %s: %s", option['stats_key'], e)
+            return None
+    
+    @traced('show_reverse_quiz_screen')
+    def show_reverse_quiz_screen(self):
+        """유물찾기 퀴즈 화면 표시 (시대를 보고 해당 유물 고르기)"""
+        # 기존 위젯 제거
+        for widget in self.root.winfo_children():
+            widget.destroy()
+        
+        # 창 제목 업데이트
+        self.root.title(f"{self.current_question + 1}/{self.total_questions}")
+        
+        # 네비게이션 버튼 프레임
+        nav_frame = tk.Frame(self.root)
+        nav_frame.pack(pady=10, fill='x', padx=20)
+        
+        # 이전 버튼
+        prev_btn = tk.Button(nav_frame, text="← 이전", 
+                            command=self.prev_question,
+                            font=("맑은 고딕", 10),
+                            bg="#9E9E9E", fg="white",
+                            padx=15, pady=5,
+                            state='normal' if self.current_question > 0 else 'disabled')
+        prev_btn.pack(side='left')
+        
+        # 종료 버튼
+        exit_btn = tk.Button(nav_frame, text="종료",
+                            command=self.confirm_exit_to_home,
+                            font=("맑은 고딕", 10),
+                            bg="#f44336", fg="white",
+                            padx=15, pady=5)
+        exit_btn.pack(side='right')
+        
+        current_data = self.quiz_data[self.current_question]
+        
+        # 정답률 표시
+        stats_key = current_data['stats_key']
+        if stats_key in self.stats:
+            stat = self.stats[stats_key]
+            total = stat['total']
+            correct_count = stat['correct']
+            accuracy = current_data['accuracy']
+            
+            stats_text = f"📊 누적 정답률: {accuracy:.1f}% ({correct_count}/{total}회)"
+            color = 'green' if accuracy >= 70 else 'orange' if accuracy >= 40 else 'red'
+            
+            tk.Label(self.root, text=stats_text,
+                    font=("맑은 고딕", 11),
+                    fg=color).pack(pady=5)
+        else:
+            tk.Label(self.root, text="📊 첫 도전!",
+                    font=("맑은 고딕", 11),
+                    fg='gray').pack(pady=5)
+        
+        # 질문
+        tk.Label(self.root, text=f"다음 중 '{current_data['answer']}' 시대의 유물은?",
+                font=("맑은 고딕", 16, "bold")).pack(pady=20)
+        
+        # 썸네일 보기 (4개면 2열, 그 이상은 3열)
+        buttons_frame = tk.Frame(self.root)
+        buttons_frame.pack(pady=10)
+        
+        options = current_data['options']
+        columns = 2 if len(options) <= 4 else 3
+        show_name = self.config.get('show_artifact_name', True)
+        
+        for i, option in enumerate(options):
+            photo = self.option_photo(option)
+            btn = tk.Button(buttons_frame,
+                           text=option['name'] if show_name or photo is None else '',
+                           image=photo or '', compound='top',
+                           command=lambda index=i: self.check_reverse_answer(index),
+                           font=("맑은 고딕", 9),
+                           wraplength=180,
+                           bg='white', relief='solid', bd=1)
+            btn.image = photo
+            btn.grid(row=i // columns, column=i % columns, padx=6, pady=6)
+        
+        self.question_shown_ns = time.perf_counter_ns()
+    
+    @traced('check_reverse_answer')
+    def check_reverse_answer(self, option_index):
+        """유물찾기 정답 체크 (선택한 유물의 시대로 판정)"""
+        current_data = self.quiz_data[self.current_question]
+        chosen = current_data['options'][option_index]
+        user_answer = chosen['era']
+        correct_answer = current_data['answer']
+        stats_key = current_data['stats_key']
+        latency_ms = self.measure_response(stats_key)
+        
+        # 오답 보기는 모두 다른 시대이므로 시대가 같으면 정답
+        is_correct = (user_answer == correct_answer)
+        
+        # 답변 기록 저장
+        if self.current_question < len(self.user_answers):
+            # 이미 답변한 문제 (이전 버튼으로 돌아온 경우) - 통계 업데이트 안함
+            self.user_answers[self.current_question] = {
+                'answer': user_answer,
+                'is_correct': is_correct
+            }
+        else:
+            # 새로운 문제 - 통계 업데이트
+            self.user_answers.append({
+                'answer': user_answer,
+                'is_correct': is_correct
+            })
+            
+            self.stats_store.increment(stats_key, is_correct)
+            if is_correct:
+                self.correct_count += 1
+            
+            # 통계 저장
+            self.save_stats()
+            self.record_answer(stats_key, correct_answer, user_answer, is_correct, latency_ms)
+        
+        self.checkpoint.record_answer(self.current_question, user_answer, is_correct)
+        
+        # 피드백 표시
+        self.show_reverse_feedback(is_correct, chosen)
+    
+    def show_reverse_feedback(self, is_correct, chosen):
+        """유물찾기 피드백 표시 (정답 유물과 선택한 유물)"""
+        # 기존 위젯 제거
+        for widget in self.root.winfo_children():
+            widget.destroy()
+        
+        self.root.title(f"{self.current_question + 1}/{self.total_questions}")
+        
+        # 네비게이션 버튼 프레임
+        nav_frame = tk.Frame(self.root)
+        nav_frame.pack(pady=10, fill='x', padx=20)
+        
+        # 이전 버튼
+        prev_btn = tk.Button(nav_frame, text="← 이전", 
+                            command=self.prev_question,
+                            font=("맑은 고딕", 10),
+                            bg="#9E9E9E", fg="white",
+                            padx=15, pady=5,
+                            state='normal' if self.current_question > 0 else 'disabled')
+        prev_btn.pack(side='left')
+        
+        # 종료 버튼
+        exit_btn = tk.Button(nav_frame, text="종료",
+                            command=self.confirm_exit_to_home,
+                            font=("맑은 고딕", 10),
+                            bg="#f44336", fg="white",
+                            padx=15, pady=5)
+        exit_btn.pack(side='right')
+        
+        # 결과 프레임
+        result_frame = tk.Frame(self.root)
+        result_frame.pack(expand=True)
+        
+        current_data = self.quiz_data[self.current_question]
+        answer_option = next(option for option in current_data['options']
+                             if option['era'] == current_data['answer'])
+        
+        if is_correct:
+            tk.Label(result_frame, text="✓ 정답!",
+                    font=("맑은 고딕", 24, "bold"),
+                    fg='green').pack(pady=20)
+            shown = [(answer_option, "정답")]
+        else:
+            tk.Label(result_frame, text="✗ 오답",
+                    font=("맑은 고딕", 24, "bold"),
+                    fg='red').pack(pady=20)
+            shown = [(answer_option, "정답"), (chosen, "선택")]
+        
+        # 정답 유물 (오답이면 선택한 유물도 함께)
+        thumbs_frame = tk.Frame(result_frame)
+        thumbs_frame.pack(pady=10)
+        for i, (option, label) in enumerate(shown):
+            photo = self.option_photo(option)
+            thumb = tk.Label(thumbs_frame, image=photo or '',
+                            text=f"{label}: {option['name']}\n({option['era']})",
+                            compound='top', wraplength=200,
+                            font=("맑은 고딕", 11),
+                            fg='blue' if label == "정답" else 'gray')
+            thumb.image = photo
+            thumb.grid(row=0, column=i, padx=15)
+        
+        # 통계 정보 표시
+        stats_key = current_data['stats_key']
+        if stats_key in self.stats:
+            stat = self.stats[stats_key]
+            total = stat['total']
+            correct_count = stat['correct']
+            accuracy = (correct_count / total * 100) if total > 0 else 0
+            
+            stats_text = f"이 문제 통계: {correct_count}/{total}회 정답 (정답률 {accuracy:.1f}%)"
+            tk.Label(result_frame, text=stats_text,
+                    font=("맑은 고딕", 12),
+                    fg='gray').pack(pady=10)
+        
+        # 자동 넘기기 설정 확인
+        auto_delay = self.config.get('auto_next_delay', 1.5)
+        
+        if auto_delay > 0:
+            # 자동 넘김
+            delay_ms = int(auto_delay * 1000)
+            self.after_id = self.root.after(delay_ms, self.next_question)
+        else:
+            # 수동 넘김 (클릭 대기)
+            tk.Label(result_frame, text="[클릭하여 계속]",
+                    font=("맑은 고딕", 12),
+                    fg='gray').pack(pady=20)
+            
+            # 클릭 또는 키 입력 대기
+            self.bind_advance(self.next_question)
     
     def show_result(self):
         """결과 화면"""
+        self.checkpoint.finish()
+        
         # 기존 위젯 제거
         for widget in self.root.winfo_children():
             widget.destroy()
@@ -1138,12 +1924,114 @@ class QuizApp:
                  bg="#4CAF50", fg="white",
                  padx=20, pady=10).pack(side='left', padx=10)
         
+        if self.history:
+            tk.Button(btn_frame, text="학습 기록",
+                     command=self.show_history_screen,
+                     font=("맑은 고딕", 12),
+                     bg="#2196F3", fg="white",
+                     padx=20, pady=10).pack(side='left', padx=10)
+        
         tk.Button(btn_frame, text="종료",
             command=self.on_closing,
             font=("맑은 고딕", 12),
             bg="#f44336", fg="white",
             padx=20, pady=10).pack(side='left', padx=10)
     
+    def show_history_screen(self, days=30):
+        """학습 기록 화면 (집계 테이블 기반)"""
+        # 기존 위젯 제거
+        for widget in self.root.winfo_children():
+            widget.destroy()
+        
+        self.root.title("학습 기록")
+        
+        tk.Label(self.root, text=f"최근 {days}일 학습 기록",
+                font=("맑은 고딕", 20, "bold")).pack(pady=20)
+        
+        # 이번 세션 요약
+        if self.session_id:
+            total, correct, latency = self.history.session_summary(self.session_id)
+            if total > 0:
+                tk.Label(self.root,
+                        text=f"이번 학습: {correct}/{total} 정답, 평균 {latency / 1000:.1f}초",
+                        font=("맑은 고딕", 12), fg='gray').pack(pady=5)
+        
+        # 시대/주제별 정답률 (이 모드만)
+        tk.Label(self.root, text="카테고리별 정답률 (낮은 순)",
+                font=("맑은 고딕", 14, "bold")).pack(pady=(20, 10))
+        
+        category_frame = tk.Frame(self.root)
+        category_frame.pack(pady=5)
+        
+        rows = self.history.accuracy_by_category(days, self.quiz_mode)
+        if not rows:
+            tk.Label(category_frame, text="기록이 없습니다.",
+                    font=("맑은 고딕", 11), fg='gray').pack()
+        
+        for i, (category, total, correct, latency) in enumerate(rows):
+            accuracy = correct / total * 100
+            color = 'green' if accuracy >= 70 else 'orange' if accuracy >= 40 else 'red'
+            tk.Label(category_frame, text=category,
+                    font=("맑은 고딕", 11), anchor='w', width=18).grid(row=i, column=0, sticky='w')
+            tk.Label(category_frame, text=f"{accuracy:.1f}% ({correct}/{total})",
+                    font=("맑은 고딕", 11), fg=color).grid(row=i, column=1, padx=10)
+            tk.Label(category_frame, text=f"평균 {latency / 1000:.1f}초",
+                    font=("맑은 고딕", 11), fg='gray').grid(row=i, column=2, padx=10)
+        
+        # 응답 시간 분포
+        tk.Label(self.root, text="응답 시간 분포",
+                font=("맑은 고딕", 14, "bold")).pack(pady=(20, 10))
+        
+        latency_frame = tk.Frame(self.root)
+        latency_frame.pack(pady=5)
+        
+        distribution = self.history.latency_distribution(self.quiz_mode)
+        max_count = max((count for _, count in distribution), default=0)
+        for i, (bucket, count) in enumerate(distribution):
+            bar = '█' * max(1, round(count / max_count * 30))
+            tk.Label(latency_frame, text=bucket_label(bucket),
+                    font=("맑은 고딕", 10), anchor='w', width=12).grid(row=i, column=0, sticky='w')
+            tk.Label(latency_frame, text=f"{bar} {count}",
+                    font=("맑은 고딕", 10), fg='#2196F3', anchor='w').grid(row=i, column=1, sticky='w')
+        
+        # 돌아가기 버튼
+        tk.Button(self.root, text="← 뒤로",
+                 command=self.show_result,
+                 font=("맑은 고딕", 12),
+                 bg="#9E9E9E", fg="white",
+                 padx=20, pady=10).pack(pady=30)
+    
+    def show_diagnostics_panel(self):
+        """진단 패널 (준비 단계 통계 및 최근 로그)"""
+        panel = tk.Toplevel(self.root)
+        panel.title("진단")
+        panel.geometry("800x500")
+        
+        text = tk.Text(panel, font=("Consolas", 10), wrap='none')
+        scrollbar = tk.Scrollbar(panel, command=text.yview)
+        text.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side='right', fill='y')
+        text.pack(fill='both', expand=True)
+        
+        if self.session_seed is not None:
+            text.insert('end', f"[세션] {self.session_id} (시드 {self.session_seed})\n\n")
+        
+        text.insert('end', "[준비 단계]\n")
+        for line in metrics.lines():
+            text.insert('end', f"  {line}\n")
+        
+        if self.memory_probe:
+            text.insert('end', "\n[메모리]\n")
+            for line in self.memory_probe.lines():
+                text.insert('end', f"  {line}\n")
+        
+        text.insert('end', f"\n[최근 로그] (레벨: {logging.getLevelName(logger.level)})\n")
+        for line in panel_handler.lines():
+            text.insert('end', f"{line}\n")
+        
+        text.see('end')
+        text.configure(state='disabled')
+    
     def run(self):
         """프로그램 실행"""
         self.root.mainloop()
@@ -0,0 +1,153 @@
+import random
+from pathlib import Path
+
+# 화면(Tk, curses)과 무관한 문제 준비 로직. PIL/Tk를 import하지 않음 (터미널 실행 속도)
+
+IMAGE_FOLDER = 'legacy_images'
+CHOICES_FILE = 'choices.yaml'
+IMAGE_SUFFIXES = ('.png', '.jpg', '.jpeg')
+
+
+def folder_order(folder):
+    """'1.구석기' 형태의 폴더명을 번호 순으로 정렬하기 위한 키"""
+    prefix = folder.name.split('.')[0]
+    if '.' in folder.name and prefix.isdigit():
+        return int(prefix)
+    return 999
+
+
+def category_name(folder_name):
+    """폴더명에서 카테고리 이름 추출 ('1.구석기' → '구석기')"""
+    if '.' in folder_name:
+        return folder_name.split('.', 1)[1]
+    return folder_name
+
+
+def load_categories(image_folder=IMAGE_FOLDER):
+    """이미지 폴더의 시대 카테고리 [{'folder', 'name'}] (번호 순, 폴더가 없으면 빈 목록)"""
+    path = Path(image_folder)
+    if not path.exists():
+        return []
+    return [{'folder': folder.name, 'name': category_name(folder.name)}
+            for folder in sorted(path.iterdir(), key=folder_order) if folder.is_dir()]
+
+
+def folder_images(image_folder, category):
+    """카테고리 폴더의 이미지 (통계 키, 유물명) 목록"""
+    folder_path = Path(image_folder) / category['folder']
+    # 파일 시스템 나열 순서와 무관하게 (같은 시드면 같은 출제 순서)
+    for img_file in sorted(folder_path.glob("*")):
+        if img_file.suffix.lower() in IMAGE_SUFFIXES:
+            yield str(img_file), img_file.name
+
+
+def load_choice_data(path=CHOICES_FILE):
+    """선지 YAML 로드 (libyaml이 있으면 C 로더 사용)"""
+    import yaml
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=loader) or {}
+
+
+def count_choices(items):
+    """카테고리의 선지 수"""
+    if not isinstance(items, dict):
+        return 0
+    return sum(len(d) for d in items.values() if isinstance(d, list))
+
+
+def choice_keys(category, items):
+    """카테고리의 선지 통계 키 ('카테고리|항목|선지', 문제 목록과 같은 순서)"""
+    if not isinstance(items, dict):
+        return
+    for item_name, descriptions in items.items():
+        if isinstance(descriptions, list):
+            for description in descriptions:
+                yield f"{category}|{item_name}|{description}"
+
+
+def accuracy_of(stats, stats_key):
+    """누적 정답률 (%) (통계 없으면 100)"""
+    stat = stats.get(stats_key)
+    if stat and stat['total'] > 0:
+        return stat['correct'] / stat['total'] * 100
+    return 100
+
+
+def artifact_questions(categories, selected_categories, stats, accuracy_filter, iter_images):
+    """유물맞추기 문제 목록. iter_images(category)는 (통계 키, 표시용 경로, 유물명)을 돌려줌"""
+    questions = []
+    for category in categories:
+        if category['name'] not in selected_categories:
+            continue
+
+        for stats_key, display_path, artifact_name in iter_images(category):
+            # 정답률 필터링
+            accuracy = accuracy_of(stats, stats_key)
+            if accuracy > accuracy_filter:
+                continue
+
+            questions.append({
+                'image': display_path,
+                'stats_key': stats_key,
+                'answer': category['name'],
+                'artifact_name': artifact_name,
+                'accuracy': accuracy
+            })
+    return questions
+
+
+def choice_questions(choice_data, selected_categories, stats, accuracy_filter, matches=None):
+    """선지맞추기 문제 목록 (matches가 있으면 그 (카테고리, 항목, 선지)만)"""
+    questions = []
+    for category in selected_categories:
+        items = choice_data.get(category)
+        if not isinstance(items, dict):
+            continue
+
+        # 해당 카테고리의 모든 소분류(항목) 이름 = 보기
+        choices = list(items.keys())
+
+        # 각 소분류의 모든 선지를 문제로 생성
+        for item_name, descriptions in items.items():
+            if not isinstance(descriptions, list):
+                continue
+
+            for description in descriptions:
+                if matches is not None and (category, item_name, str(description)) not in matches:
+                    continue
+
+                stats_key = f"{category}|{item_name}|{description}"
+
+                # 정답률 필터링
+                accuracy = accuracy_of(stats, stats_key)
+                if accuracy > accuracy_filter:
+                    continue
+
+                questions.append({
+                    'category': category,
+                    'question': description,
+                    'answer': item_name,
+                    'choices': choices,
+                    'stats_key': stats_key,
+                    'accuracy': accuracy
+                })
+    return questions
+
+
+def new_seed():
+    """세션 시드 (기록해 두면 같은 출제 순서를 재현할 수 있음)"""
+    return random.SystemRandom().randrange(2 ** 32)
+
+
+def session_rng(seed=None):
+    """세션 전용 난수 생성기 (전역 random 상태와 분리)"""
+    return random.Random(new_seed() if seed is None else seed)
+
+
+def order_questions(questions, prioritize_wrong=False, rng=random, sort_key=None):
+    """무작위로 섞은 뒤, 오답률 우선이면 정답률(또는 sort_key) 낮은 순 stable sort (제자리 정렬)"""
+    rng.shuffle(questions)
+    if prioritize_wrong:
+        questions.sort(key=sort_key or (lambda q: q['accuracy']))
+    return questions
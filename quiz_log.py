@@ -0,0 +1,110 @@
+import sys
+import time
+import logging
+from collections import deque
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+
+LOGGER_NAME = 'quiz'
+LOG_FILE = 'quiz.log'
+LOG_FORMAT = '%(asctime)s %(levelname)s %(name)s: %(message)s'
+
+logger = logging.getLogger(LOGGER_NAME)
+
+
+class PanelHandler(logging.Handler):
+    """진단 패널에 보여줄 최근 로그를 메모리에 보관하는 핸들러"""
+
+    def __init__(self, capacity=500):
+        super().__init__()
+        self.records = deque(maxlen=capacity)
+
+    def emit(self, record):
+        # 포맷은 패널을 열 때 수행 (기록 시점에는 레코드만 보관)
+        self.records.append(record)
+
+    def lines(self):
+        """보관 중인 로그를 포맷된 문자열로"""
+        return [self.format(record) for record in self.records]
+
+
+class StageMetrics:
+    """준비 단계별 실행 횟수, 처리 항목 수, 소요 시간"""
+
+    def __init__(self):
+        self.stages = {}
+
+    def add(self, name, items, elapsed_ms):
+        """단계 실행 결과 한 건 누적"""
+        stage = self.stages.setdefault(name, {
+            'count': 0, 'items': 0, 'total_ms': 0.0, 'last_ms': 0.0, 'last_items': 0})
+        stage['count'] += 1
+        stage['items'] += items
+        stage['total_ms'] += elapsed_ms
+        stage['last_ms'] = elapsed_ms
+        stage['last_items'] = items
+
+    def lines(self):
+        """단계별 요약 문자열"""
+        return [f"{name}: {s['count']}회, 최근 {s['last_items']}개 / {s['last_ms']:.1f}ms, "
+                f"평균 {s['total_ms'] / s['count']:.1f}ms"
+                for name, s in self.stages.items()]
+
+
+class _Stage:
+    """stage() 블록 안에서 처리 항목 수를 기록하는 객체"""
+
+    def __init__(self):
+        self.items = 0
+
+
+panel_handler = PanelHandler()
+metrics = StageMetrics()
+
+
+def setup_logging(config):
+    """quiz_config.json 설정으로 로거 구성 (log_level, log_file)"""
+    level = getattr(logging, str(config.get('log_level', 'WARNING')).upper(), logging.WARNING)
+    logger.setLevel(level)
+    logger.propagate = False
+
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        if handler is not panel_handler:
+            handler.close()
+
+    formatter = logging.Formatter(LOG_FORMAT)
+
+    panel_handler.setFormatter(formatter)
+    logger.addHandler(panel_handler)
+
+    log_file = config.get('log_file', LOG_FILE)
+    if log_file:
+        try:
+            file_handler = RotatingFileHandler(log_file, maxBytes=1024 * 1024,
+                                               backupCount=3, encoding='utf-8')
+            file_handler.setFormatter(formatter)
+            logger.addHandler(file_handler)
+        except OSError as e:
+            logger.warning("로그 파일을 열 수 없습니다: %s", e)
+
+    # 창 모드(PyInstaller --windowed) 빌드에서는 stderr가 없음
+    if sys.stderr is not None:
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(formatter)
+        logger.addHandler(stream_handler)
+
+    return logger
+
+
+@contextmanager
+def stage(name):
+    """준비 단계 소요 시간과 처리 항목 수 기록"""
+    current = _Stage()
+    start = time.perf_counter()
+    try:
+        yield current
+    finally:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        metrics.add(name, current.items, elapsed_ms)
+        logger.info("%s: %d개, %.1fms", name, current.items, elapsed_ms)
@@ -0,0 +1,441 @@
+import sys
+import json
+import time
+import argparse
+import unicodedata
+from pathlib import Path
+
+from quiz_core import (IMAGE_FOLDER, CHOICES_FILE, load_categories, folder_images, load_choice_data,
+                       artifact_questions, choice_questions, order_questions, new_seed, session_rng)
+from stats_store import STATS_FILE, StatsStore
+
+CONFIG_FILE = 'quiz_config.json'
+
+MODES = [('artifact', "유물맞추기 (유물명만 표시)"), ('choice', "선지맞추기")]
+
+
+def text_width(text):
+    """터미널 표시 폭 (한글 등 전각 문자는 2칸)"""
+    return sum(2 if unicodedata.east_asian_width(ch) in 'WF' else 1 for ch in text)
+
+
+def clip(text, width):
+    """표시 폭 기준으로 자르기"""
+    result, used = [], 0
+    for ch in text:
+        w = 2 if unicodedata.east_asian_width(ch) in 'WF' else 1
+        if used + w > width:
+            break
+        result.append(ch)
+        used += w
+    return ''.join(result)
+
+
+def wrap(text, width):
+    """표시 폭 기준 줄바꿈 (공백 우선, 긴 단어는 강제로 자름)"""
+    lines = []
+    for paragraph in str(text).split('\n'):
+        line = ''
+        for word in paragraph.split(' '):
+            candidate = f"{line} {word}" if line else word
+            if text_width(candidate) <= width:
+                line = candidate
+                continue
+            if line:
+                lines.append(line)
+            while text_width(word) > width:
+                head = clip(word, width)
+                lines.append(head)
+                word = word[len(head):]
+            line = word
+        lines.append(line)
+    return lines
+
+
+def load_config(config_file=CONFIG_FILE):
+    """GUI와 같은 설정 파일 사용"""
+    if Path(config_file).exists():
+        with open(config_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+
+def save_config(config, config_file=CONFIG_FILE):
+    """설정 저장"""
+    with open(config_file, 'w', encoding='utf-8') as f:
+        json.dump(config, f, ensure_ascii=False, indent=2)
+
+
+class TerminalQuiz:
+    """터미널 퀴즈 진행 상태 (QuizApp과 같은 문제 준비, 통계, 학습 기록 사용)"""
+
+    def __init__(self, config=None, stats_file=STATS_FILE, seed=None):
+        self.config = config if config is not None else load_config()
+        # 출제 순서 시드 (None이면 설정의 random_seed, 그것도 없으면 매번 새로)
+        self.fixed_seed = seed
+        # 통계는 첫 화면을 띄운 뒤 문제를 준비할 때 로드
+        self.stats_file = stats_file
+        self.stats_store = None
+        self.stats = {}
+        self.mode = None
+        self.categories = []
+        self.choice_data = {}
+        self.selected = []
+        self.questions = []
+        self.current = 0
+        self.correct_count = 0
+        self.history = None
+        self.session_id = None
+        self.seed = None
+        self.shown_at = None
+
+    def category_names(self, mode):
+        """모드별 선택 가능한 카테고리 이름 (처음 필요할 때 로드)"""
+        if mode == 'artifact':
+            if not self.categories:
+                self.categories = load_categories(IMAGE_FOLDER)
+            return [category['name'] for category in self.categories]
+
+        if not self.choice_data and Path(CHOICES_FILE).exists():
+            self.choice_data = load_choice_data(CHOICES_FILE)
+        return list(self.choice_data.keys())
+
+    def saved_selection(self, mode):
+        """이전에 선택한 카테고리 (GUI 설정과 공유)"""
+        key = 'selected_categories' if mode == 'artifact' else 'selected_choice_categories'
+        return self.config.get(key, [])
+
+    def start(self, mode, selected):
+        """문제 준비 (문제 수 반환)"""
+        self.mode = mode
+        self.selected = selected
+        if self.stats_store is None:
+            self.stats_store = StatsStore(self.stats_file)
+            self.stats = self.stats_store.totals
+        accuracy_filter = self.config.get('accuracy_filter', 100)
+
+        if mode == 'artifact':
+            self.config['selected_categories'] = selected
+            self.questions = artifact_questions(
+                self.categories, selected, self.stats, accuracy_filter,
+                lambda category: ((key, key, name) for key, name in folder_images(IMAGE_FOLDER, category)))
+        else:
+            self.config['selected_choice_categories'] = selected
+            self.questions = choice_questions(self.choice_data, selected, self.stats, accuracy_filter)
+
+        self.config['quiz_mode'] = mode
+        try:
+            save_config(self.config)
+        except OSError as e:
+            print(f"설정 저장 실패: {e}", file=sys.stderr)
+
+        # 시드가 같으면 같은 출제 순서 (quiz_config.json의 random_seed 또는 --seed)
+        seed = self.fixed_seed if self.fixed_seed is not None else self.config.get('random_seed')
+        self.seed = new_seed() if seed is None else seed
+        order_questions(self.questions, self.config.get('prioritize_wrong_answers', False),
+                        session_rng(self.seed))
+        self.current = 0
+        self.correct_count = 0
+
+        from history import HistoryStore, new_session_id
+        self.session_id = new_session_id()
+        try:
+            self.history = HistoryStore()
+        except Exception as e:
+            print(f"학습 기록 DB 로드 실패: {e}", file=sys.stderr)
+        return len(self.questions)
+
+    @property
+    def question(self):
+        return self.questions[self.current]
+
+    def prompt(self):
+        """현재 문제 (분류, 본문)"""
+        q = self.question
+        if self.mode == 'artifact':
+            return "이 유물의 시대는?", f"유물명: {Path(q['artifact_name']).stem}"
+        return q['category'], str(q['question'])
+
+    def options(self):
+        """현재 문제의 보기"""
+        if self.mode == 'artifact':
+            # 초기 UI 순서대로
+            return [category['name'] for category in self.categories
+                    if category['name'] in self.selected]
+        return self.question['choices']
+
+    def stat_line(self):
+        """현재 문제의 누적 정답률"""
+        stat = self.stats.get(self.question['stats_key'])
+        if not stat:
+            return "첫 도전!"
+        return f"누적 정답률: {self.question['accuracy']:.1f}% ({stat['correct']}/{stat['total']}회)"
+
+    def mark_shown(self):
+        """문제 표시 시각 (응답 시간 측정)"""
+        self.shown_at = time.perf_counter()
+
+    def answer(self, user_answer):
+        """정답 체크 및 통계/기록 저장. 정답 여부 반환"""
+        q = self.question
+        is_correct = user_answer == q['answer']
+        latency_ms = (time.perf_counter() - self.shown_at) * 1000 if self.shown_at else 0
+
+        self.stats_store.increment(q['stats_key'], is_correct)
+        if is_correct:
+            self.correct_count += 1
+        try:
+            self.stats_store.save()
+        except Exception as e:
+            print(f"통계 저장 실패: {e}", file=sys.stderr)
+
+        if self.history:
+            category = q['answer'] if self.mode == 'artifact' else q['category']
+            try:
+                self.history.record(self.session_id, self.mode, q['stats_key'], category,
+                                    user_answer, is_correct, latency_ms)
+            except Exception as e:
+                print(f"학습 기록 저장 실패: {e}", file=sys.stderr)
+        return is_correct
+
+    def feedback(self, is_correct):
+        """피드백 문구 목록"""
+        q = self.question
+        lines = ["O 정답!" if is_correct else f"X 오답 - 정답: {q['answer']}"]
+        if self.mode == 'artifact':
+            lines.append(f"유물명: {Path(q['artifact_name']).stem}")
+        stat = self.stats.get(q['stats_key'])
+        if stat:
+            accuracy = stat['correct'] / stat['total'] * 100 if stat['total'] else 0
+            lines.append(f"이 문제 통계: {stat['correct']}/{stat['total']}회 정답 (정답률 {accuracy:.1f}%)")
+        return lines
+
+    def result_lines(self):
+        """결과 요약"""
+        answered = self.current
+        accuracy = self.correct_count / answered * 100 if answered else 0
+        return [f"전체: {answered}/{len(self.questions)}문제",
+                f"정답: {self.correct_count}문제",
+                f"오답: {answered - self.correct_count}문제",
+                f"정답률: {accuracy:.1f}% (시드 {self.seed})"]
+
+    def close(self):
+        if self.history:
+            self.history.close()
+
+
+def run_plain(quiz, mode=None):
+    """curses 없이 print/input만 사용하는 진행 (파이프, Windows 기본 콘솔 등)"""
+    def ask(prompt, count):
+        while True:
+            value = input(prompt).strip()
+            if value.lower() == 'q':
+                return None
+            if value.isdigit() and 1 <= int(value) <= count:
+                return int(value) - 1
+            print(f"  1~{count} 중에서 고르세요 (q: 종료)")
+
+    if mode is None:
+        for i, (_, label) in enumerate(MODES):
+            print(f"  {i + 1}. {label}")
+        index = ask("모드: ", len(MODES))
+        if index is None:
+            return
+        mode = MODES[index][0]
+
+    names = quiz.category_names(mode)
+    saved = [name for name in quiz.saved_selection(mode) if name in names]
+    for i, name in enumerate(names):
+        print(f"  {i + 1}. {name}{' *' if name in saved else ''}")
+    value = input("카테고리 번호 (쉼표로 구분, 엔터: * 표시 항목): ").strip()
+    if value:
+        selected = [names[int(v) - 1] for v in value.replace(' ', '').split(',')
+                    if v.isdigit() and 1 <= int(v) <= len(names)]
+    else:
+        selected = saved
+    if not selected or not quiz.start(mode, selected):
+        print("출제할 문제가 없습니다.")
+        return
+
+    while quiz.current < len(quiz.questions):
+        header, body = quiz.prompt()
+        options = quiz.options()
+        print(f"\n[{quiz.current + 1}/{len(quiz.questions)}] {header} | {quiz.stat_line()}")
+        print(body)
+        for i, option in enumerate(options):
+            print(f"  {i + 1}. {option}")
+        quiz.mark_shown()
+        index = ask("> ", len(options))
+        if index is None:
+            break
+        for line in quiz.feedback(quiz.answer(options[index])):
+            print(f"  {line}")
+        quiz.current += 1
+
+    print()
+    for line in quiz.result_lines():
+        print(line)
+
+
+def run_curses(stdscr, quiz, mode=None):
+    """curses 화면 진행"""
+    import curses
+
+    curses.curs_set(0)
+    stdscr.keypad(True)
+    if curses.has_colors():
+        curses.use_default_colors()
+        curses.init_pair(1, curses.COLOR_GREEN, -1)
+        curses.init_pair(2, curses.COLOR_RED, -1)
+        curses.init_pair(3, curses.COLOR_CYAN, -1)
+
+    def color(n):
+        return curses.color_pair(n) if curses.has_colors() else 0
+
+    def put(y, x, text, attr=0):
+        height, width = stdscr.getmaxyx()
+        if 0 <= y < height and x < width - 1:
+            try:
+                stdscr.addstr(y, x, clip(str(text), width - 1 - x), attr)
+            except curses.error:
+                pass
+
+    def menu(title, items, lines=(), checked=None):
+        """위/아래 + 엔터로 고르기. checked(set)가 있으면 스페이스로 여러 개 선택"""
+        cursor = 0
+        while True:
+            stdscr.erase()
+            height, width = stdscr.getmaxyx()
+            put(0, 0, title, curses.A_BOLD)
+            y = 1
+            for line in lines:
+                for part in wrap(line, width - 2):
+                    put(y, 0, part)
+                    y += 1
+            y += 1
+
+            if not items:
+                # 고를 항목이 없으면 (이미지 폴더/선지가 없는 경우) 아무 키나 눌러 뒤로
+                put(y, 2, "선택할 항목이 없습니다 (legacy_images 폴더나 choices.yaml을 확인하세요)", color(2))
+                put(height - 1, 0, "아무 키나 누르면 뒤로", color(3))
+                stdscr.refresh()
+                stdscr.getch()
+                return None
+
+            # 화면보다 길면 커서 주변만 표시
+            visible = max(1, height - y - 2)
+            top = min(max(0, cursor - visible + 1), max(0, len(items) - visible))
+            for i in range(top, min(len(items), top + visible)):
+                mark = '' if checked is None else ('[x] ' if i in checked else '[ ] ')
+                number = f"{i + 1}. " if i < 9 else "   "
+                attr = curses.A_REVERSE if i == cursor else 0
+                put(y + i - top, 2, f"{number}{mark}{items[i]}", attr)
+
+            help_text = "↑↓ 이동  엔터 선택  q 종료" if checked is None else "↑↓ 이동  스페이스 선택  엔터 시작  q 뒤로"
+            put(height - 1, 0, help_text, color(3))
+            stdscr.refresh()
+
+            key = stdscr.getch()
+            if key in (ord('q'), 27):
+                return None
+            if key in (curses.KEY_UP, ord('k')):
+                cursor = (cursor - 1) % len(items)
+            elif key in (curses.KEY_DOWN, ord('j')):
+                cursor = (cursor + 1) % len(items)
+            elif checked is not None and key == ord(' '):
+                checked.symmetric_difference_update({cursor})
+            elif key in (curses.KEY_ENTER, 10, 13):
+                return checked if checked is not None else cursor
+            elif checked is None and ord('1') <= key <= ord('9') and key - ord('1') < len(items):
+                return key - ord('1')
+
+    while True:
+        if mode is None:
+            index = menu("한국사 퀴즈 - 학습 모드 선택", [label for _, label in MODES])
+            if index is None:
+                return
+            current_mode = MODES[index][0]
+        else:
+            current_mode = mode
+
+        names = quiz.category_names(current_mode)
+        checked = {i for i, name in enumerate(names) if name in quiz.saved_selection(current_mode)}
+        checked = menu("학습할 카테고리 선택", names, checked=checked)
+        if checked is None:
+            if mode is not None:
+                return
+            continue
+        if checked and quiz.start(current_mode, [names[i] for i in sorted(checked)]):
+            break
+        menu("알림", ["확인"], lines=["출제할 문제가 없습니다."])
+
+    auto_delay = quiz.config.get('auto_next_delay', 1.5)
+    while quiz.current < len(quiz.questions):
+        header, body = quiz.prompt()
+        lines = [f"{quiz.stat_line()}", "", body]
+        title = f"[{quiz.current + 1}/{len(quiz.questions)}] {header}"
+        options = quiz.options()
+
+        quiz.mark_shown()
+        index = menu(title, options, lines=lines)
+        if index is None:
+            break
+
+        is_correct = quiz.answer(options[index])
+        stdscr.erase()
+        for i, line in enumerate(quiz.feedback(is_correct)):
+            put(2 + i * 2, 2, line, (color(1) if is_correct else color(2)) | curses.A_BOLD if i == 0 else 0)
+        stdscr.refresh()
+        quiz.current += 1
+
+        # 자동 넘기기 (키를 누르면 바로 다음)
+        if auto_delay > 0:
+            stdscr.timeout(int(auto_delay * 1000))
+            stdscr.getch()
+            stdscr.timeout(-1)
+        else:
+            put(10, 2, "[아무 키나 눌러 계속]", color(3))
+            stdscr.getch()
+
+    stdscr.erase()
+    put(1, 2, "학습 결과", curses.A_BOLD)
+    for i, line in enumerate(quiz.result_lines()):
+        put(3 + i, 4, line)
+    put(9, 2, "[아무 키나 눌러 종료]", color(3))
+    stdscr.timeout(-1)
+    stdscr.getch()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="한국사 퀴즈 (터미널)")
+    parser.add_argument('--mode', choices=[mode for mode, _ in MODES], help="학습 모드")
+    parser.add_argument('--plain', action='store_true', help="curses 없이 줄 단위로 진행")
+    parser.add_argument('--seed', type=int, help="출제 순서 시드 (같은 시드면 같은 순서)")
+    args = parser.parse_args()
+
+    quiz = TerminalQuiz(seed=args.seed)
+    try:
+        use_curses = not args.plain and sys.stdin.isatty() and sys.stdout.isatty()
+        if use_curses:
+            try:
+                import curses
+                import locale
+            except ImportError:
+                # Windows 기본 파이썬에는 curses가 없음 (windows-curses 설치 시 사용)
+                use_curses = False
+
+        if use_curses:
+            locale.setlocale(locale.LC_ALL, '')
+            curses.wrapper(run_curses, quiz, args.mode)
+            for line in quiz.result_lines() if quiz.questions else []:
+                print(line)
+        else:
+            run_plain(quiz, args.mode)
+    except (KeyboardInterrupt, EOFError):
+        pass
+    finally:
+        quiz.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+import os
+import json
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+import cv2
+import numpy as np
+
+from image_loader import load_image
+
+PROPOSALS_FILE = 'region_proposals.json'
+
+# 검출 시 이미지 긴 변 최대 크기 (속도용, 결과는 원본 좌표로 환산)
+DETECT_MAX_SIDE = 1600
+
+
+def load_bgr(image_path, max_side=None):
+    """이미지를 OpenCV(BGR) 배열로 로드. (배열, 원본 대비 배율) 반환"""
+    max_size = (max_side, max_side) if max_side else None
+    pil_image, report = load_image(image_path, max_size)
+    if pil_image.mode != 'RGB':
+        pil_image = pil_image.convert('RGB')
+    scale = report.final_size[0] / report.source_size[0]
+    return cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR), scale
+
+
+def edge_regions(img):
+    """엣지 + 외곽선 기반 후보 영역"""
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    gray = cv2.GaussianBlur(gray, (5, 5), 0)
+    edges = cv2.Canny(gray, 50, 150)
+
+    # 유물 외곽의 끊어진 엣지를 이어 붙임
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (9, 9))
+    edges = cv2.morphologyEx(edges, cv2.MORPH_CLOSE, kernel, iterations=2)
+
+    contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    return [cv2.boundingRect(c) for c in contours]
+
+
+def component_regions(img):
+    """배경색과 다른 픽셀의 연결 요소 기반 후보 영역"""
+    # 테두리 픽셀의 중앙값을 배경색으로 간주
+    border = np.concatenate([img[0], img[-1], img[:, 0], img[:, -1]])
+    background = np.median(border, axis=0)
+
+    diff = np.abs(img.astype(np.int16) - background.astype(np.int16)).max(axis=2)
+    mask = (diff > 30).astype(np.uint8) * 255
+
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (7, 7))
+    mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel)
+    mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel, iterations=3)
+
+    count, _, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+    return [tuple(int(v) for v in stats[i, :4]) for i in range(1, count)]
+
+
+def overlap(a, b):
+    """두 사각형 (x, y, w, h)의 교집합 면적 / 작은 쪽 면적"""
+    x1 = max(a[0], b[0])
+    y1 = max(a[1], b[1])
+    x2 = min(a[0] + a[2], b[0] + b[2])
+    y2 = min(a[1] + a[3], b[1] + b[3])
+    if x2 <= x1 or y2 <= y1:
+        return 0.0
+    return (x2 - x1) * (y2 - y1) / min(a[2] * a[3], b[2] * b[3])
+
+
+def merge_regions(rects, threshold=0.8):
+    """거의 겹치는 후보는 큰 쪽 하나만 남김"""
+    kept = []
+    for rect in sorted(rects, key=lambda r: r[2] * r[3], reverse=True):
+        if all(overlap(rect, other) < threshold for other in kept):
+            kept.append(rect)
+    return kept
+
+
+def detect_regions(img, min_area_ratio=0.002, max_area_ratio=0.5, padding=4):
+    """자료 시트에서 유물 후보 사각형 [(x1, y1, x2, y2)] 검출 (원본 좌표)"""
+    h, w = img.shape[:2]
+    scale = min(1.0, DETECT_MAX_SIDE / max(h, w))
+    small = cv2.resize(img, (int(w * scale), int(h * scale)),
+                       interpolation=cv2.INTER_AREA) if scale < 1.0 else img
+
+    sh, sw = small.shape[:2]
+    image_area = sh * sw
+
+    candidates = []
+    for x, y, rw, rh in edge_regions(small) + component_regions(small):
+        area = rw * rh
+        if area < image_area * min_area_ratio or area > image_area * max_area_ratio:
+            continue
+        # 선, 글자 줄처럼 지나치게 가늘고 긴 영역 제외
+        if max(rw, rh) > 8 * min(rw, rh):
+            continue
+        # 납작한 한 줄 높이의 영역은 유물 이름(캡션)으로 간주
+        if rw > 3 * rh and rh < sh * 0.06:
+            continue
+        candidates.append((x, y, rw, rh))
+
+    regions = []
+    for x, y, rw, rh in merge_regions(candidates):
+        x1 = max(0, int(x / scale) - padding)
+        y1 = max(0, int(y / scale) - padding)
+        x2 = min(w, int((x + rw) / scale) + padding)
+        y2 = min(h, int((y + rh) / scale) + padding)
+        regions.append((x1, y1, x2, y2))
+
+    # 읽는 순서(위→아래, 왼쪽→오른쪽)로 정렬
+    row_height = max(1, h // 20)
+    regions.sort(key=lambda r: (r[1] // row_height, r[0]))
+    return regions
+
+
+def detect_file(image_path):
+    """파일 하나 검출 (프로세스 풀 워커)"""
+    try:
+        # 검출은 축소 디코딩한 이미지로 하고 좌표만 원본 기준으로 환산
+        img, scale = load_bgr(image_path, DETECT_MAX_SIDE)
+        regions = [tuple(int(round(v / scale)) for v in rect) for rect in detect_regions(img)]
+        return str(image_path), regions, None
+    except Exception as e:
+        return str(image_path), [], str(e)
+
+
+def file_signature(path):
+    """캐시 무효화용 파일 서명 (수정 시각, 크기)"""
+    stat = Path(path).stat()
+    return [stat.st_mtime, stat.st_size]
+
+
+def proposal_key(path):
+    """후보 영역 캐시 키 (절대 경로, 다른 폴더의 같은 이름 시트와 구분)"""
+    return Path(path).resolve().as_posix()
+
+
+def propose_all(image_files, proposals_file=PROPOSALS_FILE, workers=None):
+    """모든 자료 시트의 후보 영역 검출 (변경된 파일만 다시 계산). {proposal_key: 영역 목록} 반환"""
+    cache = {}
+    if Path(proposals_file).exists():
+        try:
+            with open(proposals_file, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except Exception as e:
+            print(f"후보 영역 캐시 로드 실패: {e}")
+    # 예전 캐시의 파일 이름 키는 어느 폴더의 시트인지 알 수 없으므로 버림
+    cache = {key: entry for key, entry in cache.items() if '/' in key}
+
+    pending = [p for p in image_files
+               if cache.get(proposal_key(p), {}).get('signature') != file_signature(p)]
+
+    if pending:
+        print(f"🔍 후보 영역 검출 중... ({len(pending)}개 이미지)")
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+            for path, regions, error in executor.map(detect_file, pending):
+                if error:
+                    print(f"❌ 검출 실패 {Path(path).name}: {error}")
+                    continue
+                cache[proposal_key(path)] = {
+                    'signature': file_signature(path),
+                    'regions': [list(r) for r in regions],
+                }
+
+        with open(proposals_file, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False, indent=2)
+
+    return {proposal_key(p): [tuple(r) for r in cache.get(proposal_key(p), {}).get('regions', [])]
+            for p in image_files}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="자료 시트 유물 후보 영역 검출")
+    parser.add_argument('--input', default='source_images', help="자료 시트 폴더")
+    parser.add_argument('--output', default=PROPOSALS_FILE, help="후보 영역 파일")
+    parser.add_argument('--workers', type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    args = parser.parse_args()
+
+    from crop import ImageCropper
+    image_files = ImageCropper(input_folder=args.input).get_image_files()
+    if not image_files:
+        print(f"⚠ '{args.input}' 폴더에 이미지 파일이 없습니다.")
+        return
+
+    proposals = propose_all(image_files, args.output, args.workers)
+    for path in image_files:
+        print(f"  {Path(path).name}: {len(proposals[proposal_key(path)])}개")
+
+
+if __name__ == "__main__":
+    main()
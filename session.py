@@ -0,0 +1,106 @@
+import os
+import json
+import time
+from pathlib import Path
+
+from quiz_log import logger
+
+SESSION_FILE = 'quiz_session.jsonl'
+
+
+class SessionCheckpoint:
+    """진행 중인 학습 세션 체크포인트 (JSON Lines, 답변마다 한 줄씩 추가)"""
+
+    def __init__(self, path=SESSION_FILE):
+        self.path = path
+
+    def _append(self, record):
+        """레코드 한 줄 추가"""
+        try:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        except OSError as e:
+            logger.error("세션 체크포인트 저장 실패: %s", e)
+
+    def start(self, mode, session_id, quiz_data, categories, selected_categories=None, **extra):
+        """새 세션 시작 (문제 목록은 이때 한 번만 기록)"""
+        header = {
+            'type': 'start',
+            'created': time.time(),
+            'mode': mode,
+            'session_id': session_id,
+            'categories': categories,
+            'selected_categories': selected_categories or [],
+            'quiz_data': quiz_data,
+        }
+        header.update(extra)
+        try:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                f.write(json.dumps(header, ensure_ascii=False) + '\n')
+        except OSError as e:
+            logger.error("세션 체크포인트 저장 실패: %s", e)
+
+    def record_answer(self, index, answer, is_correct):
+        """답변 한 건 기록"""
+        self._append({'type': 'answer', 'q': index, 'answer': answer, 'is_correct': is_correct})
+
+    def record_position(self, index):
+        """현재 문제 위치 기록 (다음/이전 이동)"""
+        self._append({'type': 'pos', 'q': index})
+
+    def finish(self):
+        """세션 종료 (체크포인트 삭제)"""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning("세션 체크포인트 삭제 실패: %s", e)
+
+    def load(self):
+        """체크포인트를 재생해 세션 상태 복원 (이어서 할 게 없으면 None)"""
+        if not Path(self.path).exists():
+            return None
+
+        state = None
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # 마지막 줄이 쓰다가 끊긴 경우
+                        break
+
+                    if record['type'] == 'start':
+                        state = dict(record)
+                        state.update({'user_answers': [], 'correct_count': 0, 'current_question': 0})
+                    elif state is None:
+                        break
+                    elif record['type'] == 'answer':
+                        answers = state['user_answers']
+                        entry = {'answer': record['answer'], 'is_correct': record['is_correct']}
+                        if record['q'] < len(answers):
+                            # 이전 버튼으로 돌아가 다시 답한 경우 (통계 미반영)
+                            answers[record['q']] = entry
+                        else:
+                            answers.append(entry)
+                            if record['is_correct']:
+                                state['correct_count'] += 1
+                        state['current_question'] = record['q']
+                    elif record['type'] == 'pos':
+                        state['current_question'] = record['q']
+        except OSError as e:
+            logger.warning("세션 체크포인트 로드 실패: %s", e)
+            return None
+
+        if not state or not state['quiz_data']:
+            return None
+
+        # 방금 답한 마지막 문제에서 끝났으면 다음 문제부터
+        if state['current_question'] == len(state['user_answers']) - 1:
+            state['current_question'] += 1
+
+        if state['current_question'] >= len(state['quiz_data']):
+            return None
+        return state
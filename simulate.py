@@ -0,0 +1,208 @@
+import json
+import time
+import random
+import argparse
+import statistics
+from pathlib import Path
+
+from quiz_core import CHOICES_FILE, load_choice_data, choice_questions, order_questions, new_seed
+
+
+class AccuracyScheduler:
+    """QuizApp 기본 정렬 (무작위, 오답률 우선이면 누적 정답률 낮은 순)"""
+
+    def __init__(self, prioritize_wrong):
+        self.prioritize_wrong = prioritize_wrong
+
+    def order(self, questions, stats, rng):
+        order_questions(questions, self.prioritize_wrong, rng)
+
+    def update(self, stats_key, is_correct):
+        pass
+
+
+class DifficultyScheduler:
+    """난이도 모델 정렬 (맞힐 확률 낮은 순, 답할 때마다 모델 갱신)"""
+
+    def __init__(self):
+        from difficulty import DifficultyModel
+        self.model = DifficultyModel()
+
+    def order(self, questions, stats, rng):
+        order_questions(questions, True, rng, self.model.sort_key)
+
+    def update(self, stats_key, is_correct):
+        self.model.update(stats_key, is_correct)
+
+
+# 출제 순서 방식 (학습자마다 새로 생성). 새 방식은 order/update를 구현해서 여기에 추가
+SCHEDULERS = {
+    'random': lambda: AccuracyScheduler(False),
+    'wrong_first': lambda: AccuracyScheduler(True),
+    'difficulty': DifficultyScheduler,
+}
+
+
+class SyntheticLearner:
+    """가상 학습자. 선지별 숙련도(찍지 않고 맞힐 확률)를 가지고, 답할 때마다 학습하고 세션 사이에 잊음"""
+
+    def __init__(self, keys, rng, skill=(2.0, 5.0), skills=None, learn_rate=0.3, forget=0.005):
+        # skills에 없는 선지는 Beta(a, b) 분포에서 뽑음
+        skills = skills or {}
+        self.skill = {key: skills[key] if key in skills else rng.betavariate(*skill) for key in keys}
+        self.learn_rate = learn_rate
+        self.forget = forget
+        # 맞힌 횟수가 많을수록 덜 잊음 (간격 반복 효과)
+        self.recalls = dict.fromkeys(keys, 0)
+
+    def answer(self, question, rng):
+        """답하기 (모르면 보기 중에서 찍음). 정답 여부 반환"""
+        key = question['stats_key']
+        p = self.skill[key]
+        guess = 1 / len(question['choices'])
+        is_correct = rng.random() < p + (1 - p) * guess
+
+        # 틀리면 정답 피드백으로 크게, 맞히면 조금 학습
+        gain = self.learn_rate if not is_correct else self.learn_rate * 0.3
+        self.skill[key] = p + (1 - p) * gain
+        if is_correct:
+            self.recalls[key] += 1
+        return is_correct
+
+    def end_session(self):
+        """세션 사이 망각"""
+        recalls = self.recalls
+        for key, p in self.skill.items():
+            self.skill[key] = p * (1 - self.forget / (1 + recalls[key]))
+
+    def mastered(self, threshold):
+        """숙련도가 기준 이상인 선지 비율"""
+        return sum(p >= threshold for p in self.skill.values()) / len(self.skill)
+
+
+def bank_keys(choice_data, categories):
+    """선택한 카테고리의 모든 선지 통계 키"""
+    return [q['stats_key'] for q in choice_questions(choice_data, categories, {}, 100)]
+
+
+def run_learner(choice_data, categories, scheduler, learner, rng, args):
+    """학습자 한 명의 세션 반복. {'sessions': 숙달까지 세션 수 (못 하면 None), ...}"""
+    stats = {}
+    answered = 0
+    prepare_s = 0.0
+    answer_s = 0.0
+
+    for session in range(1, args.sessions + 1):
+        # QuizApp.prepare_choice_quiz_data와 같은 준비 과정 (통계는 메모리에서)
+        start = time.perf_counter()
+        questions = choice_questions(choice_data, categories, stats, args.accuracy_filter)
+        scheduler.order(questions, stats, rng)
+        if args.session_length:
+            del questions[args.session_length:]
+        prepare_s += time.perf_counter() - start
+
+        start = time.perf_counter()
+        for q in questions:
+            is_correct = learner.answer(q, rng)
+            scheduler.update(q['stats_key'], is_correct)
+            stat = stats.setdefault(q['stats_key'], {'total': 0, 'correct': 0})
+            stat['total'] += 1
+            if is_correct:
+                stat['correct'] += 1
+        answer_s += time.perf_counter() - start
+        answered += len(questions)
+
+        learner.end_session()
+        mastered = learner.mastered(args.mastery)
+        if mastered >= args.coverage:
+            break
+    else:
+        session = None
+    return {'sessions': session, 'answered': answered, 'mastered': mastered,
+            'prepare_s': prepare_s, 'answer_s': answer_s, 'runs': session or args.sessions}
+
+
+def simulate(choice_data, categories, scheduler_name, learner_seeds, skills, args):
+    """같은 학습자(시드)들로 출제 방식 하나를 시뮬레이션"""
+    keys = bank_keys(choice_data, categories)
+    results = []
+    for seed in learner_seeds:
+        scheduler = SCHEDULERS[scheduler_name]()
+        rng = random.Random(seed)
+        learner = SyntheticLearner(keys, rng, args.skill, skills, args.learn_rate, args.forget)
+        results.append(run_learner(choice_data, categories, scheduler, learner, rng, args))
+    return results
+
+
+def summarize(name, results, elapsed):
+    """출제 방식별 결과 출력"""
+    reached = [r for r in results if r['sessions'] is not None]
+    runs = sum(r['runs'] for r in results)
+    answered = sum(r['answered'] for r in results)
+    prepare_ms = sum(r['prepare_s'] for r in results) / runs * 1000 if runs else 0
+
+    print(f"\n[{name}]")
+    print(f"  숙달: {len(reached)}/{len(results)}명 "
+          f"(마지막 숙달 선지 비율 평균 {statistics.mean(r['mastered'] for r in results):.0%})")
+    if reached:
+        sessions = [r['sessions'] for r in reached]
+        answers = [r['answered'] for r in reached]
+        print(f"  숙달까지 세션: 중앙값 {statistics.median(sessions):g}, "
+              f"평균 {statistics.mean(sessions):.1f} (최소 {min(sessions)}, 최대 {max(sessions)})")
+        print(f"  숙달까지 답변: 평균 {statistics.mean(answers):.0f}회")
+    print(f"  처리량: 세션 {runs / elapsed:,.0f}/s, 문제 {answered / elapsed:,.0f}/s "
+          f"(문제 준비 {prepare_ms:.2f}ms/세션)")
+
+
+def parse_skill(text):
+    """'a,b' → Beta 분포 인자"""
+    a, b = (float(v) for v in text.split(','))
+    return a, b
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가상 학습자로 출제 순서 방식 비교 (선지맞추기)")
+    parser.add_argument('--choices', default=CHOICES_FILE, help="선지 YAML 파일")
+    parser.add_argument('--categories', nargs='*', help="카테고리 (기본: 전체)")
+    parser.add_argument('--scheduler', nargs='*', choices=list(SCHEDULERS),
+                        help="비교할 출제 방식 (기본: 전체)")
+    parser.add_argument('--learners', type=int, default=10, help="학습자 수")
+    parser.add_argument('--sessions', type=int, default=1000, help="학습자당 최대 세션 수")
+    parser.add_argument('--session-length', type=int, default=20, help="세션당 문제 수 (0: 전체)")
+    parser.add_argument('--accuracy-filter', type=int, default=100, help="정답률 필터 (%%)")
+    parser.add_argument('--skill', type=parse_skill, default=(2.0, 5.0),
+                        help="초기 숙련도 Beta 분포 'a,b'")
+    parser.add_argument('--skill-file', help="선지별 초기 숙련도 JSON {통계 키: 0~1}")
+    parser.add_argument('--learn-rate', type=float, default=0.3, help="답변당 학습률")
+    parser.add_argument('--forget', type=float, default=0.005, help="세션 사이 망각률")
+    parser.add_argument('--mastery', type=float, default=0.9, help="숙달로 볼 숙련도")
+    parser.add_argument('--coverage', type=float, default=0.95, help="숙달해야 할 선지 비율")
+    parser.add_argument('--seed', type=int, help="시드 (같은 시드면 같은 결과)")
+    args = parser.parse_args()
+
+    choice_data = load_choice_data(args.choices)
+    categories = args.categories or list(choice_data.keys())
+    skills = {}
+    if args.skill_file:
+        skills = json.loads(Path(args.skill_file).read_text(encoding='utf-8'))
+    seed = new_seed() if args.seed is None else args.seed
+
+    # 출제 방식마다 같은 학습자(초기 숙련도, 난수)로 비교
+    master = random.Random(seed)
+    learner_seeds = [master.randrange(2 ** 32) for _ in range(args.learners)]
+
+    print("=" * 60)
+    print("🧪 학습 시뮬레이션")
+    print("=" * 60)
+    print(f"시드 {seed}, 선지 {len(bank_keys(choice_data, categories))}개, 학습자 {args.learners}명, "
+          f"세션당 {args.session_length or '전체'}문제")
+    print(f"숙달 기준: 선지 {args.coverage:.0%} 이상 숙련도 {args.mastery}")
+
+    for name in args.scheduler or list(SCHEDULERS):
+        start = time.perf_counter()
+        results = simulate(choice_data, categories, name, learner_seeds, skills, args)
+        summarize(name, results, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
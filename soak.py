@@ -0,0 +1,205 @@
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import tempfile
+import argparse
+from pathlib import Path
+
+# 화면 전환/답변을 사람 없이 반복하는 장시간 실행 테스트 (Tk 창은 숨김)
+# Tk가 필요하므로 디스플레이가 없는 Linux에서는 xvfb-run python soak.py ...
+
+# 임시 작업 폴더의 quiz_config.json (통계/기록/체크포인트도 임시 폴더에 생성)
+SOAK_CONFIG = {
+    'accuracy_filter': 100,
+    'prioritize_wrong_answers': False,
+    'show_artifact_name': True,
+    # 0: 피드백 화면에서 클릭 대기 (root.bind 경로까지 반복)
+    'auto_next_delay': 0,
+    'difficulty_model': False,
+    'log_level': 'WARNING',
+    'log_file': None,
+}
+
+
+def prepare_workdir(workdir, source_root, every):
+    """임시 작업 폴더 (선지 YAML 복사, 설정 파일 작성)"""
+    choices = source_root / 'choices.yaml'
+    if choices.exists():
+        shutil.copy2(choices, workdir / 'choices.yaml')
+    config = dict(SOAK_CONFIG, memory_probe_every=every)
+    with open(workdir / 'quiz_config.json', 'w', encoding='utf-8') as f:
+        json.dump(config, f, ensure_ascii=False, indent=2)
+
+
+def repeat_questions(questions, count):
+    """문제 목록을 count개가 될 때까지 반복 (같은 문제도 매번 새 화면)"""
+    return [dict(questions[i % len(questions)]) for i in range(count)]
+
+
+def answer_one(app, mode, question, rng, accuracy):
+    """문제 하나 답하기 (accuracy 확률로 정답)"""
+    correct = rng.random() < accuracy
+    if mode == 'reverse':
+        options = question['options']
+        right = [i for i, option in enumerate(options) if option['era'] == question['answer']]
+        wrong = [i for i in range(len(options)) if i not in right]
+        app.check_reverse_answer(right[0] if correct or not wrong else rng.choice(wrong))
+        return
+
+    choices = question['choices'] if mode == 'choice' else app.selected_categories
+    wrong = [c for c in choices if c != question['answer']]
+    answer = question['answer'] if correct or not wrong else rng.choice(wrong)
+    if mode == 'choice':
+        app.check_choice_answer(answer)
+    else:
+        app.check_answer(answer)
+
+
+def run_soak(app, mode, count, rng, accuracy, progress_every=1000):
+    """count문제 반복 (문제 화면 → 답변 → 피드백 → 다음). 초당 문제 수 반환"""
+    show = {'artifact': app.show_quiz_screen, 'choice': app.show_choice_quiz_screen,
+            'reverse': app.show_reverse_quiz_screen}[mode]
+    advance = app.next_choice_question if mode == 'choice' else app.next_question
+
+    start = time.perf_counter()
+    show()
+    for i in range(count):
+        app.root.update()
+        answer_one(app, mode, app.quiz_data[app.current_question], rng, accuracy)
+        app.root.update()
+        advance()
+        if (i + 1) % progress_every == 0:
+            print(f"  {i + 1:,}문제 ({(i + 1) / (time.perf_counter() - start):.0f}문제/s)")
+    return count / (time.perf_counter() - start)
+
+
+def start_session(app, mode, count):
+    """모든 시대/카테고리로 세션 시작 (설정 화면 없이)"""
+    from history import new_session_id
+    app.quiz_mode = mode
+    app.start_session_rng()
+    if mode == 'choice':
+        app.prepare_choice_quiz_data(list(app.choice_data))
+    else:
+        app.selected_categories = [category['name'] for category in app.categories]
+        if mode == 'reverse':
+            app.prepare_reverse_quiz_data()
+        else:
+            app.prepare_quiz_data()
+    if not app.quiz_data:
+        return False
+
+    app.quiz_data = repeat_questions(app.quiz_data, count)
+    app.current_question = 0
+    app.correct_count = 0
+    app.total_questions = len(app.quiz_data)
+    app.user_answers = []
+    app.session_id = new_session_id()
+    app.start_checkpoint()
+    return True
+
+
+def check_budget(probe, warmup, budget_mb, rss_budget_mb, max_tk_growth):
+    """워밍업 이후 증가량이 예산 안인지. (통과 여부, 메시지 목록)"""
+    since = next((i for i, s in enumerate(probe.samples) if s['answers'] >= warmup), None)
+    if since is None or since == len(probe.samples) - 1:
+        return False, ["워밍업 이후 표본이 부족합니다 (--questions를 늘리거나 --every를 줄이세요)"]
+
+    growth = probe.growth(since)
+    checks = [('traced_bytes', budget_mb * 1024 * 1024, "추적 메모리"),
+              ('rss_bytes', rss_budget_mb * 1024 * 1024, "RSS"),
+              ('tk_images', max_tk_growth, "Tk 이미지"),
+              ('tk_commands', max_tk_growth, "Tcl 명령"),
+              ('tk_callbacks', max_tk_growth, "root 콜백")]
+    messages = []
+    ok = True
+    for key, limit, label in checks:
+        if key not in growth:
+            continue
+        value = growth[key]
+        passed = value <= limit
+        ok &= passed
+        shown = f"{value / 1024 / 1024:+.2f}MB (예산 {limit / 1024 / 1024:.0f}MB)" \
+            if key.endswith('_bytes') else f"{value:+} (허용 {limit})"
+        messages.append(f"{'✓' if passed else '❌'} {label}: {shown}")
+    return ok, messages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="장시간 퀴즈 메모리 테스트 (숨긴 창에서 문제 반복)")
+    parser.add_argument('--questions', type=int, default=10000, help="문제 수")
+    parser.add_argument('--mode', choices=['artifact', 'choice', 'reverse'], default='artifact',
+                        help="퀴즈 모드")
+    parser.add_argument('--every', type=int, default=500, help="표본 간격 (문제)")
+    parser.add_argument('--warmup', type=int, default=1000, help="이 문제 수 이후부터 증가량 계산")
+    parser.add_argument('--budget-mb', type=float, default=16, help="워밍업 이후 추적 메모리 증가 예산")
+    parser.add_argument('--rss-budget-mb', type=float, default=64, help="워밍업 이후 RSS 증가 예산")
+    parser.add_argument('--max-tk-growth', type=int, default=20,
+                        help="워밍업 이후 Tk 이미지/Tcl 명령 증가 허용치")
+    parser.add_argument('--accuracy', type=float, default=0.7, help="가상 정답률")
+    parser.add_argument('--seed', type=int, default=0, help="답 고르기 시드")
+    parser.add_argument('--report', default='soak_report.json', help="표본 JSON 파일")
+    parser.add_argument('--keep', action='store_true', help="임시 작업 폴더 남기기")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🧪 장시간 메모리 테스트")
+    print("=" * 60)
+
+    source_root = Path.cwd()
+    report_path = (source_root / args.report).resolve()
+    workdir = Path(tempfile.mkdtemp(prefix='quiz_soak_'))
+    prepare_workdir(workdir, source_root, args.every)
+    os.chdir(workdir)
+
+    # 작업 폴더로 옮긴 뒤 import (QuizApp은 현재 폴더 기준 파일 사용)
+    sys.path.insert(0, str(source_root))
+    import quiz
+
+    passed = False
+    try:
+        app = quiz.QuizApp()
+        app.root.withdraw()
+        # 이미지는 원래 폴더에서 (작업 폴더에는 복사하지 않음)
+        app.image_folder_name = str(source_root / 'legacy_images')
+        app.data_loaded = False
+        app.ensure_data_loaded()
+
+        if not start_session(app, args.mode, args.questions):
+            print("⚠ 출제할 문제가 없습니다.")
+            return
+        print(f"작업 폴더 {workdir}, {args.mode} {args.questions:,}문제, {args.every}문제마다 표본")
+
+        rate = run_soak(app, args.mode, args.questions, random.Random(args.seed), args.accuracy)
+        probe = app.memory_probe
+        probe.export(report_path)
+
+        print(f"\n{'문제':>8} {'추적 MB':>9} {'RSS MB':>8} {'객체':>9} {'Tk 이미지':>9} {'Tcl 명령':>9}")
+        for s in probe.samples:
+            rss = f"{s['rss_bytes'] / 1024 / 1024:.1f}" if s['rss_bytes'] else '-'
+            print(f"{s['answers']:>8,} {s['traced_bytes'] / 1024 / 1024:>9.1f} {rss:>8} "
+                  f"{s['objects']:>9,} {s['tk']['images']:>9} {s['tk']['commands']:>9}")
+        for line in probe.lines()[2:]:
+            print(line)
+
+        passed, messages = check_budget(probe, args.warmup, args.budget_mb, args.rss_budget_mb,
+                                        args.max_tk_growth)
+        print()
+        for message in messages:
+            print(message)
+        print(f"\n{'✓ 통과' if passed else '❌ 실패'} ({rate:.0f}문제/s) → {report_path}")
+
+        app.history and app.history.close()
+        app.root.destroy()
+    finally:
+        os.chdir(source_root)
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
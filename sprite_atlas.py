@@ -0,0 +1,196 @@
+import json
+import math
+import time
+import hashlib
+import argparse
+from pathlib import Path
+from PIL import Image
+
+from asset_pack import file_stamp
+from image_loader import load_image
+from optimize_images import IMAGE_EXTENSIONS, load_manifest
+from quiz_core import folder_order
+
+ATLAS_FOLDER = 'atlases'
+ATLAS_INDEX = 'atlas_index.json'
+SOURCE_FOLDER = 'legacy_images'
+
+# 썸네일 한 칸 크기 (역방향 퀴즈 보기 버튼 크기)
+THUMB_SIZE = (180, 135)
+
+# 역방향(시대 → 유물) 문제 통계 키 접두사 (유물맞추기 통계와 구분)
+REVERSE_PREFIX = 'reverse:'
+
+
+def images_signature(images):
+    """시대 폴더 이미지 목록 서명 [(통계 키, 유물명, 스탬프)] (변경 감지용)"""
+    data = json.dumps(sorted([key, name, stamp] for key, name, _, stamp in images),
+                      ensure_ascii=False)
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+
+def grid_shape(count):
+    """썸네일 개수에 맞는 (열, 행) 수 (정사각형에 가깝게)"""
+    cols = max(1, math.ceil(math.sqrt(count)))
+    return cols, max(1, math.ceil(count / cols))
+
+
+def make_thumbnail(source):
+    """썸네일 크기로 축소 디코딩 (투명 영역은 흰 배경)"""
+    img, _ = load_image(source, THUMB_SIZE)
+    if img.mode in ('RGBA', 'LA', 'P'):
+        rgba = img.convert('RGBA')
+        img = Image.new('RGB', rgba.size, 'white')
+        img.paste(rgba, mask=rgba.split()[3])
+    return img.convert('RGB')
+
+
+def build_atlas(folder, images, atlas_folder=ATLAS_FOLDER):
+    """시대 폴더 하나의 썸네일을 한 장의 아틀라스로 합치기. 인덱스 항목 반환
+
+    images: [(통계 키, 유물명, 이미지 원본(경로/바이트/PIL), 스탬프)]
+    """
+    cell_w, cell_h = THUMB_SIZE
+    cols, rows = grid_shape(len(images))
+    atlas = Image.new('RGB', (cols * cell_w, rows * cell_h), 'white')
+
+    entries = []
+    for i, (stats_key, name, source, _) in enumerate(images):
+        try:
+            thumb = make_thumbnail(source)
+        except Exception as e:
+            print(f"❌ 썸네일 생성 실패 {stats_key}: {e}")
+            continue
+
+        # 칸 안에서 가운데 정렬
+        x = (i % cols) * cell_w + (cell_w - thumb.width) // 2
+        y = (i // cols) * cell_h + (cell_h - thumb.height) // 2
+        atlas.paste(thumb, (x, y))
+        entries.append({'stats_key': stats_key, 'name': name,
+                        'box': [x, y, x + thumb.width, y + thumb.height]})
+
+    Path(atlas_folder).mkdir(parents=True, exist_ok=True)
+    file_name = f"{folder}.png"
+    atlas.save(Path(atlas_folder) / file_name, optimize=False)
+
+    return {'file': file_name, 'signature': images_signature(images), 'entries': entries}
+
+
+class AtlasStore:
+    """시대별 스프라이트 아틀라스. 아틀라스는 한 번만 디코딩하고 썸네일은 잘라서 사용"""
+
+    def __init__(self, atlas_folder=ATLAS_FOLDER):
+        self.atlas_folder = atlas_folder
+        self.index = {}
+        self._atlases = {}   # 폴더 → 디코딩된 아틀라스 이미지
+        self._entries = {}   # 폴더 → {통계 키: 항목}
+
+        index_file = Path(atlas_folder) / ATLAS_INDEX
+        if index_file.exists():
+            try:
+                with open(index_file, 'r', encoding='utf-8') as f:
+                    self.index = json.load(f)
+            except Exception as e:
+                print(f"아틀라스 인덱스 로드 실패: {e}")
+
+    def save_index(self):
+        """인덱스 저장"""
+        Path(self.atlas_folder).mkdir(parents=True, exist_ok=True)
+        with open(Path(self.atlas_folder) / ATLAS_INDEX, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, ensure_ascii=False, indent=1)
+
+    def ensure(self, folder, images):
+        """이미지 목록이 바뀌었거나 아틀라스가 없으면 다시 생성. 생성 여부 반환"""
+        entry = self.index.get(folder)
+        if (entry and entry['signature'] == images_signature(images)
+                and (Path(self.atlas_folder) / entry['file']).exists()):
+            return False
+
+        self.index[folder] = build_atlas(folder, images, self.atlas_folder)
+        self._atlases.pop(folder, None)
+        self._entries.pop(folder, None)
+        return True
+
+    def entries(self, folder):
+        """시대 폴더의 썸네일 항목 {통계 키: 항목}"""
+        if folder not in self._entries:
+            items = self.index.get(folder, {}).get('entries', [])
+            self._entries[folder] = {item['stats_key']: item for item in items}
+        return self._entries[folder]
+
+    def atlas(self, folder):
+        """디코딩된 아틀라스 이미지 (처음 한 번만 디코딩)"""
+        if folder not in self._atlases:
+            with Image.open(Path(self.atlas_folder) / self.index[folder]['file']) as img:
+                img.load()
+                self._atlases[folder] = img
+        return self._atlases[folder]
+
+    def thumbnail(self, folder, stats_key):
+        """아틀라스에서 썸네일 영역 잘라내기"""
+        return self.atlas(folder).crop(tuple(self.entries(folder)[stats_key]['box']))
+
+
+def file_images(folder_path, manifest):
+    """폴더의 이미지 [(통계 키, 유물명, 경로, 스탬프)] (최적화 이미지가 있으면 그쪽 사용)"""
+    images = []
+    for img_file in sorted(folder_path.iterdir()):
+        if img_file.suffix.lower() not in IMAGE_EXTENSIONS:
+            continue
+        source = img_file
+        optimized = manifest.get(img_file.as_posix())
+        if optimized and Path(optimized).exists():
+            source = Path(optimized)
+        images.append((str(img_file), img_file.name, source, file_stamp(source)))
+    return images
+
+
+def main():
+    parser = argparse.ArgumentParser(description="시대별 썸네일 스프라이트 아틀라스 생성")
+    parser.add_argument('--source', default=SOURCE_FOLDER, help="원본 이미지 폴더")
+    parser.add_argument('--output', default=ATLAS_FOLDER, help="아틀라스 폴더")
+    args = parser.parse_args()
+
+    source_path = Path(args.source)
+    if not source_path.exists():
+        print(f"⚠ '{args.source}' 폴더가 없습니다.")
+        return
+
+    print("=" * 60)
+    print("🗺 스프라이트 아틀라스 생성")
+    print("=" * 60)
+
+    store = AtlasStore(args.output)
+    manifest = load_manifest()
+    folders = [f for f in sorted(source_path.iterdir(), key=folder_order) if f.is_dir()]
+
+    for folder in folders:
+        images = file_images(folder, manifest)
+        start = time.perf_counter()
+        built = store.ensure(folder.name, images)
+        elapsed = (time.perf_counter() - start) * 1000
+        status = f"생성 {elapsed:.0f}ms" if built else "변경 없음"
+        print(f"  {folder.name}: {len(images)}개 ({status})")
+    store.save_index()
+
+    # 문제 한 개(썸네일 9개)를 그리는 비용: 원본 디코딩 vs 아틀라스 잘라내기
+    samples = [(folder.name, key, source) for folder in folders
+               for key, _, source, _ in file_images(folder, manifest)][:9]
+    if samples:
+        start = time.perf_counter()
+        for _, _, source in samples:
+            make_thumbnail(source)
+        decode_ms = (time.perf_counter() - start) * 1000
+
+        for folder, _, _ in samples:
+            store.atlas(folder)
+        start = time.perf_counter()
+        for folder, key, _ in samples:
+            store.thumbnail(folder, key)
+        crop_ms = (time.perf_counter() - start) * 1000
+
+        print(f"\n✓ 썸네일 {len(samples)}개: 원본 디코딩 {decode_ms:.1f}ms → 아틀라스 {crop_ms:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+import json
+import time
+import difflib
+import argparse
+from pathlib import Path
+
+from optimize_images import IMAGE_EXTENSIONS
+from sprite_atlas import REVERSE_PREFIX
+from stats_store import (STATS_FILE, StatsStore, empty_state, file_lock, instance_count,
+                         merge_into, move_keys, new_instance_id, read_state, remove_keys, write_state)
+
+ARCHIVE_FILE = 'quiz_stats_archive.json'
+
+# 고아 키 비율이 이 값을 넘으면 정리 (quiz_config.json의 stats_compact_ratio)
+DEFAULT_ORPHAN_RATIO = 0.1
+# 인스턴스 카운터가 이보다 많으면 fold (quiz_config.json의 stats_fold_instances)
+DEFAULT_MAX_INSTANCES = 50
+# 자동 정리 한 번에 보관할 수 있는 키 비율 (넘으면 정리하지 않고 CLI --dry-run으로 확인하도록)
+# (quiz_config.json의 stats_compact_max_archive, 배포된 통계 파일의 첫 정리는 약 7%)
+DEFAULT_MAX_ARCHIVE_RATIO = 0.1
+# 수정된 선지로 볼 최소 유사도 (이미지는 이름이 비슷한 다른 유물이 많아 유사도로 옮기지 않음)
+DEFAULT_CUTOFF = 0.8
+# 같은 이미지로 볼 pHash 해밍 거리 (dedup.py 기본 임계값과 같음)
+DEFAULT_HASH_DISTANCE = 6
+
+
+def image_key_form(key):
+    """이미지 통계 키 비교용 형태 (OS별 경로 구분자 차이 무시)"""
+    return key.replace('\\', '/')
+
+
+def key_kind(key):
+    """통계 키 종류: 'reverse' | 'image' | 'choice' | None"""
+    if key.startswith(REVERSE_PREFIX):
+        return 'reverse'
+    if '|' not in key and Path(image_key_form(key)).suffix.lower() in IMAGE_EXTENSIONS:
+        return 'image'
+    if key.count('|') >= 2:
+        return 'choice'
+    return None
+
+
+class QuestionBank:
+    """현재 출제 가능한 문제의 통계 키 (이미지 경로, choices.yaml 선지)"""
+
+    def __init__(self, image_keys, choice_data, reserved_categories=(), skip_kinds=(),
+                 reserved_roots=(), image_hashes=None):
+        # 이미지: 비교용 형태 → 현재 키, 파일 이름 → 현재 키 목록
+        self.images = {image_key_form(key): key for key in image_keys}
+        self.images_by_name = {}
+        for key in image_keys:
+            self.images_by_name.setdefault(Path(image_key_form(key)).name, []).append(key)
+        # image_hashes: 비교용 형태 → pHash (dedup.py 해시 캐시, 지워진 이미지도 남아 있으면 비교 가능)
+        self.image_hashes = image_hashes or {}
+        # reserved_roots: 목록을 나열하지 않은 콘텐츠 팩 경로 (그 아래 이미지 통계는 현재 문제로 간주)
+        self.reserved_roots = tuple(image_key_form(str(root)).rstrip('/') + '/' for root in reserved_roots)
+
+        # 선지: 현재 키, 항목 → [(카테고리, 선지)], 카테고리 → [(항목, 선지)]
+        # reserved_categories: 아직 로드하지 않은 콘텐츠 팩 카테고리 (그 통계는 현재 문제로 간주)
+        self.reserved_categories = set(reserved_categories)
+        # skip_kinds: 목록을 읽지 못한 키 종류 ('image', 'choice'), 모두 현재 문제로 간주.
+        # 역방향 키는 이미지 목록과 비교하므로 이미지와 같이 건너뜀
+        self.skip_kinds = set(skip_kinds)
+        if 'image' in self.skip_kinds:
+            self.skip_kinds.add('reverse')
+        self.choice_keys = set()
+        self.by_item = {}
+        self.by_category = {}
+        for category, items in (choice_data or {}).items():
+            if not isinstance(items, dict):
+                continue
+            for item_name, descriptions in items.items():
+                if not isinstance(descriptions, list):
+                    continue
+                for description in descriptions:
+                    self.choice_keys.add(f"{category}|{item_name}|{description}")
+                    self.by_item.setdefault(item_name, []).append((category, str(description)))
+                    self.by_category.setdefault(category, []).append((item_name, str(description)))
+
+    def is_current(self, key):
+        """현재 문제의 키인지 (알 수 없는 형식은 건드리지 않음)"""
+        kind = key_kind(key)
+        if kind in self.skip_kinds:
+            return True
+        if kind in ('reverse', 'image'):
+            path = image_key_form(key[len(REVERSE_PREFIX):] if kind == 'reverse' else key)
+            return path in self.images or path.startswith(self.reserved_roots)
+        if kind == 'choice':
+            return key in self.choice_keys or key.split('|', 1)[0] in self.reserved_categories
+        return True
+
+    def match_image(self, key, max_distance=DEFAULT_HASH_DISTANCE):
+        """파일 이름이 같거나 pHash가 같은 이미지인 현재 이미지 키 (다른 폴더로 옮겨진 경우 등).
+        이름만 비슷한 이미지는 다른 유물일 수 있어 ('미송리식토기' / '송국리식토기') 옮기지 않음"""
+        path = image_key_form(key)
+        candidates = self.images_by_name.get(Path(path).name, [])
+        if not candidates and path in self.image_hashes:
+            value = self.image_hashes[path]
+            candidates = [current for form, current in self.images.items()
+                          if form in self.image_hashes
+                          and hamming(value, self.image_hashes[form]) <= max_distance]
+        # 같은 이름/이미지가 여러 개면 어느 쪽인지 알 수 없으므로 보관
+        return candidates[0] if len(candidates) == 1 else None
+
+    def match_choice(self, key, cutoff):
+        """수정된 선지와 가장 비슷한 현재 선지 키"""
+        category, item_name, description = key.split('|', 2)
+
+        # 같은 항목의 선지 (같은 카테고리 우선), 항목이 없으면 같은 카테고리 전체
+        candidates = [(c, item_name, d) for c, d in self.by_item.get(item_name, [])]
+        candidates.sort(key=lambda c: c[0] != category)
+        if not candidates:
+            candidates = [(category, i, d) for i, d in self.by_category.get(category, [])]
+
+        best, best_ratio = None, cutoff
+        matcher = difflib.SequenceMatcher(None, b=description)
+        for candidate in candidates:
+            matcher.set_seq1(candidate[2])
+            if matcher.real_quick_ratio() < best_ratio or matcher.quick_ratio() < best_ratio:
+                continue
+            ratio = matcher.ratio()
+            if ratio > best_ratio or (best is None and ratio >= best_ratio):
+                best, best_ratio = candidate, ratio
+        return '|'.join(best) if best else None
+
+    def match(self, key, cutoff=DEFAULT_CUTOFF):
+        """고아 키를 옮길 현재 키 (없으면 None)"""
+        kind = key_kind(key)
+        if kind == 'reverse':
+            target = self.match_image(key[len(REVERSE_PREFIX):])
+            return REVERSE_PREFIX + target if target else None
+        if kind == 'image':
+            return self.match_image(key)
+        if kind == 'choice':
+            return self.match_choice(key, cutoff)
+        return None
+
+
+def hamming(a, b):
+    """두 해시의 해밍 거리"""
+    return bin(a ^ b).count('1')
+
+
+def load_image_hashes(cache_file='image_hashes.json'):
+    """dedup.py 해시 캐시의 pHash {비교용 형태: 정수} (없거나 읽지 못하면 빈 dict)"""
+    if not Path(cache_file).exists():
+        return {}
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except Exception:
+        return {}
+    return {image_key_form(key): int(entry['p'], 16) for key, entry in cache.items() if 'p' in entry}
+
+
+def find_orphans(keys, bank):
+    """현재 문제에 없는 통계 키 목록"""
+    return [key for key in keys if not bank.is_current(key)]
+
+
+def plan_compaction(keys, bank, cutoff=DEFAULT_CUTOFF):
+    """고아 키 처리 계획: ({고아 키: 옮길 키}, [보관할 키])"""
+    # 다른 OS에서 만든 같은 이미지 키가 이미 있으면 그 키로 합침
+    existing = {image_key_form(key): key for key in keys if key_kind(key) in ('image', 'reverse')}
+
+    mapping = {}
+    archive = []
+    for key in find_orphans(keys, bank):
+        target = bank.match(key, cutoff)
+        if target:
+            if key_kind(target) in ('image', 'reverse'):
+                target = existing.get(image_key_form(target), target)
+            mapping[key] = target
+        else:
+            archive.append(key)
+    return mapping, archive
+
+
+def archive_stats(removed, archive_file=ARCHIVE_FILE):
+    """정리된 통계를 보관 파일에 추가 (보관 파일도 G-counter 형식)"""
+    if not removed:
+        return
+    archive_id = 'archive-' + new_instance_id()
+    state = empty_state()
+    state['counters'] = {key: {archive_id: list(value)} for key, value in removed.items()}
+    with file_lock(archive_file):
+        write_state(merge_into(read_state(archive_file), state), archive_file)
+
+
+def compact(store, bank, cutoff=DEFAULT_CUTOFF, archive_file=ARCHIVE_FILE, dry_run=False, plan=None):
+    """고아 키를 비슷한 현재 키로 옮기고 나머지는 보관 파일로 (plan: 미리 계산한 계획). 결과 요약 반환"""
+    # 유사도 계산은 잠금 밖에서 (키 목록 스냅샷 기준)
+    mapping, archive = plan or plan_compaction(list(store.totals), bank, cutoff)
+    report = {'keys': len(store.totals), 'remapped': mapping, 'archived': archive,
+              'instances': instance_count(store.state)}
+    if dry_run:
+        return report
+
+    def change(state):
+        move_keys(state, mapping)
+        return remove_keys(state, archive)
+
+    removed = store.update(change)
+    archive_stats(removed, archive_file)
+    return report
+
+
+def compact_if_needed(store, bank, ratio=DEFAULT_ORPHAN_RATIO, max_instances=DEFAULT_MAX_INSTANCES,
+                      cutoff=DEFAULT_CUTOFF, archive_file=ARCHIVE_FILE,
+                      max_archive=DEFAULT_MAX_ARCHIVE_RATIO):
+    """고아 키 비율이나 인스턴스 수가 기준을 넘을 때만 정리 (정리 안 하면 None).
+    보관할 키가 max_archive 비율을 넘으면 아무것도 바꾸지 않고 'skipped' 표시한 계획만 반환"""
+    keys = list(store.totals)
+    orphans = find_orphans(keys, bank)
+    if keys and len(orphans) / len(keys) > ratio:
+        plan = plan_compaction(keys, bank, cutoff)
+        if len(plan[1]) > max_archive * len(keys):
+            return {'keys': len(keys), 'remapped': plan[0], 'archived': plan[1],
+                    'instances': instance_count(store.state), 'skipped': True}
+        return compact(store, bank, cutoff, archive_file, plan=plan)
+
+    if instance_count(store.state) > max_instances:
+        store.fold()
+        return {'keys': len(keys), 'remapped': {}, 'archived': [], 'instances': 1}
+    return None
+
+
+def scan_image_keys(source_folder='legacy_images'):
+    """이미지 폴더의 현재 통계 키 목록"""
+    return [str(path) for path in sorted(Path(source_folder).glob('*/*'))
+            if path.suffix.lower() in IMAGE_EXTENSIONS]
+
+
+def pack_keys(packs_folder):
+    """콘텐츠 팩 전체의 (이미지 통계 키, 선지 데이터, 읽지 못한 팩의 카테고리)
+    (CLI는 모든 팩을 로드해서 비교)"""
+    from content_pack import ContentLibrary
+    library = ContentLibrary(packs_folder)
+    image_keys = [stats_key for pack in library.packs.values() for era in pack.eras
+                  for stats_key, _, _ in pack.images_in(era['folder'])]
+    categories = library.choice_categories()
+    choice_data, failed = library.load_choices(categories)
+    for pack_name, error in failed.items():
+        print(f"⚠ 콘텐츠 팩 선지 로드 실패 {pack_name}: {error} (그 카테고리 통계는 유지)")
+    unreadable = [category for category, (pack_name, _) in categories.items() if pack_name in failed]
+    library.close()
+    return image_keys, choice_data, unreadable
+
+
+def main():
+    import yaml
+
+    parser = argparse.ArgumentParser(description="quiz_stats.json 고아 키 정리")
+    parser.add_argument('--stats', default=STATS_FILE, help="통계 파일")
+    parser.add_argument('--archive', default=ARCHIVE_FILE, help="보관 파일")
+    parser.add_argument('--source', default='legacy_images', help="이미지 폴더")
+    parser.add_argument('--choices', default='choices.yaml', help="선지 YAML 파일")
+    parser.add_argument('--packs', default='packs', help="콘텐츠 팩 폴더")
+    parser.add_argument('--hashes', default='image_hashes.json', help="dedup.py 해시 캐시 파일")
+    parser.add_argument('--cutoff', type=float, default=DEFAULT_CUTOFF, help="선지 유사도 기준 (0~1)")
+    parser.add_argument('--dry-run', action='store_true', help="계획만 출력")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🧹 통계 정리")
+    print("=" * 60)
+
+    with open(args.choices, 'r', encoding='utf-8') as f:
+        choice_data = yaml.safe_load(f) or {}
+
+    image_keys, pack_choices, unreadable = pack_keys(args.packs)
+    for category, items in pack_choices.items():
+        choice_data.setdefault(category, items)
+    bank = QuestionBank(scan_image_keys(args.source) + image_keys, choice_data, unreadable,
+                        image_hashes=load_image_hashes(args.hashes))
+    store = StatsStore(args.stats)
+    size_before = Path(args.stats).stat().st_size if Path(args.stats).exists() else 0
+
+    start = time.perf_counter()
+    report = compact(store, bank, args.cutoff, args.archive, args.dry_run)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    for old_key, new_key in report['remapped'].items():
+        print(f"  → {old_key}\n    {new_key}")
+    for key in report['archived']:
+        print(f"  📦 {key}")
+
+    print(f"\n✓ 키 {report['keys']}개 중 이동 {len(report['remapped'])}개, "
+          f"보관 {len(report['archived'])}개 ({elapsed:.0f}ms)")
+    if not args.dry_run:
+        size_after = Path(args.stats).stat().st_size
+        print(f"  인스턴스 {report['instances']}개 → 1개, {size_before:,} → {size_after:,} bytes")
+
+
+if __name__ == "__main__":
+    main()
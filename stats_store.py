@@ -0,0 +1,369 @@
+import os
+import sys
+import json
+import time
+import uuid
+import hashlib
+import threading
+import argparse
+from pathlib import Path
+from contextlib import contextmanager
+
+STATS_FILE = 'quiz_stats.json'
+STATS_VERSION = 2
+
+# 파일 구조 (인스턴스별 G-counter):
+# {"version": 2,
+#  "retired": [합쳐져서 더 쓰지 않는 인스턴스 ID, ...],
+#  "counters": {통계 키: {인스턴스 ID: [total, correct]}}}
+# 인스턴스는 자기 카운터만 늘리고, 병합은 인스턴스별 최댓값이라 순서/중복과 무관
+
+
+def new_instance_id():
+    """실행 단위 인스턴스 ID"""
+    return uuid.uuid4().hex[:12]
+
+
+def empty_state():
+    """빈 통계 상태"""
+    return {'retired': set(), 'counters': {}}
+
+
+@contextmanager
+def file_lock(path, timeout=10.0):
+    """잠금 파일 기반 권고 잠금 (Windows: msvcrt, 그 외: fcntl)"""
+    lock_path = f"{path}.lock"
+    with open(lock_path, 'a+b') as f:
+        if os.name == 'nt':
+            import msvcrt
+            deadline = time.monotonic() + timeout
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError:
+                    if time.monotonic() > deadline:
+                        raise TimeoutError(f"통계 파일 잠금 대기 시간 초과: {lock_path}")
+                    time.sleep(0.05)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            deadline = time.monotonic() + timeout
+            while True:
+                try:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if time.monotonic() > deadline:
+                        raise TimeoutError(f"통계 파일 잠금 대기 시간 초과: {lock_path}")
+                    time.sleep(0.05)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def parse_state(data, raw=b''):
+    """JSON 데이터를 통계 상태로 (예전 {키: {total, correct}} 형식도 변환)"""
+    if isinstance(data, dict) and data.get('version') == STATS_VERSION:
+        return {'retired': set(data.get('retired', [])),
+                'counters': {key: {inst: list(value) for inst, value in counts.items()}
+                             for key, counts in data.get('counters', {}).items()}}
+
+    # 예전 형식: 파일 내용으로 정한 ID 하나의 카운터로 간주
+    # (같은 파일은 같은 ID가 되어 여러 번 합쳐도 중복 집계되지 않음)
+    legacy_id = 'legacy-' + hashlib.sha1(raw).hexdigest()[:8]
+    state = empty_state()
+    for key, stat in (data or {}).items():
+        if isinstance(stat, dict) and 'total' in stat:
+            state['counters'][key] = {legacy_id: [stat['total'], stat.get('correct', 0)]}
+    return state
+
+
+def read_state(path=STATS_FILE):
+    """통계 파일 읽기 (없으면 빈 상태)"""
+    try:
+        raw = Path(path).read_bytes()
+    except FileNotFoundError:
+        return empty_state()
+    if not raw.strip():
+        return empty_state()
+    return parse_state(json.loads(raw), raw)
+
+
+def write_state(state, path=STATS_FILE):
+    """임시 파일에 쓴 뒤 교체 (읽는 쪽이 반쯤 쓴 파일을 보지 않도록)"""
+    data = {
+        'version': STATS_VERSION,
+        'retired': sorted(state['retired']),
+        'counters': state['counters'],
+    }
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, path)
+
+
+def file_signature(path=STATS_FILE):
+    """통계 파일 변경 감지용 [mtime, 크기] (없으면 None)"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [stat.st_mtime, stat.st_size]
+
+
+def merge_into(target, source):
+    """source를 target에 병합 (인스턴스별 최댓값, 제자리 수정)"""
+    target['retired'] |= source['retired']
+    counters = target['counters']
+    for key, counts in source['counters'].items():
+        merged = counters.setdefault(key, {})
+        for inst, (total, correct) in counts.items():
+            current = merged.get(inst)
+            if current is None:
+                merged[inst] = [total, correct]
+            else:
+                current[0] = max(current[0], total)
+                current[1] = max(current[1], correct)
+    return target
+
+
+def drop_retired(state):
+    """합쳐진(retired) 인스턴스 카운터 제거"""
+    retired = state['retired']
+    if not retired:
+        return state
+    for key in list(state['counters']):
+        counts = state['counters'][key]
+        for inst in [inst for inst in counts if inst in retired]:
+            del counts[inst]
+        if not counts:
+            del state['counters'][key]
+    return state
+
+
+def fold_state(state):
+    """모든 인스턴스 카운터를 새 base 인스턴스 하나로 합치고 기존 ID는 retired 처리"""
+    drop_retired(state)
+    base_id = 'base-' + new_instance_id()
+    for key, counts in state['counters'].items():
+        total = sum(value[0] for value in counts.values())
+        correct = sum(value[1] for value in counts.values())
+        state['retired'].update(counts)
+        state['counters'][key] = {base_id: [total, correct]}
+    return base_id
+
+
+def move_keys(state, mapping):
+    """통계 키 이름 변경/합치기 {예전 키: 새 키} (fold 후 base 카운터에서 옮김)"""
+    base_id = fold_state(state)
+    counters = state['counters']
+    for old_key, new_key in mapping.items():
+        counts = counters.pop(old_key, None)
+        if not counts or old_key == new_key:
+            if counts:
+                counters[old_key] = counts
+            continue
+        total, correct = counts[base_id]
+        target = counters.setdefault(new_key, {base_id: [0, 0]})[base_id]
+        target[0] += total
+        target[1] += correct
+    return base_id
+
+
+def remove_keys(state, keys):
+    """통계 키 삭제 (fold 후 base 카운터에서 제거). 삭제된 합계 {키: [total, correct]} 반환"""
+    base_id = fold_state(state)
+    removed = {}
+    for key in keys:
+        counts = state['counters'].pop(key, None)
+        if counts:
+            removed[key] = counts[base_id]
+    return removed
+
+
+def instance_count(state):
+    """카운터가 남아 있는 인스턴스 수"""
+    return len({inst for counts in state['counters'].values() for inst in counts})
+
+
+def totals_of(counts):
+    """인스턴스별 카운터 합계 {'total', 'correct'}"""
+    return {'total': sum(value[0] for value in counts.values()),
+            'correct': sum(value[1] for value in counts.values())}
+
+
+class StatsStore:
+    """여러 QuizApp 인스턴스가 함께 쓰는 통계 (G-counter + 잠금 + 읽기-병합-쓰기)"""
+
+    def __init__(self, path=STATS_FILE):
+        self.path = path
+        self.instance_id = new_instance_id()
+        # 읽기 전에 기록 (읽는 도중 다른 인스턴스가 쓰면 다음 비교에서 달라짐)
+        self.file_signature = file_signature(path)
+        try:
+            self.state = drop_retired(read_state(path))
+        except Exception as e:
+            print(f"통계 로드 실패: {e}")
+            self.state = empty_state()
+
+        # 화면 코드가 읽는 합계 {키: {'total', 'correct'}} (저장할 때마다 제자리 갱신)
+        self.totals = {}
+        # 합계가 바뀔 때 호출 listener(키, 이전 합계, 새 합계) (없어진 키는 새 합계 None)
+        self.listeners = []
+        self._refresh_totals()
+
+        # 마지막 저장 시점의 내 카운터 (retired 처리됐을 때 그 이후 증가분만 옮기기 위함)
+        self._saved = {}
+
+        # 백그라운드 정리 작업과 화면 스레드가 함께 쓰므로 상태 변경은 잠금 안에서
+        self._lock = threading.RLock()
+
+    def _refresh_totals(self):
+        """합계 뷰 갱신 (dict 객체는 그대로 유지)"""
+        counters = self.state['counters']
+        for key in [key for key in self.totals if key not in counters]:
+            self._notify(key, self.totals.pop(key), None)
+        for key, counts in counters.items():
+            total = totals_of(counts)
+            old = self.totals.get(key)
+            if old != total:
+                self.totals[key] = total
+                self._notify(key, old, total)
+
+    def _notify(self, key, old, new):
+        for listener in self.listeners:
+            listener(key, old, new)
+
+    def increment(self, key, is_correct):
+        """답변 한 건 반영 (내 인스턴스 카운터만 증가)"""
+        with self._lock:
+            counts = self.state['counters'].setdefault(key, {})
+            counter = counts.setdefault(self.instance_id, [0, 0])
+            counter[0] += 1
+            if is_correct:
+                counter[1] += 1
+            old = self.totals.get(key)
+            self.totals[key] = totals_of(counts)
+            self._notify(key, old, self.totals[key])
+
+    def _own_counters(self):
+        """내 인스턴스 카운터 {키: [total, correct]}"""
+        return {key: list(counts[self.instance_id])
+                for key, counts in self.state['counters'].items() if self.instance_id in counts}
+
+    def _adopt(self, disk):
+        """디스크 상태와 병합. 내 ID가 다른 곳에서 retired 됐으면 새 ID로 증가분만 옮김"""
+        if self.instance_id in disk['retired']:
+            old_id = self.instance_id
+            self.instance_id = new_instance_id()
+            for key, counts in self.state['counters'].items():
+                value = counts.pop(old_id, None)
+                if value is None:
+                    continue
+                saved = self._saved.get(key, [0, 0])
+                delta = [value[0] - saved[0], value[1] - saved[1]]
+                if delta[0] > 0:
+                    counts[self.instance_id] = delta
+            self._saved = {}
+        self.state = drop_retired(merge_into(disk, self.state))
+
+    def update(self, change=None):
+        """잠금 후 읽기-병합-(변경)-쓰기. change(state)의 반환값을 돌려줌 (키 이동, fold 등)"""
+        result = None
+        with self._lock, file_lock(self.path):
+            self._adopt(read_state(self.path))
+            if change is not None:
+                result = change(self.state)
+                drop_retired(self.state)
+                # fold 등으로 내 ID가 합쳐졌으면 이후 답변은 새 ID로
+                if self.instance_id in self.state['retired']:
+                    self.instance_id = new_instance_id()
+            write_state(self.state, self.path)
+            self.file_signature = file_signature(self.path)
+            self._saved = self._own_counters()
+            self._refresh_totals()
+        return result
+
+    def save(self):
+        """다른 인스턴스의 기록과 병합해 저장"""
+        self.update()
+
+    def fold(self):
+        """인스턴스 카운터를 하나로 합쳐 파일 크기 줄이기"""
+        self.update(fold_state)
+
+    def move_keys(self, mapping):
+        """통계 키 이동/합치기 {예전 키: 새 키}"""
+        self.update(lambda state: move_keys(state, mapping))
+
+
+def collect_files(paths):
+    """파일/폴더 인자에서 통계 JSON 파일 목록"""
+    files = []
+    for arg in paths:
+        path = Path(arg)
+        if path.is_dir():
+            files.extend(sorted(path.rglob('*.json')))
+        elif path.exists():
+            files.append(path)
+        else:
+            print(f"⚠ 파일 없음: {arg}")
+    return files
+
+
+def merge_files(files):
+    """여러 통계 파일을 한 번에 병합 (파일마다 한 번 읽고 제자리 병합)"""
+    merged = empty_state()
+    failed = 0
+    for path in files:
+        try:
+            merge_into(merged, read_state(path))
+        except Exception as e:
+            print(f"❌ {path}: {e}")
+            failed += 1
+    return drop_retired(merged), failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="내보낸 통계 파일 일괄 병합")
+    parser.add_argument('inputs', nargs='*', help="병합할 통계 파일 또는 폴더")
+    parser.add_argument('--output', default=STATS_FILE, help="결과 통계 파일 (기존 내용과 병합)")
+    parser.add_argument('--fold', action='store_true', help="인스턴스 카운터를 하나로 합치기")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("📊 통계 병합")
+    print("=" * 60)
+
+    files = collect_files(args.inputs)
+    start = time.perf_counter()
+    merged, failed = merge_files(files)
+    read_ms = (time.perf_counter() - start) * 1000
+
+    # 실행 중인 퀴즈와 같은 잠금을 사용하므로 사용 중인 프로필에도 안전하게 병합
+    def apply(state):
+        merge_into(state, merged)
+        if args.fold:
+            fold_state(state)
+
+    store = StatsStore(args.output)
+    store.update(apply)
+
+    keys = len(store.totals)
+    answers = sum(stat['total'] for stat in store.totals.values())
+    instances = instance_count(store.state)
+    print(f"✓ {len(files) - failed}개 파일 병합 ({read_ms:.0f}ms) → {args.output}")
+    print(f"  키 {keys}개, 답변 {answers}회, 인스턴스 {instances}개")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+import gc
+
+from PIL import Image
+
+from asset_pack import build_pack, open_pack
+
+
+def test_close_after_read(tmp_path):
+    source = tmp_path / 'legacy_images'
+    (source / '1.구석기').mkdir(parents=True)
+    Image.new('RGB', (40, 30), 'red').save(source / '1.구석기' / '주먹도끼.png')
+    pack_file = tmp_path / 'assets.pack'
+    build_pack(str(source), str(pack_file), str(tmp_path / 'manifest.json'))
+
+    pack = open_pack(str(pack_file), str(source), str(tmp_path / 'manifest.json'))
+    [entry] = pack.images_in('1.구석기')
+    data = pack.read(entry['stats_key'])
+    with pack.open_image(entry['stats_key']) as img:
+        assert img.size == (40, 30)
+
+    # 읽은 바이트를 들고 있어도 닫을 수 있어야 함 (종료 시 BufferError 방지)
+    gc.disable()
+    try:
+        pack.close()
+    finally:
+        gc.enable()
+    assert data.startswith(b'\x89PNG')
@@ -0,0 +1,64 @@
+from types import SimpleNamespace
+
+from PIL import Image
+
+from caption_ocr import read_lines, pick_caption, propose_name, OCR_MIN_HEIGHT
+
+
+class FakeTesseract:
+    """pytesseract 대신 정해진 image_to_data 결과를 돌려주는 객체"""
+
+    Output = SimpleNamespace(DICT='dict')
+
+    def __init__(self, words):
+        # words: [(텍스트, 신뢰도, block, par, line, top)]
+        self.data = {key: [word[i] for word in words] for i, key in
+                     enumerate(('text', 'conf', 'block_num', 'par_num', 'line_num', 'top'))}
+        self.calls = []
+
+    def image_to_data(self, image, lang, config, output_type):
+        self.calls.append((image.size, image.mode, lang, config, output_type))
+        return self.data
+
+
+WORDS = [
+    # 블록/문단 헤더 (conf -1)와 빈 단어는 제외
+    ('', '-1', 1, 0, 0, 0),
+    ('', -1, 1, 1, 0, 0),
+    # 두 번째 줄이 먼저 나와도 top 기준으로 정렬
+    ('주먹도끼', '91.5', 1, 1, 2, 50),
+    ('찍개', 88.5, 1, 1, 2, 52),
+    ('그림', '70', 1, 1, 1, 10),
+    ('3-1', '95', 1, 1, 1, 12),
+    ('잡음', '-1', 1, 1, 1, 12),
+    ('   ', '80', 1, 1, 1, 14),
+    ('Fig.', '60', 2, 1, 1, 90),
+]
+
+
+def test_read_lines_groups_and_filters():
+    tesseract = FakeTesseract(WORDS)
+    lines = read_lines(tesseract, Image.new('RGB', (200, 40), 'white'), 'kor', 6)
+
+    assert lines == [('그림 3-1', 82.5), ('주먹도끼 찍개', 90.0), ('Fig.', 60.0)]
+    # 작은 띠는 흑백으로 바꿔 OCR_MIN_HEIGHT까지 확대
+    size, mode, lang, config, output_type = tesseract.calls[0]
+    assert size == (400, OCR_MIN_HEIGHT) and mode == 'L'
+    assert (lang, config, output_type) == ('kor', '--psm 6', 'dict')
+
+
+def test_pick_caption_nearest_hangul_line():
+    lines = read_lines(FakeTesseract(WORDS), Image.new('L', (200, 100)), 'kor', 6)
+    # 아래/오른쪽 영역은 첫 줄, 위쪽 영역은 크롭에 가까운 마지막 줄 (한글 없는 줄 제외)
+    assert pick_caption('below', lines) == ('그림 3-1', 82.5)
+    assert pick_caption('right', lines) == ('그림 3-1', 82.5)
+    assert pick_caption('above', lines) == ('주먹도끼 찍개', 90.0)
+    assert pick_caption('above', [('Fig. 3', 90.0)]) is None
+
+
+def test_propose_name_keeps_word_boundaries():
+    assert propose_name('주먹도끼/찍개') == '주먹도끼 찍개'
+    assert propose_name('① 빗살무늬 토기: 서울 암사동') == '빗살무늬 토기 서울 암사동'
+    assert propose_name('(2) 반달 돌칼.') == '반달 돌칼'
+    assert propose_name('3.') is None
+    assert propose_name('Fig. 3') is None
@@ -0,0 +1,43 @@
+import io
+
+import pytest
+from PIL import Image
+
+from image_loader import load_image
+
+
+def encoded(img, format='PNG', **params):
+    buffer = io.BytesIO()
+    img.save(buffer, format, **params)
+    return buffer.getvalue()
+
+
+def palette_image(size=(2400, 1600)):
+    img = Image.new('RGB', size, 'white')
+    img.paste((200, 30, 30), (0, 0, size[0] // 2, size[1]))
+    return img.quantize(16)
+
+
+@pytest.mark.parametrize('source, mode', [
+    (encoded(palette_image()), 'RGB'),
+    (encoded(palette_image(), transparency=0), 'RGBA'),
+    (encoded(palette_image(), 'GIF'), 'RGB'),
+    (encoded(Image.new('1', (2400, 1600), 1)), 'L'),
+], ids=['palette', 'palette-transparent', 'gif', 'bilevel'])
+def test_large_palette_and_bilevel_images_reduce(source, mode):
+    img, report = load_image(source, (790, 440))
+    assert report.strategy == 'reduce'
+    assert img.mode == mode
+    assert img.height == 440 and abs(img.width - 660) <= 1
+
+
+def test_reduce_keeps_palette_colors():
+    img, _ = load_image(encoded(palette_image()), (790, 440))
+    assert img.getpixel((10, 10)) == (200, 30, 30)
+    assert img.getpixel((650, 10)) == (255, 255, 255)
+
+
+def test_unsupported_mode_falls_back_to_thumbnail():
+    img, report = load_image(Image.new('I;16', (2400, 1600)), (790, 440))
+    assert report.strategy == 'thumbnail'
+    assert img.height == 440 and abs(img.width - 660) <= 1
@@ -0,0 +1,74 @@
+import pytest
+
+from memory_probe import MemoryProbe
+from soak import check_budget
+
+MB = 1024 * 1024
+
+
+def sample(answers, traced_mb, rss_mb=None, objects=1000, tk=None):
+    """합성 표본 (sample()이 기록하는 키 중 growth/check_budget이 쓰는 것만)"""
+    return {'answers': answers, 'traced_bytes': int(traced_mb * MB),
+            'rss_bytes': int(rss_mb * MB) if rss_mb is not None else None,
+            'objects': objects, 'tk': tk}
+
+
+def tk(images, commands, callbacks=0):
+    return {'images': images, 'commands': commands, 'widgets': 10, 'callbacks': callbacks}
+
+
+@pytest.fixture
+def probe():
+    probe = MemoryProbe(every=500)
+    yield probe
+    probe.stop()
+
+
+def test_growth_since_sample(probe):
+    probe.samples = [sample(500, 10, 100, 1000, tk(5, 900)),
+                     sample(1000, 20, 120, 1500, tk(9, 910)),
+                     sample(1500, 21, 125, 1600, tk(9, 912, 3))]
+    assert probe.growth() == {'traced_bytes': 11 * MB, 'objects': 600, 'rss_bytes': 25 * MB,
+                              'tk_images': 4, 'tk_commands': 12, 'tk_widgets': 0,
+                              'tk_callbacks': 3}
+    assert probe.growth(1)['traced_bytes'] == 1 * MB
+    assert probe.growth(3) == {}
+
+
+def test_growth_without_rss_or_tk(probe):
+    probe.samples = [sample(500, 10), sample(1000, 12, 50)]
+    assert probe.growth() == {'traced_bytes': 2 * MB, 'objects': 0}
+
+
+def test_check_budget_passes_after_warmup(probe):
+    # 워밍업 전 증가(10 → 40MB)는 세지 않음
+    probe.samples = [sample(500, 10, 100, tk=tk(5, 900)),
+                     sample(1000, 40, 200, tk=tk(30, 990)),
+                     sample(1500, 42, 210, tk=tk(31, 995))]
+    ok, messages = check_budget(probe, warmup=1000, budget_mb=16, rss_budget_mb=64,
+                                max_tk_growth=20)
+    assert ok
+    assert len(messages) == 5 and all(m.startswith('✓') for m in messages)
+
+
+def test_check_budget_fails_on_leak(probe):
+    probe.samples = [sample(1000, 10, 100, tk=tk(5, 900)),
+                     sample(2000, 30, 120, tk=tk(5, 900)),
+                     sample(3000, 50, 130, tk=tk(60, 900))]
+    ok, messages = check_budget(probe, warmup=1000, budget_mb=16, rss_budget_mb=64,
+                                max_tk_growth=20)
+    assert not ok
+    failed = [m for m in messages if m.startswith('❌')]
+    assert len(failed) == 2
+    assert any('추적 메모리' in m for m in failed) and any('Tk 이미지' in m for m in failed)
+
+
+def test_check_budget_needs_samples_after_warmup(probe):
+    probe.samples = [sample(500, 10), sample(1000, 11)]
+    ok, messages = check_budget(probe, warmup=1000, budget_mb=16, rss_budget_mb=64,
+                                max_tk_growth=20)
+    assert not ok and '표본이 부족' in messages[0]
+
+    probe.samples = [sample(500, 10)]
+    ok, _ = check_budget(probe, warmup=5000, budget_mb=16, rss_budget_mb=64, max_tk_growth=20)
+    assert not ok
@@ -0,0 +1,48 @@
+from stats_compact import QuestionBank, plan_compaction, compact_if_needed
+from stats_store import StatsStore
+
+CURRENT = ['legacy_images/3.청동기/송국리식토기.png',
+           'legacy_images/7.신라/황초령비(함경도)_진흥왕.png',
+           'legacy_images/13.조선 전기/경복궁(태조시기).png']
+
+
+def test_image_keys_move_only_on_exact_name_or_hash():
+    hashes = {'legacy_images/13.조선/경복궁 (태조).png': 0x0f0f,
+              'legacy_images/13.조선 전기/경복궁(태조시기).png': 0x0f0e,
+              'legacy_images/3.청동기/미송리식토기.png': 0xffff0000,
+              'legacy_images/3.청동기/송국리식토기.png': 0x0000ffff}
+    bank = QuestionBank(CURRENT, {}, image_hashes=hashes)
+    keys = ['legacy_images\\13.조선\\경복궁(태조시기).png',      # 이름이 같음 (다른 폴더)
+            'reverse:legacy_images/13.조선/경복궁 (태조).png',     # pHash가 같음
+            'legacy_images/3.청동기/미송리식토기.png',             # 이름만 비슷한 다른 유물
+            'legacy_images/5.고구려/마운령비(함경도)_진흥왕.png'] + CURRENT
+    mapping, archive = plan_compaction(keys, bank)
+    assert mapping == {
+        keys[0]: 'legacy_images/13.조선 전기/경복궁(태조시기).png',
+        keys[1]: 'reverse:legacy_images/13.조선 전기/경복궁(태조시기).png',
+    }
+    assert archive == [keys[2], keys[3]]
+
+
+def test_choice_keys_still_fuzzy():
+    bank = QuestionBank([], {'농서': {'농상집요': ['이암이 원나라에서 수입']}})
+    mapping, archive = plan_compaction(['농서|농상집요|이암, 원나라 수입'], bank)
+    assert mapping == {'농서|농상집요|이암, 원나라 수입': '농서|농상집요|이암이 원나라에서 수입'}
+    assert archive == []
+
+
+def test_compact_if_needed_skips_large_archive(tmp_path):
+    store = StatsStore(str(tmp_path / 'stats.json'))
+    orphans = [f'legacy_images/1.구석기/없는 유물{i}.png' for i in range(3)]
+    for key in orphans + CURRENT:
+        store.increment(key, True)
+    store.save()
+
+    bank = QuestionBank(CURRENT, {})
+    report = compact_if_needed(store, bank, max_archive=0.1, archive_file=str(tmp_path / 'a.json'))
+    assert report['skipped'] and len(report['archived']) == 3
+    assert set(store.totals) == set(orphans + CURRENT)
+
+    report = compact_if_needed(store, bank, max_archive=0.5, archive_file=str(tmp_path / 'a.json'))
+    assert not report.get('skipped')
+    assert set(store.totals) == set(CURRENT)
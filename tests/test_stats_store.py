@@ -0,0 +1,110 @@
+import json
+import threading
+
+from stats_store import StatsStore, STATS_VERSION, read_state, merge_into, instance_count
+
+
+def answer(store, key, total, correct):
+    for i in range(total):
+        store.increment(key, i < correct)
+
+
+def on_disk(path):
+    """새 인스턴스로 읽은 합계"""
+    return StatsStore(str(path)).totals
+
+
+def test_legacy_file_upgrade(tmp_path):
+    path = tmp_path / 'quiz_stats.json'
+    path.write_text(json.dumps({'a.png': {'total': 3, 'correct': 2},
+                                'b.png': {'total': 1, 'correct': 0}}), encoding='utf-8')
+
+    store = StatsStore(str(path))
+    assert store.totals == {'a.png': {'total': 3, 'correct': 2}, 'b.png': {'total': 1, 'correct': 0}}
+    store.increment('a.png', True)
+    store.save()
+
+    data = json.loads(path.read_text(encoding='utf-8'))
+    assert data['version'] == STATS_VERSION
+    [legacy_id] = [inst for inst in data['counters']['b.png']]
+    assert legacy_id.startswith('legacy-')
+    assert data['counters']['a.png'] == {legacy_id: [3, 2], store.instance_id: [1, 1]}
+    assert on_disk(path) == {'a.png': {'total': 4, 'correct': 3}, 'b.png': {'total': 1, 'correct': 0}}
+
+
+def test_legacy_file_merged_twice_counts_once(tmp_path):
+    path = tmp_path / 'old.json'
+    path.write_text(json.dumps({'a.png': {'total': 5, 'correct': 4}}), encoding='utf-8')
+    state = merge_into(read_state(str(path)), read_state(str(path)))
+    assert state['counters']['a.png'] == {next(iter(state['counters']['a.png'])): [5, 4]}
+
+
+def test_two_instances_save_concurrently(tmp_path):
+    path = tmp_path / 'quiz_stats.json'
+    stores = [StatsStore(str(path)) for _ in range(4)]
+
+    def run(store):
+        for _ in range(25):
+            store.increment('a.png', True)
+            store.increment('b.png', False)
+            store.save()
+
+    threads = [threading.Thread(target=run, args=(store,)) for store in stores]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert on_disk(path) == {'a.png': {'total': 100, 'correct': 100},
+                             'b.png': {'total': 100, 'correct': 0}}
+    # 마지막으로 저장한 인스턴스는 모두의 기록을 봄
+    stores[0].save()
+    assert stores[0].totals['a.png'] == {'total': 100, 'correct': 100}
+
+
+def test_retired_instance_is_readopted(tmp_path):
+    path = tmp_path / 'quiz_stats.json'
+    first, second = StatsStore(str(path)), StatsStore(str(path))
+    answer(first, 'a.png', 2, 1)
+    first.save()
+    old_id = first.instance_id
+
+    # 다른 인스턴스가 fold → first의 ID는 retired
+    answer(second, 'a.png', 1, 1)
+    second.fold()
+    assert old_id in read_state(str(path))['retired']
+
+    # fold 이후 증가분만 새 ID로 옮겨져야 함 (저장했던 2건은 base 카운터에 이미 있음)
+    answer(first, 'a.png', 3, 3)
+    first.save()
+    assert first.instance_id != old_id
+    assert first.totals['a.png'] == {'total': 6, 'correct': 5}
+    assert on_disk(path)['a.png'] == {'total': 6, 'correct': 5}
+
+    first.increment('a.png', False)
+    first.save()
+    assert on_disk(path)['a.png'] == {'total': 7, 'correct': 5}
+
+
+def test_move_keys_after_fold(tmp_path):
+    path = tmp_path / 'quiz_stats.json'
+    first, second = StatsStore(str(path)), StatsStore(str(path))
+    answer(first, 'old.png', 4, 3)
+    answer(first, 'keep.png', 2, 2)
+    answer(second, 'new.png', 1, 0)
+    first.save()
+    second.save()
+
+    second.fold()
+    second.move_keys({'old.png': 'new.png', 'missing.png': 'x.png'})
+    state = read_state(str(path))
+    assert instance_count(state) == 1
+    assert on_disk(path) == {'new.png': {'total': 5, 'correct': 3},
+                             'keep.png': {'total': 2, 'correct': 2}}
+
+    # first는 이동 전 키로 답변을 계속해도 옮겨진 기록을 되살리지 않음
+    first.increment('keep.png', True)
+    first.save()
+    assert on_disk(path) == {'new.png': {'total': 5, 'correct': 3},
+                             'keep.png': {'total': 3, 'correct': 3}}
+    assert first.totals == on_disk(path)
@@ -0,0 +1,185 @@
+import json
+import math
+import time
+import hashlib
+import argparse
+from pathlib import Path
+import cv2
+import numpy as np
+from PIL import Image
+
+from image_loader import open_image
+
+TILE_CACHE_FOLDER = 'tile_cache'
+
+# 타일 한 변 (px). 타일 (행, 열, TILE, TILE, 3) 배열을 그대로 파일에 저장
+TILE_SIZE = 256
+
+# 축소 레벨 (1/2, 1/4, ...)은 긴 변이 이 크기 이하가 될 때까지 생성 (축소 화면용)
+OVERVIEW_MAX_SIDE = 1024
+
+# 직접 스캔한 대형 원본 허용 픽셀 수 (PIL 기본 제한은 약 9천만 픽셀)
+MAX_SCAN_PIXELS = 1_000_000_000
+
+
+def cache_key(source):
+    """원본 파일별 캐시 이름 (경로, 수정 시각, 크기 기준)"""
+    path = Path(source).resolve()
+    stat = path.stat()
+    data = f"{path.as_posix()}|{stat.st_mtime}|{stat.st_size}"
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()[:16]
+
+
+class TileLevel:
+    """한 해상도 레벨의 타일 배열 (np.memmap, 필요한 타일만 디스크에서 읽음)"""
+
+    def __init__(self, path, width, height, tile=TILE_SIZE, mode='r'):
+        self.width = width
+        self.height = height
+        self.tile = tile
+        shape = (math.ceil(height / tile), math.ceil(width / tile), tile, tile, 3)
+        self.tiles = np.memmap(path, np.uint8, mode, shape=shape)
+
+    def region(self, x1, y1, x2, y2):
+        """사각형 영역 BGR 배열 (겹치는 타일만 복사)"""
+        x1, x2 = max(0, x1), min(self.width, x2)
+        y1, y2 = max(0, y1), min(self.height, y2)
+        out = np.zeros((max(0, y2 - y1), max(0, x2 - x1), 3), np.uint8)
+        if out.size == 0:
+            return out
+
+        t = self.tile
+        for row in range(y1 // t, (y2 - 1) // t + 1):
+            ty1, ty2 = max(y1, row * t), min(y2, (row + 1) * t)
+            for col in range(x1 // t, (x2 - 1) // t + 1):
+                tx1, tx2 = max(x1, col * t), min(x2, (col + 1) * t)
+                out[ty1 - y1:ty2 - y1, tx1 - x1:tx2 - x1] = \
+                    self.tiles[row, col, ty1 - row * t:ty2 - row * t, tx1 - col * t:tx2 - col * t]
+        return out
+
+    def write_band(self, row, band):
+        """타일 한 행 높이의 띠 (높이 <= TILE, 너비 = 레벨 너비) 쓰기"""
+        t = self.tile
+        for col in range(self.tiles.shape[1]):
+            part = band[:, col * t:(col + 1) * t]
+            self.tiles[row, col, :part.shape[0], :part.shape[1]] = part
+
+
+def build_cache(source, folder, key, tile=TILE_SIZE):
+    """원본을 한 번 디코딩해서 타일 캐시(+축소 레벨) 생성. 헤더 반환
+
+    전체 해상도 배열 복사본을 만들지 않도록 띠 단위로 변환/기록
+    """
+    folder = Path(folder)
+    folder.mkdir(parents=True, exist_ok=True)
+
+    limit, Image.MAX_IMAGE_PIXELS = Image.MAX_IMAGE_PIXELS, MAX_SCAN_PIXELS
+    try:
+        img = open_image(source)
+    finally:
+        Image.MAX_IMAGE_PIXELS = limit
+
+    with img:
+        img.load()
+        width, height = img.size
+        level = TileLevel(folder / f"{key}.0.tiles", width, height, tile, mode='w+')
+        for row in range(level.tiles.shape[0]):
+            band = img.crop((0, row * tile, width, min(height, (row + 1) * tile))).convert('RGB')
+            level.write_band(row, cv2.cvtColor(np.asarray(band), cv2.COLOR_RGB2BGR))
+    level.tiles.flush()
+
+    # 축소 레벨: 이전 레벨의 타일 두 행씩 읽어 절반 크기로
+    sizes = [[width, height]]
+    while max(sizes[-1]) > OVERVIEW_MAX_SIDE:
+        w, h = max(1, sizes[-1][0] // 2), max(1, sizes[-1][1] // 2)
+        smaller = TileLevel(folder / f"{key}.{len(sizes)}.tiles", w, h, tile, mode='w+')
+        for row in range(smaller.tiles.shape[0]):
+            y1, y2 = row * tile, min(h, (row + 1) * tile)
+            band = level.region(0, y1 * 2, level.width, y2 * 2)
+            smaller.write_band(row, cv2.resize(band, (w, y2 - y1), interpolation=cv2.INTER_AREA))
+        smaller.tiles.flush()
+        sizes.append([w, h])
+        level = smaller
+
+    # 헤더는 마지막에 기록 (헤더가 있으면 캐시가 완성된 것)
+    header = {'source': Path(source).as_posix(), 'tile': tile, 'levels': sizes}
+    with open(folder / f"{key}.json", 'w', encoding='utf-8') as f:
+        json.dump(header, f, ensure_ascii=False)
+    return header
+
+
+class TiledImage:
+    """디스크 타일 캐시 기반 이미지. 화면/크롭은 필요한 타일만 읽어서 메모리 사용량 일정"""
+
+    def __init__(self, folder, key, header):
+        tile = header['tile']
+        self.levels = [TileLevel(Path(folder) / f"{key}.{i}.tiles", w, h, tile)
+                       for i, (w, h) in enumerate(header['levels'])]
+        self.width, self.height = header['levels'][0]
+
+    @property
+    def shape(self):
+        """numpy 배열과 같은 (높이, 너비, 채널)"""
+        return self.height, self.width, 3
+
+    @classmethod
+    def cached(cls, source, cache_folder=TILE_CACHE_FOLDER):
+        """이미 만든 캐시가 있으면 열기 (없으면 None)"""
+        key = cache_key(source)
+        header_file = Path(cache_folder) / f"{key}.json"
+        if not header_file.exists():
+            return None
+        with open(header_file, 'r', encoding='utf-8') as f:
+            return cls(cache_folder, key, json.load(f))
+
+    @classmethod
+    def open(cls, source, cache_folder=TILE_CACHE_FOLDER):
+        """캐시 열기 (없으면 원본을 한 번 디코딩해서 생성). (이미지, 생성 여부) 반환"""
+        image = cls.cached(source, cache_folder)
+        if image is not None:
+            return image, False
+        key = cache_key(source)
+        return cls(cache_folder, key, build_cache(source, cache_folder, key)), True
+
+    def region(self, x1, y1, x2, y2):
+        """원본 해상도 영역 BGR 배열"""
+        return self.levels[0].region(x1, y1, x2, y2)
+
+    def viewport(self, zoom, offset_x, offset_y, width, height):
+        """확대/축소된 이미지의 화면 영역 (offset은 확대 후 좌표). 화면 배율 이상인 가장 작은 레벨 사용"""
+        level_index = 0
+        while level_index + 1 < len(self.levels) and 2 ** (level_index + 1) <= 1 / zoom:
+            level_index += 1
+        level = self.levels[level_index]
+        scale = zoom * 2 ** level_index
+
+        # 화면에 보일 크기 (확대 후 이미지 경계까지)
+        out_w = max(0, min(width, int(self.width * zoom) - offset_x))
+        out_h = max(0, min(height, int(self.height * zoom) - offset_y))
+        if out_w == 0 or out_h == 0:
+            return np.zeros((out_h, out_w, 3), np.uint8)
+
+        x1, y1 = int(offset_x / scale), int(offset_y / scale)
+        x2 = min(level.width, math.ceil((offset_x + out_w) / scale))
+        y2 = min(level.height, math.ceil((offset_y + out_h) / scale))
+        patch = level.region(x1, y1, max(x2, x1 + 1), max(y2, y1 + 1))
+        interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR
+        return cv2.resize(patch, (out_w, out_h), interpolation=interpolation)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대형 스캔 이미지 타일 캐시 생성")
+    parser.add_argument('images', nargs='+', help="원본 이미지")
+    parser.add_argument('--cache', default=TILE_CACHE_FOLDER, help="타일 캐시 폴더")
+    args = parser.parse_args()
+
+    for source in args.images:
+        start = time.perf_counter()
+        image, built = TiledImage.open(source, args.cache)
+        elapsed = (time.perf_counter() - start) * 1000
+        levels = ' / '.join(f"{level.width}x{level.height}" for level in image.levels)
+        print(f"{'✓ 생성' if built else '• 재사용'} {source}: {levels} ({elapsed:.0f}ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+import os
+import sys
+import json
+import time
+import threading
+import functools
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+TRACE_FILE = 'quiz_trace.json'
+DEFAULT_BUFFER_SIZE = 10000
+
+_NULL_SPAN = nullcontext()
+
+
+class Tracer:
+    """단조 시계 기반 구간 기록기. 최근 N개 구간만 링 버퍼에 보관"""
+
+    def __init__(self, enabled=False, buffer_size=DEFAULT_BUFFER_SIZE):
+        self.enabled = enabled
+        self.spans = deque(maxlen=buffer_size)
+        self.origin_ns = time.perf_counter_ns()
+
+    @classmethod
+    def from_config(cls, config):
+        """quiz_config.json 설정으로 생성"""
+        return cls(enabled=config.get('trace_enabled', False),
+                   buffer_size=config.get('trace_buffer_size', DEFAULT_BUFFER_SIZE))
+
+    def add(self, name, start_ns, end_ns, **args):
+        """구간 한 개 기록"""
+        if self.enabled:
+            self.spans.append((name, start_ns, end_ns - start_ns, threading.get_ident(), args))
+
+    def span(self, name, **args):
+        """with 블록 구간 측정 (비활성화 시 아무것도 하지 않음)"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return self._span(name, args)
+
+    @contextmanager
+    def _span(self, name, args):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.add(name, start, time.perf_counter_ns(), **args)
+
+    def to_json(self):
+        """단순 JSON 형식 (ms 단위)"""
+        return [{
+            'name': name,
+            'start_ms': (start - self.origin_ns) / 1e6,
+            'duration_ms': duration / 1e6,
+            'thread': thread,
+            'args': args,
+        } for name, start, duration, thread, args in self.spans]
+
+    def to_chrome_trace(self):
+        """Chrome trace 형식 (chrome://tracing, Perfetto에서 열기)"""
+        pid = os.getpid()
+        return {
+            'traceEvents': [{
+                'name': name,
+                'ph': 'X',
+                'ts': (start - self.origin_ns) / 1000,
+                'dur': duration / 1000,
+                'pid': pid,
+                'tid': thread,
+                'args': args,
+            } for name, start, duration, thread, args in self.spans],
+            'displayTimeUnit': 'ms',
+        }
+
+    def export(self, path=TRACE_FILE, fmt='chrome'):
+        """기록된 구간을 파일로 내보내기"""
+        data = self.to_chrome_trace() if fmt == 'chrome' else self.to_json()
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+
+
+def traced(name):
+    """메서드 실행 구간을 self.tracer에 기록하는 데코레이터"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            tracer = self.tracer
+            if not tracer.enabled:
+                return func(self, *args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                tracer.add(name, start, time.perf_counter_ns())
+        return wrapper
+    return decorator
+
+
+def load_durations(path):
+    """내보낸 트레이스 파일에서 이름별 구간 길이(ms) 목록 읽기"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    durations = {}
+    if isinstance(data, dict):
+        for event in data.get('traceEvents', []):
+            durations.setdefault(event['name'], []).append(event['dur'] / 1000)
+    else:
+        for span in data:
+            durations.setdefault(span['name'], []).append(span['duration_ms'])
+    return durations
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else TRACE_FILE
+    if not os.path.exists(path):
+        print(f"⚠ '{path}' 파일이 없습니다.")
+        return
+
+    print(f"{'구간':<24}{'횟수':>8}{'평균(ms)':>12}{'p95(ms)':>12}{'최대(ms)':>12}")
+    for name, values in sorted(load_durations(path).items()):
+        values.sort()
+        p95 = values[min(len(values) - 1, int(len(values) * 0.95))]
+        print(f"{name:<24}{len(values):>8}{sum(values) / len(values):>12.2f}"
+              f"{p95:>12.2f}{values[-1]:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
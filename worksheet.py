@@ -0,0 +1,437 @@
+import os
+import json
+import time
+import heapq
+import random
+import hashlib
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from image_loader import load_image
+from stats_store import STATS_FILE, StatsStore
+from quiz_core import (IMAGE_FOLDER, CHOICES_FILE, load_categories, folder_images, load_choice_data,
+                       choice_questions, new_seed)
+
+OUTPUT_FOLDER = 'worksheets'
+CACHE_FOLDER = 'worksheet_cache'
+
+# A4 (150dpi)
+DPI = 150
+PAGE_SIZE = (1240, 1754)
+MARGIN = 75
+
+# 유물 문제 이미지 칸 (미리 축소해서 모든 워커가 공유)
+IMAGE_CELL = (520, 300)
+IMAGE_COLUMNS = 2
+
+# 보기 수 (정답 포함)
+OPTION_COUNT = 4
+OPTION_MARKS = '①②③④⑤⑥⑦⑧⑨⑩'
+
+# 한글 글꼴 후보 (--font로 지정 가능)
+FONT_CANDIDATES = [
+    'C:/Windows/Fonts/malgun.ttf',
+    '/usr/share/fonts/truetype/nanum/NanumGothic.ttf',
+    '/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc',
+    '/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc',
+    '/System/Library/Fonts/AppleSDGothicNeo.ttc',
+]
+
+
+def find_font(path=None):
+    """한글 글꼴 파일 (없으면 None → PIL 기본 글꼴)"""
+    for candidate in [path] + FONT_CANDIDATES:
+        if candidate and Path(candidate).exists():
+            return candidate
+    return None
+
+
+def lookup_stat(stats, key):
+    """통계 조회 (Windows에서 쌓인 '\\' 경로 키도 찾음)"""
+    return stats.get(key) or stats.get(key.replace('/', '\\'))
+
+
+def weakness(stat, focus):
+    """출제 가중치: 보정 오답률 ((오답+1)/(시도+2))의 focus 제곱 (0이면 균등)"""
+    total, correct = (stat['total'], stat['correct']) if stat else (0, 0)
+    return (1 - (correct + 1) / (total + 2)) ** focus
+
+
+def weighted_sample(rng, items, weights, k):
+    """가중치 비례 비복원 추출 (Efraimidis-Spirakis, O(n log k))"""
+    keyed = ((rng.random() ** (1 / w), i) for i, w in enumerate(weights) if w > 0)
+    return [items[i] for _, i in heapq.nlargest(k, keyed)]
+
+
+def make_options(rng, answer, pool):
+    """정답 + 오답 보기 (섞어서). (보기 목록, 정답 번호(0부터)) 반환"""
+    others = [name for name in pool if name != answer]
+    options = rng.sample(others, min(OPTION_COUNT - 1, len(others))) + [answer]
+    rng.shuffle(options)
+    return options, options.index(answer)
+
+
+# ---------------------------------------------------------------- 이미지 캐시
+
+def signature_of(path):
+    """변경 감지용 (수정 시각, 크기)"""
+    stat = Path(path).stat()
+    return [stat.st_mtime, stat.st_size]
+
+
+def shrink_image(path):
+    """이미지 칸 크기로 축소해서 흰 바탕 칸 배열로 (프로세스 풀 워커)"""
+    try:
+        img, _ = load_image(path, IMAGE_CELL)
+        if img.mode in ('RGBA', 'LA', 'P'):
+            rgba = img.convert('RGBA')
+            img = Image.new('RGB', rgba.size, 'white')
+            img.paste(rgba, mask=rgba.split()[3])
+        cell = Image.new('RGB', IMAGE_CELL, 'white')
+        cell.paste(img.convert('RGB'), ((IMAGE_CELL[0] - img.width) // 2,
+                                        (IMAGE_CELL[1] - img.height) // 2))
+        return np.asarray(cell), None
+    except Exception as e:
+        return None, str(e)
+
+
+def build_image_cache(paths, cache_folder=CACHE_FOLDER, workers=None):
+    """출제할 이미지를 한 번만 축소해서 (개수, 높이, 너비, 3) 배열 파일로 저장. 파일 경로 반환
+
+    워커들은 같은 파일을 memmap으로 열어 페이지 캐시를 공유 (이미지마다 다시 디코딩하지 않음)
+    """
+    cache_folder = Path(cache_folder)
+    cache_folder.mkdir(parents=True, exist_ok=True)
+    signature = json.dumps([IMAGE_CELL, [[p, signature_of(p)] for p in paths]], ensure_ascii=False)
+    key = hashlib.sha1(signature.encode('utf-8')).hexdigest()[:16]
+    cache_file = cache_folder / f"{key}.npy"
+    if cache_file.exists():
+        return cache_file, False
+
+    width, height = IMAGE_CELL
+    tmp_file = cache_folder / f"{key}.npy.tmp"
+    cells = np.lib.format.open_memmap(tmp_file, 'w+', np.uint8, (len(paths), height, width, 3))
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        for i, (cell, error) in enumerate(executor.map(shrink_image, paths, chunksize=4)):
+            if error:
+                print(f"❌ {paths[i]}: {error}")
+                cells[i] = 255
+            else:
+                cells[i] = cell
+    cells.flush()
+    del cells
+    os.replace(tmp_file, cache_file)
+
+    # 이전 이미지 목록의 캐시 정리
+    for old in cache_folder.glob('*.npy'):
+        if old != cache_file:
+            old.unlink(missing_ok=True)
+    return cache_file, True
+
+
+# ---------------------------------------------------------------- 학습지 구성
+
+def load_pools(image_folder, choice_file, categories, choice_categories, stats, focus):
+    """출제 후보와 가중치. (유물 [(경로, 유물명, 시대)], 유물 가중치, 선지 문제, 선지 가중치, 시대 이름)"""
+    eras = load_categories(image_folder)
+    era_names = [era['name'] for era in eras]
+    artifacts = []
+    for era in eras:
+        if categories is not None and era['name'] not in categories:
+            continue
+        for path, filename in folder_images(image_folder, era):
+            artifacts.append((path, Path(filename).stem, era['name']))
+    artifact_weights = [weakness(lookup_stat(stats, path), focus) for path, _, _ in artifacts]
+
+    choices = []
+    if choice_categories != []:
+        choice_data = load_choice_data(choice_file)
+        selected = choice_categories if choice_categories is not None else list(choice_data)
+        choices = choice_questions(choice_data, selected, stats, 100)
+    choice_weights = [weakness(stats.get(q['stats_key']), focus) for q in choices]
+    return artifacts, artifact_weights, choices, choice_weights, era_names
+
+
+def compose_sheet(number, seed, artifacts, artifact_weights, choices, choice_weights, era_names,
+                  image_count, choice_count):
+    """학습지 한 장 구성 (시드와 번호가 같으면 같은 학습지)"""
+    rng = random.Random(f"{seed}:{number}")
+    images = []
+    for index in weighted_sample(rng, range(len(artifacts)), artifact_weights, image_count):
+        options, answer = make_options(rng, artifacts[index][2], era_names)
+        images.append({'index': index, 'options': options, 'answer': answer})
+
+    questions = []
+    for q in weighted_sample(rng, choices, choice_weights, choice_count):
+        options, answer = make_options(rng, q['answer'], q['choices'])
+        questions.append({'category': q['category'], 'question': str(q['question']),
+                          'options': options, 'answer': answer})
+    return {'number': number, 'images': images, 'questions': questions}
+
+
+# ---------------------------------------------------------------- 렌더링 (워커)
+
+# 워커 프로세스별 상태 (글꼴, 이미지 캐시 memmap)
+_worker = {}
+
+
+def init_worker(font_path, cache_file, output_folder, fmt):
+    """프로세스 풀 초기화: 글꼴과 이미지 캐시를 한 번만 열기"""
+    def font(size):
+        if font_path:
+            return ImageFont.truetype(font_path, size)
+        return ImageFont.load_default(size)
+
+    _worker['fonts'] = {'title': font(34), 'text': font(24), 'small': font(20)}
+    _worker['cells'] = np.load(cache_file, mmap_mode='r') if cache_file else None
+    _worker['output'] = Path(output_folder)
+    _worker['format'] = fmt
+
+
+def char_width(font, char):
+    """글자 너비 (글꼴별 캐시, 줄마다 전체 길이를 다시 재지 않도록)"""
+    widths = _worker.setdefault('widths', {}).setdefault(id(font), {})
+    width = widths.get(char)
+    if width is None:
+        width = widths[char] = font.getlength(char)
+    return width
+
+
+def wrap_text(text, font, width):
+    """글자 단위 줄바꿈 (한글은 띄어쓰기와 무관하게 너비 기준)"""
+    lines, line, line_width = [], '', 0.0
+    for char in text:
+        w = char_width(font, char)
+        if line_width + w > width and line:
+            lines.append(line)
+            line = char.lstrip()
+            line_width = w if line else 0.0
+        else:
+            line += char
+            line_width += w
+    return lines + [line] if line else lines
+
+
+def option_line(options):
+    """보기 한 줄 ('① 고려   ② 조선 전기 ...')"""
+    return '   '.join(f"{OPTION_MARKS[i]} {option}" for i, option in enumerate(options))
+
+
+class PageWriter:
+    """위에서 아래로 블록을 쌓고, 넘치면 새 페이지"""
+
+    def __init__(self, header):
+        self.header = header
+        self.pages = []
+        self.new_page()
+
+    def new_page(self):
+        self.page = Image.new('RGB', PAGE_SIZE, 'white')
+        self.draw = ImageDraw.Draw(self.page)
+        self.pages.append(self.page)
+        fonts = _worker['fonts']
+        self.draw.text((MARGIN, MARGIN), self.header, fill='black', font=fonts['title'])
+        self.draw.text((PAGE_SIZE[0] - MARGIN - 300, MARGIN + 8), "이름: ____________",
+                       fill='black', font=fonts['text'])
+        self.y = MARGIN + 60
+        self.draw.line((MARGIN, self.y, PAGE_SIZE[0] - MARGIN, self.y), fill='black', width=2)
+        self.y += 25
+
+    def reserve(self, height):
+        """높이만큼 자리 확보 (모자라면 새 페이지). 시작 y 반환"""
+        if self.y + height > PAGE_SIZE[1] - MARGIN and self.y > MARGIN + 85:
+            self.new_page()
+        y = self.y
+        self.y += height
+        return y
+
+
+def render_sheet(sheet):
+    """학습지 한 장의 페이지 이미지 목록"""
+    fonts = _worker['fonts']
+    cells = _worker['cells']
+    writer = PageWriter(f"한국사 학습지 No.{sheet['number']:04d}")
+    number = 1
+    text_width = PAGE_SIZE[0] - 2 * MARGIN
+
+    # 유물 문제: 이미지 칸 격자 (이미지 아래에 시대 보기)
+    column_width = (text_width - (IMAGE_COLUMNS - 1) * 30) // IMAGE_COLUMNS
+    block_height = 36 + IMAGE_CELL[1] + 45
+    images = sheet['images']
+    for row_start in range(0, len(images), IMAGE_COLUMNS):
+        y = writer.reserve(block_height + 20)
+        for col, item in enumerate(images[row_start:row_start + IMAGE_COLUMNS]):
+            x = MARGIN + col * (column_width + 30)
+            writer.draw.text((x, y), f"{number}. 이 유물의 시대는?", fill='black', font=fonts['text'])
+            writer.page.paste(Image.fromarray(np.asarray(cells[item['index']])), (x, y + 36))
+            writer.draw.rectangle((x, y + 36, x + IMAGE_CELL[0], y + 36 + IMAGE_CELL[1]),
+                                  outline='#999999')
+            writer.draw.text((x, y + 36 + IMAGE_CELL[1] + 10), option_line(item['options']),
+                             fill='black', font=fonts['small'])
+            number += 1
+
+    # 선지 문제: 설명 (줄바꿈) + 보기
+    for q in sheet['questions']:
+        lines = wrap_text(f"{number}. [{q['category']}] {q['question']}",
+                          fonts['text'], text_width)
+        option_lines = wrap_text(option_line(q['options']), fonts['small'],
+                                 text_width - 30)
+        y = writer.reserve(len(lines) * 34 + len(option_lines) * 30 + 24)
+        for line in lines:
+            writer.draw.text((MARGIN, y), line, fill='black', font=fonts['text'])
+            y += 34
+        for line in option_lines:
+            writer.draw.text((MARGIN + 30, y), line, fill='black', font=fonts['small'])
+            y += 30
+        number += 1
+    return writer.pages
+
+
+def render_answer_key(sheets):
+    """정답표 페이지 목록 (학습지마다 한 줄)"""
+    fonts = _worker['fonts']
+    writer = PageWriter("정답표")
+    for sheet in sheets:
+        answers = [item['answer'] for item in sheet['images']] + [q['answer'] for q in sheet['questions']]
+        text = f"No.{sheet['number']:04d}  " + '  '.join(
+            f"{i}-{OPTION_MARKS[a]}" for i, a in enumerate(answers, 1))
+        lines = wrap_text(text, fonts['small'], PAGE_SIZE[0] - 2 * MARGIN)
+        y = writer.reserve(len(lines) * 30 + 8)
+        for line in lines:
+            writer.draw.text((MARGIN, y), line, fill='black', font=fonts['small'])
+            y += 30
+    return writer.pages
+
+
+def save_pages(pages, name):
+    """페이지 저장 (pdf: 파일 하나, png: 페이지마다). 파일 목록 반환"""
+    output = _worker['output']
+    if _worker['format'] == 'pdf':
+        path = output / f"{name}.pdf"
+        pages[0].save(path, save_all=True, append_images=pages[1:], resolution=DPI)
+        return [path.as_posix()]
+
+    paths = []
+    for i, page in enumerate(pages, 1):
+        path = output / (f"{name}.png" if len(pages) == 1 else f"{name}_{i}.png")
+        page.save(path, compress_level=1, dpi=(DPI, DPI))
+        paths.append(path.as_posix())
+    return paths
+
+
+def render_batch(task):
+    """학습지 묶음 렌더링 (pdf는 묶음 하나가 파일 하나, 프로세스 풀 워커). (파일 목록, 페이지 수)"""
+    name, sheets = task
+    if _worker['format'] == 'pdf':
+        pages = [page for sheet in sheets for page in render_sheet(sheet)]
+        return save_pages(pages, name), len(pages)
+
+    files, page_count = [], 0
+    for sheet in sheets:
+        pages = render_sheet(sheet)
+        files += save_pages(pages, f"sheet_{sheet['number']:04d}")
+        page_count += len(pages)
+    return files, page_count
+
+
+def render_key_task(sheets):
+    """정답표 렌더링 (프로세스 풀 워커)"""
+    pages = render_answer_key(sheets)
+    return save_pages(pages, 'answer_key'), len(pages)
+
+
+# ---------------------------------------------------------------- CLI
+
+def main():
+    parser = argparse.ArgumentParser(description="인쇄용 학습지 일괄 생성 (약한 문제 우선)")
+    parser.add_argument('count', type=int, help="학습지 수")
+    parser.add_argument('--images', type=int, default=4, help="학습지당 유물 문제 수")
+    parser.add_argument('--questions', type=int, default=8, help="학습지당 선지 문제 수")
+    parser.add_argument('--categories', nargs='*', help="유물 시대 (기본: 전체)")
+    parser.add_argument('--choice-categories', nargs='*', help="선지 카테고리 (기본: 전체)")
+    parser.add_argument('--focus', type=float, default=2.0,
+                        help="약한 문제 가중 강도 (0: 균등, 클수록 오답률 높은 문제 위주)")
+    parser.add_argument('--format', choices=['pdf', 'png'], default='pdf', help="출력 형식")
+    parser.add_argument('--per-file', type=int, default=30, help="PDF 파일당 학습지 수 (반 단위)")
+    parser.add_argument('--output', default=OUTPUT_FOLDER, help="출력 폴더")
+    parser.add_argument('--source', default=IMAGE_FOLDER, help="시대별 이미지 폴더")
+    parser.add_argument('--choices', default=CHOICES_FILE, help="선지 YAML 파일")
+    parser.add_argument('--stats', default=STATS_FILE, help="통계 파일")
+    parser.add_argument('--font', help="한글 글꼴 파일 (.ttf/.ttc)")
+    parser.add_argument('--seed', type=int, help="시드 (같은 시드면 같은 학습지)")
+    parser.add_argument('--workers', type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("📝 학습지 생성")
+    print("=" * 60)
+
+    total_start = time.perf_counter()
+    seed = new_seed() if args.seed is None else args.seed
+    stats = StatsStore(args.stats).totals if Path(args.stats).exists() else {}
+    artifacts, artifact_weights, choices, choice_weights, era_names = load_pools(
+        args.source, args.choices, args.categories, args.choice_categories, stats, args.focus)
+    image_count = min(args.images, len(artifacts))
+    choice_count = min(args.questions, len(choices))
+    if image_count + choice_count == 0:
+        print("⚠ 출제할 문제가 없습니다.")
+        return
+    print(f"시드 {seed}, 유물 {len(artifacts)}개, 선지 {len(choices)}개 중 "
+          f"학습지당 {image_count}+{choice_count}문제")
+
+    font_path = find_font(args.font)
+    if font_path is None:
+        print("⚠ 한글 글꼴을 찾지 못해 기본 글꼴 사용 (--font로 지정)")
+
+    # 1) 출제 이미지를 한 번만 축소 (워커들이 공유)
+    start = time.perf_counter()
+    cache_file = None
+    if image_count:
+        cache_file, built = build_image_cache([path for path, _, _ in artifacts], CACHE_FOLDER,
+                                              args.workers)
+        print(f"✓ 이미지 캐시 {'생성' if built else '재사용'} ({time.perf_counter() - start:.1f}초)")
+
+    # 2) 학습지 구성 (문제/보기/정답, 빠름)
+    start = time.perf_counter()
+    sheets = [compose_sheet(number, seed, artifacts, artifact_weights, choices, choice_weights,
+                            era_names, image_count, choice_count)
+              for number in range(1, args.count + 1)]
+    print(f"✓ 학습지 {len(sheets)}장 구성 ({(time.perf_counter() - start) * 1000:.0f}ms)")
+
+    # 3) 렌더링 (프로세스 풀, pdf는 per-file 장씩 한 파일)
+    output = Path(args.output)
+    output.mkdir(parents=True, exist_ok=True)
+    batch_size = args.per_file if args.format == 'pdf' else 10
+    tasks = [(f"sheets_{i + 1:04d}-{min(i + batch_size, len(sheets)):04d}", sheets[i:i + batch_size])
+             for i in range(0, len(sheets), batch_size)]
+
+    start = time.perf_counter()
+    files, pages = [], 0
+    with ProcessPoolExecutor(max_workers=args.workers or os.cpu_count(), initializer=init_worker,
+                             initargs=(font_path, cache_file, output, args.format)) as executor:
+        key_future = executor.submit(render_key_task, sheets)
+        for batch_files, batch_pages in executor.map(render_batch, tasks):
+            files += batch_files
+            pages += batch_pages
+        key_files, _ = key_future.result()
+    elapsed = time.perf_counter() - start
+    print(f"✓ {pages}쪽 렌더링 → 파일 {len(files)}개 ({elapsed:.1f}초, {pages / elapsed:.0f}쪽/s)")
+
+    # 채점용 정답 (학습지 번호별 정답 보기)
+    answers = {
+        'seed': seed,
+        'sheets': {sheet['number']: [item['options'][item['answer']] for item in sheet['images']]
+                   + [q['options'][q['answer']] for q in sheet['questions']] for sheet in sheets},
+    }
+    with open(output / 'answers.json', 'w', encoding='utf-8') as f:
+        json.dump(answers, f, ensure_ascii=False, indent=1)
+
+    print(f"✓ 정답표 {', '.join(key_files)}")
+    print(f"\n총 {time.perf_counter() - total_start:.1f}초 → {output}/")
+
+
+if __name__ == "__main__":
+    main()